@@ -7,11 +7,6 @@ load_dotenv()
 # Multiple Gemini API keys for fallback (comma-separated)
 GEMINI_API_KEYS = [key.strip() for key in os.getenv("GEMINI_API_KEYS", "").split(",") if key.strip()]
 
-print(f"[AI Service] Loaded {len(GEMINI_API_KEYS)} Gemini API keys")
-
-if not GEMINI_API_KEYS:
-    print("WARNING: No GEMINI_API_KEYS set!")
-
 # Track current key index for round-robin
 _current_key_index = 0
 
@@ -0,0 +1,132 @@
+"""
+CareerForge AI - Cohort Roadmaps
+Roadmaps for a whole cohort of profiles in one streamed request.
+
+Identical and near-identical profiles (same words and settings, ignoring
+case, spacing and punctuation) are generated once. Unique profiles go
+through the roadmap bulkhead a few at a time, their steps' videos come
+from one shared VideoLookupBatch, and each result is sent as soon as its
+roadmap is ready, tagged with the caller's id.
+"""
+
+import asyncio
+import os
+import re
+import sys
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import cohort_config
+from api.executor import get_executor
+from api.schemas import CohortProfile
+from services.generation_tasks import step_video_query
+from services.roadmap_service import get_roadmap_service
+from services.video_enrichment import VideoLookupBatch, get_video_enricher
+from utils.validators import canonical_input
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def profile_key(profile: CohortProfile) -> Tuple[Any, ...]:
+    """Dedup key: profiles with equal keys get the same roadmap."""
+    words = " ".join(_WORD_RE.findall(canonical_input(profile.description)))
+    budget = canonical_input(profile.budget or "", 200)
+    return words, profile.hours_per_week, profile.max_months, budget
+
+
+def group_profiles(profiles: List[CohortProfile]) -> List[List[CohortProfile]]:
+    """Group duplicate profiles, keeping request order (first profile leads each group)."""
+    groups: Dict[Tuple[Any, ...], List[CohortProfile]] = {}
+    for profile in profiles:
+        groups.setdefault(profile_key(profile), []).append(profile)
+    return list(groups.values())
+
+
+async def _generate(
+    profile: CohortProfile,
+    slots: asyncio.Semaphore,
+    videos: Optional[VideoLookupBatch]
+) -> Dict[str, Any]:
+    """Generate and enrich one roadmap; failures are returned, not raised."""
+    service = get_roadmap_service()
+    async with slots:
+        try:
+            result = await get_executor().run(
+                "roadmap",
+                service.generate_roadmap,
+                profile.description,
+                profile.hours_per_week,
+                profile.max_months,
+                profile.budget
+            )
+        except HTTPException as e:
+            return {"success": False, "error": e.detail, "status": e.status_code}
+        except Exception as e:
+            print(f"[Cohort] Roadmap generation failed: {e}")
+            return {"success": False, "error": str(e) or type(e).__name__}
+
+    if not result.get("success"):
+        return {"success": False, "error": result.get("error", "Failed to generate roadmap")}
+
+    # The LLM slot is free again while videos load
+    if videos is not None:
+        roadmap = result.get("data", {}).get("roadmap", [])
+        result["enrichment"] = await get_video_enricher().enrich(roadmap, step_video_query, videos.lookup)
+    return result
+
+
+async def stream_cohort_roadmaps(
+    profiles: List[CohortProfile],
+    include_videos: bool = True
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Generate roadmaps for a cohort, yielding results in completion order.
+
+    Yields a "result" event per profile: the caller's `id`, then the same
+    fields as /api/ai/roadmap (success, data, meta, enrichment) or
+    success=False with an error. Duplicates of an earlier profile name it
+    in `duplicate_of`. A final "done" event carries the totals.
+    """
+    started = time.perf_counter()
+    groups = group_profiles(profiles)
+    slots = asyncio.Semaphore(cohort_config.concurrency)
+    videos = VideoLookupBatch(cohort_config.video_concurrency) if include_videos else None
+
+    pending = {asyncio.ensure_future(_generate(group[0], slots, videos)): group for group in groups}
+    succeeded = failed = 0
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending.keys(), return_when=asyncio.FIRST_COMPLETED)
+            for task in [task for task in pending if task in done]:
+                group = pending.pop(task)
+                result = task.result()
+                for profile in group:
+                    event = {"type": "result", "id": profile.id}
+                    if profile is not group[0]:
+                        event["duplicate_of"] = group[0].id
+                    yield {**event, **result}
+                if result["success"]:
+                    succeeded += len(group)
+                else:
+                    failed += len(group)
+
+        yield {
+            "type": "done",
+            "profiles": len(profiles),
+            "unique": len(groups),
+            "succeeded": succeeded,
+            "failed": failed,
+            "video_queries": videos.distinct if videos is not None else 0,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000),
+        }
+    finally:
+        # Only reached with work left if the client went away
+        if pending:
+            for task in pending:
+                task.cancel()
+            if videos is not None:
+                videos.cancel()
@@ -0,0 +1,316 @@
+"""
+CareerForge AI - Shared Request Executor
+One bounded thread pool for the blocking service calls made by every
+endpoint, split into per-endpoint-class bulkheads.
+
+Each bulkhead owns a fixed number of the pool's threads. Requests beyond
+that wait in the bulkhead's own queue, so a flood of quiz batches queues
+behind other quiz batches instead of taking threads from roadmap
+generation. Queue depth and wait times are published per bulkhead.
+
+Calls run inside a copy of the caller's context, so the request's
+deadline and cancellation scope (utils.request_context) reach the
+service code running in the thread.
+
+Service code already running in a thread (e.g. a roadmap fanning out
+step expansions) submits its own sub-calls with `submit`, so they go
+through a bulkhead too instead of a private pool.
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional
+
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import executor_config
+from utils.request_context import current_request
+
+# Recent waits kept per bulkhead for the published averages
+_WAIT_WINDOW = 256
+
+# Sentinel returned by next() once a streamed iterator is exhausted
+_EXHAUSTED = object()
+
+
+class Bulkhead:
+    """Concurrency limit and wait queue for one endpoint class."""
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, max_wait: float):
+        """
+        Initialize the bulkhead.
+
+        Args:
+            name: Endpoint class name ("roadmap", "quiz", ...)
+            max_concurrent: Calls allowed to run at once
+            max_queue: Calls allowed to wait for a slot
+            max_wait: Seconds a call may wait before being rejected
+        """
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.active = 0
+        self.queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._waits = deque(maxlen=_WAIT_WINDOW)
+
+    async def acquire(self) -> None:
+        """
+        Wait for a slot.
+
+        Raises a 503 if the queue is full or the wait times out, and a
+        504 if the request's own deadline passes while queued.
+        """
+        if self.active + self.queued >= self.max_concurrent + self.max_queue:
+            self._reject("queue is full")
+
+        request = current_request()
+        self.queued += 1
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=request.timeout(self.max_wait))
+        except asyncio.TimeoutError:
+            if request.expired:
+                self.rejected += 1
+                raise HTTPException(status_code=504, detail=request.reason)
+            self._reject("timed out waiting for a worker")
+        finally:
+            self.queued -= 1
+
+        self._waits.append(time.perf_counter() - started)
+        self.active += 1
+
+    def release(self) -> None:
+        self.active -= 1
+        self.completed += 1
+        self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Current load and recent queue wait times (milliseconds)."""
+        waits = sorted(self._waits)
+        return {
+            "max_concurrent": self.max_concurrent,
+            "active": self.active,
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "wait_ms_avg": round(sum(waits) / len(waits) * 1000, 1) if waits else 0.0,
+            "wait_ms_p95": round(waits[int(len(waits) * 0.95)] * 1000, 1) if waits else 0.0,
+            "wait_ms_max": round(waits[-1] * 1000, 1) if waits else 0.0,
+        }
+
+    def _reject(self, reason: str) -> None:
+        self.rejected += 1
+        raise HTTPException(
+            status_code=503,
+            detail=f"Server busy ({self.name} {reason}), please retry",
+            headers={"Retry-After": "5"}
+        )
+
+
+class BoundedExecutor:
+    """
+    Runs blocking calls on one shared thread pool, gated per bulkhead.
+
+    The pool has exactly as many threads as the bulkheads' combined
+    limits, so a call that holds a slot never waits for a thread.
+
+    Bulkhead state lives on one event loop: the first loop to use the
+    executor (the app's), or a background loop started by `submit` in
+    processes without one (workers, CLI tools).
+    """
+
+    def __init__(self, limits: Dict[str, int], max_queue: int, max_wait: float):
+        """
+        Initialize the executor.
+
+        Args:
+            limits: Max concurrent calls per bulkhead name
+            max_queue: Calls allowed to wait per bulkhead
+            max_wait: Seconds a call may wait for a slot
+        """
+        self.bulkheads = {
+            name: Bulkhead(name, limit, max_queue, max_wait)
+            for name, limit in limits.items()
+        }
+        self.threads = sum(limits.values())
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.threads,
+            thread_name_prefix="careerforge"
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+
+    async def run(self, bulkhead: str, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run `fn(*args, **kwargs)` in a thread once `bulkhead` has a free slot.
+
+        The slot is held until the call returns, even if the awaiting
+        request is cancelled, so abandoned calls still count against
+        their bulkhead while they occupy a thread.
+        """
+        loop = self._bind()
+        if loop is not asyncio.get_running_loop():
+            # Bulkheads belong to the executor's own loop
+            return await asyncio.wrap_future(self.submit(bulkhead, fn, *args, **kwargs))
+
+        gate = self.bulkheads[bulkhead]
+        await gate.acquire()
+
+        loop = asyncio.get_running_loop()
+        try:
+            context = contextvars.copy_context()
+            future = self._pool.submit(context.run, functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            gate.release()
+            raise
+        future.add_done_callback(lambda _: _call_soon(loop, gate.release))
+        return await asyncio.wrap_future(future)
+
+    async def iterate(
+        self,
+        bulkhead: str,
+        iterator: Iterator,
+        on_busy: Callable[[str], Any]
+    ) -> AsyncIterator:
+        """
+        Drain a blocking iterator (e.g. a streamed LLM response) in the pool.
+
+        One `bulkhead` slot is held for the whole stream. The slot is
+        taken on first iteration, after the response has started, so a
+        rejection is yielded as a single `on_busy(detail)` item instead
+        of raising.
+        """
+        owner = self._bind()
+        gate = self.bulkheads[bulkhead]
+        try:
+            if owner is asyncio.get_running_loop():
+                await gate.acquire()
+            else:
+                # Bulkheads belong to the executor's own loop (see run)
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(gate.acquire(), owner))
+        except HTTPException as e:
+            yield on_busy(e.detail)
+            return
+
+        context = contextvars.copy_context()
+        future = None
+        try:
+            while True:
+                future = self._pool.submit(context.run, next, iterator, _EXHAUSTED)
+                item = await asyncio.wrap_future(future)
+                if item is _EXHAUSTED:
+                    return
+                yield item
+        finally:
+            # Closing the iterator runs its cleanup (e.g. cancelling queued
+            # sub-calls) once it is no longer mid-item
+            if future is not None and not future.done():
+                # Client went away mid-item; free the slot when the thread does
+                def finish(_):
+                    _close(iterator)
+                    _call_soon(owner, gate.release)
+
+                future.add_done_callback(finish)
+            else:
+                _close(iterator)
+                _call_soon(owner, gate.release)
+
+    def submit(self, bulkhead: str, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Run `fn(*args, **kwargs)` through `bulkhead` from any thread.
+
+        For service code that is itself running in the pool. The caller's
+        context (request deadline) carries over. Cancelling the returned
+        future before the call gets a slot takes it out of the queue.
+        Never block on the result from the executor's own loop.
+
+        Returns:
+            Future with the call's result, or the bulkhead's HTTPException
+            when the queue is full or the wait times out
+        """
+        loop = self._loop or self._start_loop()
+        return asyncio.run_coroutine_threadsafe(self.run(bulkhead, fn, *args, **kwargs), loop)
+
+    def _bind(self) -> asyncio.AbstractEventLoop:
+        """The executor's loop, adopting the running one on first use."""
+        if self._loop is None:
+            with self._loop_lock:
+                if self._loop is None:
+                    self._loop = asyncio.get_running_loop()
+        return self._loop
+
+    def _start_loop(self) -> asyncio.AbstractEventLoop:
+        """Run the executor's own loop in a background thread (no app loop yet)."""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="careerforge-executor", daemon=True).start()
+                self._loop = loop
+        return self._loop
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-bulkhead load and wait statistics."""
+        return {
+            "threads": self.threads,
+            "bulkheads": {name: gate.stats() for name, gate in self.bulkheads.items()},
+        }
+
+
+def _close(iterator: Iterator) -> None:
+    """Close a generator early, if it is one."""
+    close = getattr(iterator, "close", None)
+    if close is not None:
+        try:
+            close()
+        except Exception as e:
+            print(f"[Executor] Error closing stream: {e}")
+
+
+def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable) -> None:
+    """Schedule a callback on the loop from a worker thread."""
+    try:
+        loop.call_soon_threadsafe(callback)
+    except RuntimeError:
+        # Loop already closed (shutdown); nothing left to release for
+        pass
+
+
+# Singleton instance
+_executor: Optional[BoundedExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> BoundedExecutor:
+    """Get or create the shared executor singleton."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = BoundedExecutor(
+                    limits={
+                        "roadmap": executor_config.roadmap_workers,
+                        "quiz": executor_config.quiz_workers,
+                        "skills": executor_config.skills_workers,
+                        "interview": executor_config.interview_workers,
+                        # Sub-calls made from inside the calls above
+                        "roadmap_steps": executor_config.step_workers,
+                        "youtube_refresh": executor_config.refresh_workers,
+                    },
+                    max_queue=executor_config.max_queue,
+                    max_wait=executor_config.max_wait
+                )
+    return _executor
@@ -0,0 +1,456 @@
+"""
+CareerForge AI - Background Jobs
+Long generations (roadmaps, full quizzes) as jobs that outlive the HTTP
+request that created them.
+
+POST returns a job id at once; the client polls GET /jobs/{id} for status
+and partial results, or follows the job's Server-Sent Events stream, so
+no connection is held open for the minute a CPU-bound generation takes.
+At most `max_running` jobs generate at once (their blocking work still
+goes through the shared executor's bulkheads), each client may have
+`per_user` unfinished jobs, and finished jobs expire after `ttl` seconds.
+
+With JOBS_QUEUE set, jobs are instead handed to worker processes
+(worker.py) through the durable task queue, and any API process can
+answer for any job.
+"""
+
+import asyncio
+import os
+import secrets
+import sys
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import job_config
+from api.executor import get_executor
+from api.responses import dumps
+from services.generation_tasks import TASKS, RoadmapBuilder, TaskError, step_video_query
+from services.roadmap_service import get_roadmap_service
+from services.task_queue import FINISHED, create_task_queue
+from services.video_enrichment import get_video_enricher
+from utils.request_context import RequestScope, request_scope
+
+# Seconds between SSE keep-alive comments while a job is quiet
+_HEARTBEAT = 15
+
+# Seconds between reads of a queued job's state while following it
+_POLL = 1
+
+
+async def _sse(events: AsyncIterator[Tuple[str, Any]]) -> AsyncIterator[bytes]:
+    """(event, data) pairs in Server-Sent Events wire format."""
+    async for event, data in events:
+        if event == "ping":
+            yield b": keep-alive\n\n"
+        else:
+            yield b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+class Job:
+    """One background generation and everything produced so far."""
+
+    def __init__(self, kind: str, params: Dict[str, Any], owner: str):
+        self.id = secrets.token_urlsafe(16)
+        self.kind = kind
+        self.params = params
+        self.owner = owner
+        self.status = "queued"
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.partial: List[Any] = []
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.scope: Optional[RequestScope] = None
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.finished is not None
+
+    def add_partial(self, item: Any) -> None:
+        self.partial.append(item)
+        self._notify()
+
+    def start(self, timeout: float) -> None:
+        self.status = "running"
+        self.started = time.time()
+        self.scope = RequestScope(timeout)
+        self._notify()
+
+    def finish(self, status: str, error: str = None) -> None:
+        self.status = status
+        self.error = error
+        self.finished = time.time()
+        self._notify()
+
+    def view(self) -> Dict[str, Any]:
+        """Status, partial results and (once finished) result or error."""
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created,
+            "started_at": self.started,
+            "finished_at": self.finished,
+            "partial": self.partial,
+            "result": self.result,
+            "error": self.error,
+        }
+
+    async def events(self) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Yield (event, data) pairs: "status" on every state change, each
+        "partial" item, then "result" or "error". ("ping", None) is
+        yielded when nothing happened for a while.
+        """
+        status = None
+        sent = 0
+        while True:
+            changed = self._changed
+            if self.status != status:
+                status = self.status
+                yield "status", {"status": status}
+            while sent < len(self.partial):
+                yield "partial", self.partial[sent]
+                sent += 1
+            if self.done:
+                if self.status == "succeeded":
+                    yield "result", self.result
+                else:
+                    yield "error", {"status": self.status, "error": self.error}
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=_HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield "ping", None
+
+    def sse(self) -> AsyncIterator[bytes]:
+        """events() in Server-Sent Events wire format."""
+        return _sse(self.events())
+
+    def _notify(self) -> None:
+        # Wake current waiters; later waiters wait on a fresh event
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+
+# ============================================================
+# Job kinds
+# ============================================================
+
+async def _run_roadmap(job: Job) -> Dict[str, Any]:
+    """Two-phase roadmap; the skeleton and each expanded step are partial results."""
+    events = get_roadmap_service().stream_roadmap(use_library=True, **job.params)
+
+    builder = RoadmapBuilder()
+    async for event in get_executor().iterate("roadmap", events, lambda detail: {"type": "error", "error": detail}):
+        if builder.add(event):
+            job.add_partial(event)
+    result = builder.result()
+
+    # Same video enrichment as the synchronous endpoint; late videos via the token
+    result["enrichment"] = await get_video_enricher().enrich(result["data"]["roadmap"], step_video_query)
+    return result
+
+
+async def _run_task(job: Job) -> Dict[str, Any]:
+    """A generation task on the executor bulkhead of the same name."""
+    loop = asyncio.get_running_loop()
+
+    def report(item: Any) -> None:
+        loop.call_soon_threadsafe(job.add_partial, item)
+
+    return await get_executor().run(job.kind, TASKS[job.kind], job.params, report)
+
+
+JOB_KINDS: Dict[str, Callable[[Job], Awaitable[Any]]] = {
+    "roadmap": _run_roadmap,
+    "quiz": _run_task,
+    "skills": _run_task,
+    "interview": _run_task,
+}
+
+
+# ============================================================
+# Manager
+# ============================================================
+
+class JobManager:
+    """
+    Creates, runs and expires jobs in this process.
+
+    Must be used from a single event loop (the app's).
+    """
+
+    def __init__(self, max_running: int, max_queued: int, per_user: int, ttl: float, timeout: float):
+        """
+        Initialize the manager.
+
+        Args:
+            max_running: Jobs generating at once
+            max_queued: Jobs allowed to wait for a running slot
+            per_user: Unfinished jobs allowed per owner
+            ttl: Seconds a finished job is kept
+            timeout: Seconds a job may run before it is aborted
+        """
+        self.max_running = max_running
+        self.max_queued = max_queued
+        self.per_user = per_user
+        self.ttl = ttl
+        self.timeout = timeout
+        self._jobs: Dict[str, Job] = {}
+        self._slots = asyncio.Semaphore(max_running)
+
+    async def submit(self, kind: str, params: Dict[str, Any], owner: str) -> Job:
+        """
+        Create a job and queue it.
+
+        Raises:
+            HTTPException: 429 if the owner has too many unfinished jobs,
+                503 if the queue is full
+        """
+        self._expire()
+
+        unfinished = [job for job in self._jobs.values() if not job.done]
+        if sum(1 for job in unfinished if job.owner == owner) >= self.per_user:
+            raise HTTPException(
+                status_code=429,
+                detail=f"Too many unfinished jobs (max {self.per_user}); wait for one to finish"
+            )
+        if sum(1 for job in unfinished if job.status == "queued") >= self.max_queued:
+            raise HTTPException(
+                status_code=503,
+                detail="Job queue is full, please retry",
+                headers={"Retry-After": "30"}
+            )
+
+        job = Job(kind, params, owner)
+        self._jobs[job.id] = job
+        job.task = asyncio.ensure_future(self._run(job))
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        """A job by id, or None if unknown or expired."""
+        self._expire()
+        return self._jobs.get(job_id)
+
+    async def cancel(self, job_id: str, wait: float = 5) -> Optional[Job]:
+        """
+        Cancel a queued or running job; its LLM call is aborted too.
+
+        Waits up to `wait` seconds for the job to wind down, so the
+        returned job usually already shows "cancelled".
+        """
+        job = await self.get(job_id)
+        if job is not None and not job.done:
+            if job.scope is not None:
+                job.scope.cancel()
+            job.task.cancel()
+            await asyncio.wait([job.task], timeout=wait)
+        return job
+
+    async def stats(self) -> Dict[str, Any]:
+        """Job counts by status."""
+        self._expire()
+        counts = {"queued": 0, "running": 0, "succeeded": 0, "failed": 0, "cancelled": 0}
+        for job in self._jobs.values():
+            counts[job.status] += 1
+        return counts
+
+    async def _run(self, job: Job) -> None:
+        try:
+            async with self._slots:
+                job.start(self.timeout)
+                # The job's own scope (deadline, cancellation) replaces that
+                # of the request that created it
+                with request_scope(job.scope):
+                    job.result = await JOB_KINDS[job.kind](job)
+            job.finish("succeeded")
+        except asyncio.CancelledError:
+            job.finish("cancelled", "Job cancelled")
+        except HTTPException as e:
+            job.finish("failed", e.detail)
+        except TaskError as e:
+            job.finish("failed", str(e))
+        except Exception as e:
+            print(f"[Jobs] {job.kind} job {job.id} failed: {e}")
+            job.finish("failed", str(e))
+
+    def _expire(self) -> None:
+        """Drop finished jobs older than the TTL."""
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.done and now - job.finished >= self.ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+# ============================================================
+# Worker tier
+# ============================================================
+
+class QueuedJob:
+    """A job held in the durable task queue, as last read from it."""
+
+    def __init__(self, queue, view: Dict[str, Any]):
+        self._queue = queue
+        self._view = view
+
+    @property
+    def id(self) -> str:
+        return self._view["job_id"]
+
+    @property
+    def status(self) -> str:
+        return self._view["status"]
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED
+
+    def view(self) -> Dict[str, Any]:
+        """Same shape as Job.view, plus the number of attempts."""
+        return self._view
+
+    async def refresh(self) -> bool:
+        """Re-read the job; False if it has expired meanwhile."""
+        view = await asyncio.to_thread(self._queue.get, self.id)
+        if view is None:
+            return False
+        self._view = view
+        return True
+
+    async def events(self) -> AsyncIterator[Tuple[str, Any]]:
+        """Same contract as Job.events, polling the queue."""
+        status = None
+        sent = 0
+        quiet = 0.0
+        while True:
+            if self.status != status:
+                status = self.status
+                quiet = 0.0
+                yield "status", {"status": status}
+            partial = self._view["partial"]
+            while sent < len(partial):
+                quiet = 0.0
+                yield "partial", partial[sent]
+                sent += 1
+            if self.done:
+                if self.status == "succeeded":
+                    yield "result", self._view["result"]
+                else:
+                    yield "error", {"status": self.status, "error": self._view["error"]}
+                return
+            await asyncio.sleep(_POLL)
+            quiet += _POLL
+            if quiet >= _HEARTBEAT:
+                quiet = 0.0
+                yield "ping", None
+            if not await self.refresh():
+                yield "error", {"status": "expired", "error": "Job expired"}
+                return
+
+    def sse(self) -> AsyncIterator[bytes]:
+        """events() in Server-Sent Events wire format."""
+        return _sse(self.events())
+
+
+class QueueJobManager:
+    """
+    Same interface as JobManager, but jobs run in worker processes.
+
+    The API process only enqueues jobs and reads their state back, so it
+    stays thin and scales separately from the workers.
+    """
+
+    def __init__(self, queue, max_queued: int, per_user: int):
+        """
+        Initialize the manager.
+
+        Args:
+            queue: Task queue (services.task_queue)
+            max_queued: Jobs allowed to wait for a worker
+            per_user: Unfinished jobs allowed per owner
+        """
+        self.queue = queue
+        self.max_queued = max_queued
+        self.per_user = per_user
+
+    async def submit(self, kind: str, params: Dict[str, Any], owner: str) -> QueuedJob:
+        """Same contract as JobManager.submit."""
+        await asyncio.to_thread(self.queue.purge)
+
+        if await asyncio.to_thread(self.queue.unfinished, owner) >= self.per_user:
+            raise HTTPException(
+                status_code=429,
+                detail=f"Too many unfinished jobs (max {self.per_user}); wait for one to finish"
+            )
+        if (await asyncio.to_thread(self.queue.stats))["queued"] >= self.max_queued:
+            raise HTTPException(
+                status_code=503,
+                detail="Job queue is full, please retry",
+                headers={"Retry-After": "30"}
+            )
+
+        job_id = await asyncio.to_thread(self.queue.enqueue, kind, params, owner)
+        return await self.get(job_id)
+
+    async def get(self, job_id: str) -> Optional[QueuedJob]:
+        """A job by id, or None if unknown or expired."""
+        view = await asyncio.to_thread(self.queue.get, job_id)
+        return QueuedJob(self.queue, view) if view is not None else None
+
+    async def cancel(self, job_id: str, wait: float = 5) -> Optional[QueuedJob]:
+        """
+        Cancel a queued or running job.
+
+        A running job stops at its worker's next heartbeat; waits up to
+        `wait` seconds for that.
+        """
+        if await asyncio.to_thread(self.queue.cancel, job_id) is None:
+            return None
+        job = await self.get(job_id)
+        deadline = time.monotonic() + wait
+        while job is not None and not job.done and time.monotonic() < deadline:
+            await asyncio.sleep(_POLL / 4)
+            if not await job.refresh():
+                return None
+        return job
+
+    async def stats(self) -> Dict[str, Any]:
+        """Job counts by status, live workers and the oldest queued job's age."""
+        return await asyncio.to_thread(self.queue.stats)
+
+
+# Singleton instance
+_manager = None
+
+
+def get_job_manager():
+    """Get or create the job manager singleton (JobManager or QueueJobManager)."""
+    global _manager
+    if _manager is None:
+        if job_config.queue:
+            _manager = QueueJobManager(
+                create_task_queue(job_config.queue, job_config.lease, job_config.max_attempts, job_config.ttl),
+                max_queued=job_config.max_queued,
+                per_user=job_config.per_user
+            )
+        else:
+            _manager = JobManager(
+                max_running=job_config.max_running,
+                max_queued=job_config.max_queued,
+                per_user=job_config.per_user,
+                ttl=job_config.ttl,
+                timeout=job_config.timeout
+            )
+    return _manager
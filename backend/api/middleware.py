@@ -0,0 +1,75 @@
+"""
+CareerForge AI - Request Scope Middleware
+Opens a RequestScope for every HTTP request: a client-supplied deadline
+(X-Request-Timeout header, in seconds) plus a cancellation flag that is
+set as soon as the client disconnects.
+"""
+
+import asyncio
+import os
+import sys
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.request_context import RequestScope, request_scope
+
+DEADLINE_HEADER = b"x-request-timeout"
+
+
+def _timeout_from_headers(headers) -> Optional[float]:
+    """Seconds from the deadline header, or None if absent or invalid."""
+    for name, value in headers:
+        if name.lower() == DEADLINE_HEADER:
+            try:
+                timeout = float(value)
+            except ValueError:
+                return None
+            return timeout if timeout > 0 else None
+    return None
+
+
+class RequestScopeMiddleware:
+    """
+    Pure ASGI middleware that tracks client disconnects and deadlines.
+
+    A background reader forwards the request's ASGI messages to the app
+    and cancels the scope on "http.disconnect", so a disconnect is seen
+    even while the endpoint is blocked in a long LLM call. Server errors
+    raised after the deadline passed are reported as 504.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = RequestScope(_timeout_from_headers(scope["headers"]))
+        messages: asyncio.Queue = asyncio.Queue()
+
+        async def pump():
+            while True:
+                message = await receive()
+                await messages.put(message)
+                if message["type"] == "http.disconnect":
+                    request.cancel()
+                    return
+
+        async def send_with_deadline(message):
+            if (
+                message["type"] == "http.response.start"
+                and message["status"] == 500
+                and request.expired
+            ):
+                message = {**message, "status": 504}
+            await send(message)
+
+        reader = asyncio.ensure_future(pump())
+        try:
+            with request_scope(request):
+                await self.app(scope, messages.get, send_with_deadline)
+        finally:
+            reader.cancel()
@@ -0,0 +1,327 @@
+"""
+CareerForge AI - Rate Limiting
+Per-client token buckets enforced by an ASGI middleware.
+
+Each client (a configured API key if sent, otherwise IP) has a bucket that refills at
+RATE_LIMIT tokens per minute. Requests are charged by route, so a roadmap
+costs more than a quiz batch. Bucket state lives in a pluggable store:
+in-process memory, SQLite (shared by workers on one host) or Redis
+(shared across hosts).
+"""
+
+import asyncio
+import hashlib
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import orjson
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import api_config
+
+# Tokens charged per POST; GETs (health, docs, polling) are free and
+# unlisted POSTs cost DEFAULT_COST. Paths cover both the main app and
+# the routers mounted under /api.
+ROUTE_COSTS: Dict[str, int] = {
+    "/api/ai/roadmap": 5,
+    "/api/ai/roadmap/stream": 5,
+    "/generate-path": 5,
+    "/api/ai/roadmap/regenerate-step": 2,
+    # A whole cohort (up to COHORT_MAX_PROFILES); capped at the bucket size
+    "/api/ai/roadmap/cohort": 30,
+    "/api/ai/quiz": 3,
+    "/api/quiz": 3,
+    "/generate-quiz": 3,
+    "/api/quiz/batch": 1,
+    "/api/quiz/batch/stream": 1,
+    "/generate-quiz-batch": 1,
+    "/generate-quiz-batch/stream": 1,
+    "/api/ai/skills": 2,
+    "/api/ai/skills/trending": 2,
+    "/api/ai/interview-prep": 2,
+    "/api/ai/interview-prep/questions": 2,
+    "/api/ai/interview-prep/analyze": 1,
+    "/api/ai/interview-prep/analyze/batch": 3,
+    "/api/jobs/roadmap": 5,
+    "/api/jobs/quiz": 3,
+    "/api/jobs/skills": 2,
+    "/api/jobs/interview": 2,
+}
+
+DEFAULT_COST = 1
+
+
+# ============================================================
+# Bucket stores
+# ============================================================
+
+def _refill(tokens: float, updated: float, now: float, capacity: float, rate: float) -> float:
+    return min(capacity, tokens + (now - updated) * rate)
+
+
+def _retry_after(tokens: float, cost: float, rate: float) -> float:
+    return (cost - tokens) / rate
+
+
+class MemoryBucketStore:
+    """Buckets in this process only (one worker)."""
+
+    def __init__(self, max_keys: int = 100_000):
+        """
+        Initialize the store.
+
+        Args:
+            max_keys: Max clients tracked; the least recently seen are
+                dropped first (their buckets have usually refilled anyway)
+        """
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, cost: float, capacity: float, rate: float) -> float:
+        """
+        Charge `cost` tokens to `key`'s bucket if it has them.
+
+        Args:
+            key: Client identity
+            cost: Tokens this request costs (at most `capacity`)
+            capacity: Bucket size (burst)
+            rate: Refill rate in tokens per second
+
+        Returns:
+            0.0 if the request is allowed, else seconds until it would be
+        """
+        now = time.time()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = _refill(tokens, updated, now, capacity, rate)
+            if tokens >= cost:
+                tokens -= cost
+                wait = 0.0
+            else:
+                wait = _retry_after(tokens, cost, rate)
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class SQLiteBucketStore:
+    """Buckets in a SQLite file (WAL), shared by workers on one host."""
+
+    def __init__(self, path: str):
+        """
+        Initialize the store.
+
+        Args:
+            path: SQLite database file
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+
+    def take(self, key: str, cost: float, capacity: float, rate: float) -> float:
+        """Same contract as MemoryBucketStore.take."""
+        now = time.time()
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, so concurrent
+            # workers serialize on the read-modify-write
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT tokens, updated FROM rate_buckets WHERE key = ?", (key,)
+                ).fetchone()
+                tokens = _refill(row[0], row[1], now, capacity, rate) if row else capacity
+                if tokens >= cost:
+                    tokens -= cost
+                    wait = 0.0
+                else:
+                    wait = _retry_after(tokens, cost, rate)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO rate_buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                    (key, tokens, now)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return wait
+
+
+# Refill and charge in one atomic step on the Redis server
+_REDIS_TAKE = """
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local cost, capacity, rate, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+local tokens = capacity
+if bucket[1] then
+    tokens = math.min(capacity, tonumber(bucket[1]) + (now - tonumber(bucket[2])) * rate)
+end
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisBucketStore:
+    """Buckets in Redis (or a compatible server), shared across hosts."""
+
+    def __init__(self, url: str, prefix: str = "careerforge:rate:"):
+        """
+        Initialize the store.
+
+        Args:
+            url: redis:// URL
+            prefix: Key prefix for bucket hashes
+        """
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("RATE_LIMIT_STORE=redis://... requires the 'redis' package") from e
+
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._take = self._client.register_script(_REDIS_TAKE)
+
+    def take(self, key: str, cost: float, capacity: float, rate: float) -> float:
+        """Same contract as MemoryBucketStore.take."""
+        wait = self._take(keys=[self.prefix + key], args=[cost, capacity, rate, time.time()])
+        return float(wait)
+
+
+def create_bucket_store(url: str):
+    """
+    Build a bucket store from a RATE_LIMIT_STORE value.
+
+    "memory", "sqlite:///path/to/file.db" or "redis://host:port/db".
+    """
+    if url.startswith("sqlite:///"):
+        return SQLiteBucketStore(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBucketStore(url)
+    if url != "memory":
+        raise ValueError(f"Unknown rate limit store: {url}")
+    return MemoryBucketStore()
+
+
+# ============================================================
+# Middleware
+# ============================================================
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _key_id(api_key: str) -> str:
+    return "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:32]
+
+
+# Ids of the API keys in API_KEYS, so lookups compare hashes
+_known_keys = frozenset(_key_id(key) for key in api_config.api_keys)
+
+
+def client_identity(scope, trust_proxy: bool = None) -> str:
+    """
+    Stable id for the client behind an ASGI request scope.
+
+    The X-API-Key (hashed, never stored in clear) if it is one of
+    API_KEYS, otherwise the client IP (from X-Forwarded-For only behind
+    a trusted proxy). Unknown keys are ignored, or a client could get a
+    fresh bucket per request by sending a new key each time.
+    """
+    api_key = _header(scope, b"x-api-key")
+    if api_key:
+        key_id = _key_id(api_key)
+        if key_id in _known_keys:
+            return key_id
+
+    if api_config.trust_proxy if trust_proxy is None else trust_proxy:
+        forwarded = _header(scope, b"x-forwarded-for")
+        if forwarded:
+            return "ip:" + forwarded.split(",")[0].strip()
+
+    client = scope.get("client")
+    return "ip:" + (client[0] if client else "unknown")
+
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI middleware charging each request against its client's bucket.
+
+    Rejected requests get 429 with Retry-After (whole seconds) and never
+    reach the app.
+    """
+
+    def __init__(
+        self,
+        app,
+        store=None,
+        per_minute: float = None,
+        burst: float = None,
+        trust_proxy: bool = None
+    ):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: ASGI app to wrap
+            store: Bucket store (default: from RATE_LIMIT_STORE)
+            per_minute: Tokens refilled per minute (default: RATE_LIMIT)
+            burst: Bucket size (default: RATE_LIMIT_BURST)
+            trust_proxy: Identify clients by X-Forwarded-For
+        """
+        self.app = app
+        self.store = store or create_bucket_store(api_config.rate_limit_store)
+        self.rate = (per_minute or api_config.rate_limit) / 60.0
+        self.capacity = burst or api_config.rate_limit_burst or per_minute or api_config.rate_limit
+        self.trust_proxy = api_config.trust_proxy if trust_proxy is None else trust_proxy
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        cost = min(ROUTE_COSTS.get(scope["path"].rstrip("/") or "/", DEFAULT_COST), self.capacity)
+        # The store may block (SQLite write lock, Redis round trip)
+        wait = await asyncio.to_thread(
+            self.store.take, client_identity(scope, self.trust_proxy), cost, self.capacity, self.rate
+        )
+        if wait <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = max(1, math.ceil(wait))
+        body = orjson.dumps({"detail": f"Rate limit exceeded, retry in {retry_after}s"})
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,25 @@
+"""
+CareerForge AI - Response Classes
+orjson-backed JSON response that serializes Pydantic models directly.
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from utils.serialization import dumps
+
+
+class ORJSONModelResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+
+    Pydantic models anywhere in the content (e.g. a validated LLM
+    payload under "data") are written by pydantic-core straight to JSON
+    and spliced in as fragments, so a payload is serialized once and
+    never round-trips through a dict. Return an instance from the
+    endpoint so FastAPI skips jsonable_encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -5,9 +5,11 @@ CareerForge AI - API Routes Module
 from .health_routes import router as health_router
 from .ai_routes import router as ai_router
 from .quiz_routes import router as quiz_router
+from .job_routes import router as job_router
 
 __all__ = [
     "health_router",
     "ai_router",
     "quiz_router",
+    "job_router",
 ]
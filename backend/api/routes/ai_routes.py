@@ -4,29 +4,40 @@ Main AI-powered endpoints for career guidance.
 """
 
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
-from fastapi import APIRouter, HTTPException
+import json
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 import sys
 import os
-os.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 # sys.path.append('../..')
+from config import cohort_config
+from api.cohort import stream_cohort_roadmaps
+from api.executor import get_executor
+from api.responses import ORJSONModelResponse
 from api.schemas import (
     UserProfile,
+    CohortRoadmapRequest,
+    StepRegenerationRequest,
     SkillsAnalysisRequest,
     TrendingSkillsRequest,
     InterviewPrepRequest,
     MockQuestionsRequest,
     AnswerAnalysisRequest,
+    AnswerAnalysisBatchRequest,
 )
-from services.roadmap_service import RoadmapService
-from services.skills_service import SkillsService
-from services.interview_service import InterviewService
-from services.youtube_service import get_curated_videos
+from services.roadmap_service import get_roadmap_service
+from services.skills_service import get_skills_service
+from services.interview_service import get_interview_service
+from services.youtube_service import get_curated_videos_async
+from services.video_enrichment import get_video_enricher
+from utils.request_context import current_request
+from utils.serialization import dumps
 
 router = APIRouter(prefix="/ai", tags=["AI"])
 
-# Thread pool for parallel execution
-executor = ThreadPoolExecutor(max_workers=12)
+# Shared executor with per-endpoint bulkheads
+executor = get_executor()
 
 
 @router.post("/roadmap")
@@ -38,12 +49,10 @@ async def generate_roadmap(profile: UserProfile):
     Returns a structured 6-month roadmap with weekly breakdowns,
     projects, resources, and checkpoints.
     """
-    loop = asyncio.get_event_loop()
-    
     # Generate roadmap
-    service = RoadmapService()
-    result = await loop.run_in_executor(
-        executor,
+    service = get_roadmap_service()
+    result = await executor.run(
+        "roadmap",
         service.generate_roadmap,
         profile.description,
         profile.hours_per_week,
@@ -57,35 +66,147 @@ async def generate_roadmap(profile: UserProfile):
             detail=result.get("error", "Failed to generate roadmap")
         )
     
-    # Fetch YouTube videos for roadmap steps in parallel
+    # Fetch YouTube videos for roadmap steps in parallel, up to the enrichment deadline
     roadmap = result.get("data", {}).get("roadmap", [])
     
-    async def fetch_videos_for_step(step):
-        """Fetch YouTube videos for a roadmap step."""
-        # Build search query from step title and focus areas
+    def video_query(step):
+        """Build search query from step title and focus areas."""
         title = step.get("title", "")
         focus_areas = step.get("focus_areas", [])
         
         if focus_areas:
-            query = f"{focus_areas[0]} tutorial for beginners"
-        elif title:
-            query = f"{title} tutorial"
-        else:
-            return step
-        
-        try:
-            videos = await loop.run_in_executor(executor, get_curated_videos, query)
-            step["video_results"] = videos
-        except Exception as e:
-            print(f"[AI Routes] YouTube fetch error: {e}")
-            step["video_results"] = []
-        
-        return step
+            return f"{focus_areas[0]} tutorial for beginners"
+        if title:
+            return f"{title} tutorial"
+        return None
+    
+    # Steps that miss the deadline are collected later via the token
+    result["enrichment"] = await get_video_enricher().enrich(roadmap, video_query)
+    
+    return ORJSONModelResponse(result)
+
+
+@router.get("/roadmap/videos/{token}")
+async def get_roadmap_videos(token: str, wait: float = Query(0, ge=0, le=30)):
+    """
+    Collect video_results for roadmap steps that missed the enrichment deadline.
+    
+    Returns the steps finished so far. With `wait`, blocks up to that
+    many seconds for the remaining steps first.
+    """
+    status = await get_video_enricher().wait(token, wait)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired enrichment token")
+    return status
+
+
+@router.get("/roadmap/videos/{token}/stream")
+async def stream_roadmap_videos(token: str):
+    """
+    Stream remaining video_results as NDJSON.
+    
+    Sends a "step" event (step_index, video_results) as each pending
+    step's videos arrive, then a "done" event.
+    """
+    enricher = get_video_enricher()
+    if await enricher.status(token) is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired enrichment token")
+    
+    return StreamingResponse(
+        (json.dumps(event) + "\n" async for event in enricher.stream(token)),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.post("/roadmap/stream")
+async def stream_roadmap(profile: UserProfile):
+    """
+    Stream a career roadmap as NDJSON.
+    
+    A fast outline call returns the career role, summary and step
+    titles first ("skeleton" event). Each step is then expanded in
+    parallel and sent as a "step" event when it finishes, followed
+    by a final "done" event with metadata.
+    """
+    service = get_roadmap_service()
+    events = service.stream_roadmap(
+        profile.description,
+        profile.hours_per_week,
+        profile.max_months,
+        profile.budget
+    )
+    events = executor.iterate("roadmap", events, lambda detail: {"type": "error", "error": detail})
+    
+    return StreamingResponse(
+        (json.dumps(event) + "\n" async for event in events),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.post("/roadmap/cohort")
+async def cohort_roadmap(request: CohortRoadmapRequest):
+    """
+    Generate roadmaps for a whole cohort, streamed as NDJSON.
+    
+    Duplicate profiles (same words and settings, ignoring case, spacing
+    and punctuation) are generated once. Each profile gets a "result"
+    event with its `id` as soon as its roadmap is ready, so results
+    arrive in completion order, not request order. A final "done"
+    event carries the totals.
+    """
+    if len(request.profiles) > cohort_config.max_profiles:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many profiles (max {cohort_config.max_profiles} per request)"
+        )
     
-    # Fetch videos for all steps in parallel
-    await asyncio.gather(*[fetch_videos_for_step(step) for step in roadmap])
+    events = stream_cohort_roadmaps(request.profiles, request.include_videos)
+    return StreamingResponse(
+        (dumps(event) + b"\n" async for event in events),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.post("/roadmap/regenerate-step")
+async def regenerate_roadmap_step(request: StepRegenerationRequest):
+    """
+    Regenerate a single step of an existing roadmap.
     
-    return result
+    Only the selected step is sent to the LLM, optionally with new
+    constraints or feedback. Other steps, including their cached
+    video_results, are returned unchanged.
+    """
+    service = get_roadmap_service()
+    result = await executor.run(
+        "roadmap",
+        service.regenerate_step,
+        request.roadmap,
+        request.step_index,
+        request.hours_per_week,
+        request.budget,
+        request.feedback,
+        request.description
+    )
+    
+    if not result.get("success"):
+        raise HTTPException(
+            status_code=400 if result.get("error_kind") == "invalid_request" else 500,
+            detail=result.get("error", "Failed to regenerate step")
+        )
+    
+    # Fetch videos for the new step only
+    step = result["data"]["roadmap"][request.step_index]
+    title = step.get("step_name", "").split(":", 1)[-1].strip()
+    try:
+        step["video_results"] = await asyncio.wait_for(
+            get_curated_videos_async(f"{title} tutorial"),
+            timeout=current_request().remaining()
+        ) if title else []
+    except Exception as e:
+        print(f"[AI Routes] YouTube fetch error: {e}")
+        step["video_results"] = []
+    
+    return ORJSONModelResponse(result)
 
 
 @router.post("/skills")
@@ -96,11 +217,9 @@ async def analyze_skills(request: SkillsAnalysisRequest):
     Identifies transferable skills, recommends new skills to learn,
     and provides a prioritized skill learning path.
     """
-    loop = asyncio.get_event_loop()
-    
-    service = SkillsService()
-    result = await loop.run_in_executor(
-        executor,
+    service = get_skills_service()
+    result = await executor.run(
+        "skills",
         service.analyze_skills,
         request.background,
         request.target_role,
@@ -113,7 +232,7 @@ async def analyze_skills(request: SkillsAnalysisRequest):
             detail=result.get("error", "Failed to analyze skills")
         )
     
-    return result
+    return ORJSONModelResponse(result)
 
 
 @router.post("/skills/trending")
@@ -124,11 +243,9 @@ async def get_trending_skills(request: TrendingSkillsRequest):
     Returns currently in-demand skills, emerging skills,
     and declining skills to avoid for the specified domain.
     """
-    loop = asyncio.get_event_loop()
-    
-    service = SkillsService()
-    result = await loop.run_in_executor(
-        executor,
+    service = get_skills_service()
+    result = await executor.run(
+        "skills",
         service.get_trending_skills,
         request.domain
     )
@@ -139,7 +256,7 @@ async def get_trending_skills(request: TrendingSkillsRequest):
             detail=result.get("error", "Failed to get trending skills")
         )
     
-    return result
+    return ORJSONModelResponse(result)
 
 
 @router.post("/interview-prep")
@@ -150,11 +267,9 @@ async def generate_interview_prep(request: InterviewPrepRequest):
     Provides technical questions, behavioral questions,
     company research tips, and red flags to avoid.
     """
-    loop = asyncio.get_event_loop()
-    
-    service = InterviewService()
-    result = await loop.run_in_executor(
-        executor,
+    service = get_interview_service()
+    result = await executor.run(
+        "interview",
         service.generate_prep_guide,
         request.role,
         request.experience_level,
@@ -168,7 +283,7 @@ async def generate_interview_prep(request: InterviewPrepRequest):
             detail=result.get("error", "Failed to generate interview prep")
         )
     
-    return result
+    return ORJSONModelResponse(result)
 
 
 @router.post("/interview-prep/questions")
@@ -179,11 +294,9 @@ async def generate_mock_questions(request: MockQuestionsRequest):
     Creates realistic interview questions with answer frameworks,
     key points to cover, and common mistakes to avoid.
     """
-    loop = asyncio.get_event_loop()
-    
-    service = InterviewService()
-    result = await loop.run_in_executor(
-        executor,
+    service = get_interview_service()
+    result = await executor.run(
+        "interview",
         service.generate_mock_questions,
         request.role,
         request.question_type,
@@ -196,7 +309,7 @@ async def generate_mock_questions(request: MockQuestionsRequest):
             detail=result.get("error", "Failed to generate mock questions")
         )
     
-    return result
+    return ORJSONModelResponse(result)
 
 
 @router.post("/interview-prep/analyze")
@@ -207,11 +320,9 @@ async def analyze_interview_answer(request: AnswerAnalysisRequest):
     Provides feedback on the answer including strengths,
     areas for improvement, and an improved version.
     """
-    loop = asyncio.get_event_loop()
-    
-    service = InterviewService()
-    result = await loop.run_in_executor(
-        executor,
+    service = get_interview_service()
+    result = await executor.run(
+        "interview",
         service.analyze_answer,
         request.question,
         request.answer,
@@ -224,4 +335,31 @@ async def analyze_interview_answer(request: AnswerAnalysisRequest):
             detail=result.get("error", "Failed to analyze answer")
         )
     
-    return result
+    return ORJSONModelResponse(result)
+
+
+@router.post("/interview-prep/analyze/batch")
+async def analyze_interview_answers(request: AnswerAnalysisBatchRequest):
+    """
+    Analyze all answers from a mock interview in one generation.
+    
+    Returns one result per answer, in request order, each shaped like
+    the single /interview-prep/analyze response. A few answers the
+    batch output misses are analyzed individually; the rest come back
+    as failed results to retry with /interview-prep/analyze.
+    """
+    service = get_interview_service()
+    result = await executor.run(
+        "interview",
+        service.analyze_answers,
+        [item.model_dump() for item in request.answers],
+        request.role
+    )
+    
+    if not result.get("success"):
+        raise HTTPException(
+            status_code=500,
+            detail=result.get("error", "Failed to analyze answers")
+        )
+    
+    return ORJSONModelResponse(result)
@@ -6,9 +6,11 @@ System health check endpoints.
 from fastapi import APIRouter
 import sys
 import os
-os.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 # sys.path.append('../..')
 from services.llm_service import get_llm_service
+from api.executor import get_executor
+from api.jobs import get_job_manager
 
 router = APIRouter(prefix="/health", tags=["Health"])
 
@@ -43,6 +45,23 @@ async def llm_health_check():
     }
 
 
+@router.get("/executor")
+async def executor_stats():
+    """
+    Per-endpoint-class load of the shared executor.
+    Active calls, queue depth and recent queue wait times.
+    """
+    return get_executor().stats()
+
+
+@router.get("/jobs")
+async def job_stats():
+    """
+    Background job counts by status.
+    """
+    return await get_job_manager().stats()
+
+
 @router.get("/models")
 async def list_available_models():
     """
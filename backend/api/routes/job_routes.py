@@ -0,0 +1,145 @@
+"""
+CareerForge AI - Job Routes
+Background generation endpoints: submit, poll, follow and cancel jobs.
+"""
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from api.jobs import get_job_manager
+from api.rate_limit import client_identity
+from api.responses import ORJSONModelResponse
+from api.schemas import UserProfile, QuizRequest, SkillsAnalysisRequest, InterviewPrepRequest
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+def _accepted(request: Request, job) -> ORJSONModelResponse:
+    """202 response pointing the client at the job's status and event stream."""
+    return ORJSONModelResponse(
+        {
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": request.url_for("get_job", job_id=job.id).path,
+            "events_url": request.url_for("stream_job", job_id=job.id).path,
+        },
+        status_code=202
+    )
+
+
+async def _get_job(job_id: str):
+    job = await get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    return job
+
+
+@router.post("/roadmap", status_code=202)
+async def submit_roadmap_job(profile: UserProfile, request: Request):
+    """
+    Start a roadmap generation in the background.
+    
+    Returns the job id at once; the skeleton and each expanded
+    step show up as partial results while the job runs.
+    """
+    job = await get_job_manager().submit(
+        "roadmap",
+        {
+            "user_profile": profile.description,
+            "hours_per_week": profile.hours_per_week,
+            "max_months": profile.max_months,
+            "budget": profile.budget,
+        },
+        client_identity(request.scope)
+    )
+    return _accepted(request, job)
+
+
+@router.post("/quiz", status_code=202)
+async def submit_quiz_job(quiz: QuizRequest, request: Request):
+    """
+    Start a full quiz generation in the background.
+    """
+    job = await get_job_manager().submit(
+        "quiz",
+        {
+            "topic": quiz.topic,
+            "step_name": quiz.step_name,
+            "num_questions": quiz.num_questions,
+            "difficulty_mix": quiz.difficulty_mix,
+        },
+        client_identity(request.scope)
+    )
+    return _accepted(request, job)
+
+
+@router.post("/skills", status_code=202)
+async def submit_skills_job(request_body: SkillsAnalysisRequest, request: Request):
+    """
+    Start a skills analysis in the background.
+    """
+    job = await get_job_manager().submit(
+        "skills",
+        {
+            "background": request_body.background,
+            "target_role": request_body.target_role,
+            "interests": request_body.interests,
+        },
+        client_identity(request.scope)
+    )
+    return _accepted(request, job)
+
+
+@router.post("/interview", status_code=202)
+async def submit_interview_job(request_body: InterviewPrepRequest, request: Request):
+    """
+    Start an interview preparation guide in the background.
+    """
+    job = await get_job_manager().submit(
+        "interview",
+        {
+            "role": request_body.role,
+            "experience_level": request_body.experience_level,
+            "company": request_body.company,
+            "focus_areas": request_body.focus_areas,
+        },
+        client_identity(request.scope)
+    )
+    return _accepted(request, job)
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str):
+    """
+    Job status, partial results and, once finished, the result or error.
+    """
+    return ORJSONModelResponse((await _get_job(job_id)).view())
+
+
+@router.get("/{job_id}/events")
+async def stream_job(job_id: str):
+    """
+    Follow a job as Server-Sent Events.
+    
+    Emits "status" on each state change, one "partial" per partial
+    result, then a final "result" or "error".
+    """
+    job = await _get_job(job_id)
+    return StreamingResponse(
+        job.sse(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.delete("/{job_id}")
+async def cancel_job(job_id: str):
+    """
+    Cancel a queued or running job.
+    """
+    job = await get_job_manager().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    return ORJSONModelResponse(job.view())
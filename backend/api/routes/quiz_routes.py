@@ -3,20 +3,22 @@ CareerForge AI - Quiz Routes
 Quiz generation endpoints.
 """
 
-import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import json
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 import sys
 import os
-os.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 # sys.path.append('../..')
+from api.executor import get_executor
+from api.responses import ORJSONModelResponse
 from api.schemas import QuizRequest, QuizBatchRequest
-from services.quiz_service_v2 import QuizService
+from services.quiz_service_v2 import get_quiz_service
 
 router = APIRouter(prefix="/quiz", tags=["Quiz"])
 
-# Thread pool for parallel execution
-executor = ThreadPoolExecutor(max_workers=8)
+# Shared executor with per-endpoint bulkheads
+executor = get_executor()
 
 
 @router.post("")
@@ -27,11 +29,9 @@ async def generate_quiz(request: QuizRequest):
     Creates a set of MCQ questions with varying difficulty,
     explanations, and optional code snippets.
     """
-    loop = asyncio.get_event_loop()
-    
-    service = QuizService()
-    result = await loop.run_in_executor(
-        executor,
+    service = get_quiz_service()
+    result = await executor.run(
+        "quiz",
         service.generate_quiz,
         request.topic,
         request.step_name,
@@ -45,7 +45,7 @@ async def generate_quiz(request: QuizRequest):
             detail=result["error"]
         )
     
-    return result
+    return ORJSONModelResponse(result)
 
 
 @router.post("/batch")
@@ -56,11 +56,9 @@ async def generate_quiz_batch(request: QuizBatchRequest):
     Useful for progressive loading or generating
     additional questions for a step.
     """
-    loop = asyncio.get_event_loop()
-    
-    service = QuizService()
-    result = await loop.run_in_executor(
-        executor,
+    service = get_quiz_service()
+    result = await executor.run(
+        "quiz",
         service.generate_quiz_batch,
         request.topic,
         request.step_name,
@@ -75,4 +73,28 @@ async def generate_quiz_batch(request: QuizBatchRequest):
             detail=result["error"]
         )
     
-    return result
+    return ORJSONModelResponse(result)
+
+
+@router.post("/batch/stream")
+async def stream_quiz_batch(request: QuizBatchRequest):
+    """
+    Stream a batch of quiz questions as NDJSON.
+    
+    Each line is one validated question, sent as soon as it has
+    been generated. Malformed questions are skipped.
+    """
+    service = get_quiz_service()
+    questions = service.stream_quiz_batch(
+        request.topic,
+        request.step_name,
+        request.count,
+        request.start_id,
+        request.difficulty
+    )
+    questions = executor.iterate("quiz", questions, lambda detail: {"error": detail})
+    
+    return StreamingResponse(
+        (json.dumps(q) + "\n" async for q in questions),
+        media_type="application/x-ndjson"
+    )
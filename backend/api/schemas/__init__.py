@@ -4,15 +4,30 @@ CareerForge AI - API Schemas Module
 
 from .requests import (
     UserProfile,
+    CohortProfile,
+    CohortRoadmapRequest,
+    StepRegenerationRequest,
     SkillsAnalysisRequest,
     TrendingSkillsRequest,
     InterviewPrepRequest,
     MockQuestionsRequest,
     AnswerAnalysisRequest,
+    AnswerAnalysisBatchRequest,
     QuizRequest,
     QuizBatchRequest,
 )
 
+from .payloads import (
+    RoadmapPayload,
+    QuizPayload,
+    SkillsAnalysisPayload,
+    TrendingSkillsPayload,
+    InterviewPrepPayload,
+    MockQuestionsPayload,
+    AnswerAnalysisPayload,
+    AnswerAnalysisBatchPayload,
+)
+
 from .responses import (
     MetaInfo,
     SuccessResponse,
@@ -24,13 +39,26 @@ from .responses import (
 __all__ = [
     # Request schemas
     "UserProfile",
+    "CohortProfile",
+    "CohortRoadmapRequest",
+    "StepRegenerationRequest",
     "SkillsAnalysisRequest",
     "TrendingSkillsRequest",
     "InterviewPrepRequest",
     "MockQuestionsRequest",
     "AnswerAnalysisRequest",
+    "AnswerAnalysisBatchRequest",
     "QuizRequest",
     "QuizBatchRequest",
+    # LLM payload schemas
+    "RoadmapPayload",
+    "QuizPayload",
+    "SkillsAnalysisPayload",
+    "TrendingSkillsPayload",
+    "InterviewPrepPayload",
+    "MockQuestionsPayload",
+    "AnswerAnalysisPayload",
+    "AnswerAnalysisBatchPayload",
     # Response schemas
     "MetaInfo",
     "SuccessResponse",
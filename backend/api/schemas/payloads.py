@@ -0,0 +1,243 @@
+"""
+CareerForge AI - LLM Payload Schemas
+Pydantic models for the JSON the LLM returns. LLMService validates raw
+model output against these in one pass (model_validate_json), and the
+validated models are serialized straight to the response body.
+
+Models are lenient: unknown keys are kept, optional fields may be
+missing, and a list item that fails validation is dropped instead of
+failing the whole payload.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Union
+
+from pydantic import BaseModel, ConfigDict, ValidationError, field_validator, model_validator
+
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+class Payload(BaseModel):
+    """Base for LLM payloads: keep extra keys, tolerate loose types."""
+    model_config = ConfigDict(extra="allow")
+
+
+def _drop_invalid_items(value: Any, handler) -> Any:
+    """Wrap-validator body: validate a list item by item, skipping bad items."""
+    try:
+        return handler(value)
+    except ValidationError:
+        if not isinstance(value, list):
+            raise
+        kept = []
+        for item in value:
+            try:
+                kept.extend(handler([item]))
+            except ValidationError:
+                continue
+        return kept
+
+
+# ============================================================
+# Roadmap
+# ============================================================
+
+class RoadmapStep(Payload):
+    """One roadmap step (simple or detailed prompt format)."""
+    step_name: Optional[str] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    official_docs_url: Optional[str] = None
+    paid_course_recommendation: Optional[str] = None
+    focus_areas: List[str] = []
+
+    @model_validator(mode="before")
+    @classmethod
+    def _from_text(cls, value):
+        # A step given only as its title: "Month 1: Python basics"
+        if isinstance(value, str):
+            return {"step_name": value}
+        return value
+
+
+class RoadmapPayload(Payload):
+    """Full roadmap as returned by the roadmap prompts."""
+    career_role: Optional[str] = None
+    summary: Optional[str] = None
+    overview: Optional[str] = None
+    roadmap: List[RoadmapStep] = []
+
+    @field_validator("roadmap", mode="wrap")
+    @classmethod
+    def _valid_steps(cls, value, handler):
+        return _drop_invalid_items(value, handler)
+
+    # Runs before _valid_steps (before-validators run in reverse order)
+    @field_validator("roadmap", mode="before")
+    @classmethod
+    def _steps_list(cls, value):
+        # Steps keyed by period ({"Month 1": {...}, "Month 2": "Docker"})
+        # become a list, the key standing in for a missing title; a
+        # single step (object or text) becomes a one-step list
+        if isinstance(value, list):
+            return value
+        if isinstance(value, str):
+            return [value] if value.strip() else []
+        if not isinstance(value, dict):
+            return []
+        if "step_name" in value or "title" in value:
+            return [value]
+
+        steps = []
+        for key, step in value.items():
+            if isinstance(step, str):
+                step = {"step_name": f"{key}: {step}"}
+            elif isinstance(step, dict) and not (step.get("step_name") or step.get("title")):
+                step = {**step, "step_name": str(key)}
+            steps.append(step)
+        return steps
+
+
+# ============================================================
+# Quiz
+# ============================================================
+
+class QuizQuestion(Payload):
+    """A multiple-choice question; `correct` must name one of the options."""
+    id: Optional[int] = None
+    question: str
+    code_snippet: Optional[str] = None
+    options: Dict[str, str]
+    correct: str
+    explanation: str = ""
+    difficulty: Optional[str] = None
+    topic_tag: Optional[str] = None
+
+    @field_validator("options", mode="before")
+    @classmethod
+    def _option_text(cls, value):
+        # Numeric options ({"A": 4}) are still valid answers
+        if isinstance(value, dict):
+            return {str(k): v if isinstance(v, str) else str(v) for k, v in value.items()}
+        return value
+
+    @model_validator(mode="after")
+    def _check_answer(self):
+        if not self.question.strip():
+            raise ValueError("question is empty")
+        if len([o for o in self.options.values() if o.strip()]) < 2:
+            raise ValueError("need at least two options")
+        if self.correct not in self.options:
+            raise ValueError("correct answer is not one of the options")
+        return self
+
+
+class QuizPayload(Payload):
+    """Quiz or quiz batch; malformed questions are dropped."""
+    questions: List[QuizQuestion] = []
+
+    @field_validator("questions", mode="wrap")
+    @classmethod
+    def _valid_questions(cls, value, handler):
+        return _drop_invalid_items(value, handler)
+
+
+# ============================================================
+# Skills
+# ============================================================
+
+class SkillsAnalysisPayload(Payload):
+    """Skills analysis for a user's background."""
+    profile_summary: Optional[str] = None
+    recommended_skills: List[Any] = []
+    learning_path: Any = None
+
+
+class TrendingSkill(Payload):
+    skill: str
+    trend: Optional[str] = None
+    demand_level: Optional[str] = None
+
+
+class TrendingSkillsPayload(Payload):
+    """Trending skills for a domain."""
+    trending_skills: List[TrendingSkill] = []
+
+    @field_validator("trending_skills", mode="wrap")
+    @classmethod
+    def _valid_skills(cls, value, handler):
+        return _drop_invalid_items(value, handler)
+
+
+# ============================================================
+# Interview
+# ============================================================
+
+class InterviewPrepPayload(Payload):
+    """Interview preparation guide."""
+    technical_questions: List[Any] = []
+    behavioral_questions: List[Any] = []
+    tips: List[Any] = []
+
+
+class MockQuestion(Payload):
+    question: str
+    type: Optional[str] = None
+    difficulty: Optional[str] = None
+
+
+class MockQuestionsPayload(Payload):
+    """Mock interview questions."""
+    questions: List[MockQuestion] = []
+
+    @field_validator("questions", mode="wrap")
+    @classmethod
+    def _valid_questions(cls, value, handler):
+        return _drop_invalid_items(value, handler)
+
+
+class AnswerAnalysisPayload(Payload):
+    """Feedback on one interview answer."""
+    score: Optional[Union[int, float]] = None
+    strengths: List[str] = []
+    improvements: List[str] = []
+    improved_answer: Optional[str] = None
+
+    @field_validator("score", mode="before")
+    @classmethod
+    def _parse_score(cls, value):
+        # Models sometimes answer "7/10" or "Score: 7"
+        if isinstance(value, str):
+            match = _NUMBER_RE.search(value)
+            if not match:
+                return None
+            number = match.group(0)
+            return float(number) if "." in number else int(number)
+        return value
+
+
+class AnswerAnalysisBatchPayload(Payload):
+    """Feedback on several answers, keyed by answer number ("1", "2", ...)."""
+    analyses: Dict[str, AnswerAnalysisPayload] = {}
+
+    @field_validator("analyses", mode="wrap")
+    @classmethod
+    def _valid_analyses(cls, value, handler):
+        # Models sometimes answer with a list in question order, or keys
+        # like "answer_2"; entries that fail validation are dropped
+        if isinstance(value, list):
+            value = {str(index + 1): item for index, item in enumerate(value)}
+        if not isinstance(value, dict):
+            return handler(value)
+
+        kept = {}
+        for key, item in value.items():
+            match = _NUMBER_RE.search(str(key))
+            if not match:
+                continue
+            try:
+                kept.update(handler({str(abs(int(float(match.group(0))))): item}))
+            except ValidationError:
+                continue
+        return kept
+
@@ -3,8 +3,8 @@ CareerForge AI - API Request Schemas
 Pydantic models for request validation.
 """
 
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict
+from pydantic import BaseModel, Field, field_validator
+from typing import Any, List, Optional, Dict
 
 
 class UserProfile(BaseModel):
@@ -33,6 +33,73 @@ class UserProfile(BaseModel):
     )
 
 
+class CohortProfile(UserProfile):
+    """One profile in a cohort roadmap request."""
+    id: str = Field(
+        ...,
+        min_length=1,
+        max_length=200,
+        description="Caller's correlation id, echoed on this profile's result"
+    )
+
+
+class CohortRoadmapRequest(BaseModel):
+    """Request for roadmaps for many profiles at once (e.g. a student cohort)."""
+    profiles: List[CohortProfile] = Field(
+        ...,
+        min_length=1,
+        description="Profiles to generate roadmaps for, each with a unique id"
+    )
+    include_videos: bool = Field(
+        default=True,
+        description="Attach YouTube videos to each roadmap's steps"
+    )
+
+    @field_validator("profiles")
+    @classmethod
+    def _unique_ids(cls, profiles: List[CohortProfile]) -> List[CohortProfile]:
+        seen = set()
+        for profile in profiles:
+            if profile.id in seen:
+                raise ValueError(f"Duplicate profile id: {profile.id}")
+            seen.add(profile.id)
+        return profiles
+
+
+class StepRegenerationRequest(BaseModel):
+    """Request to regenerate one step of an existing roadmap."""
+    roadmap: Dict[str, Any] = Field(
+        ...,
+        description="Existing roadmap data (career_role, summary, roadmap steps)"
+    )
+    step_index: int = Field(
+        ...,
+        ge=0,
+        description="Zero-based index of the step to regenerate"
+    )
+    description: Optional[str] = Field(
+        default=None,
+        max_length=5000,
+        description="Original user profile, for extra context"
+    )
+    hours_per_week: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=60,
+        description="Updated study hours per week"
+    )
+    budget: Optional[str] = Field(
+        default=None,
+        max_length=200,
+        description="Updated budget for learning resources"
+    )
+    feedback: Optional[str] = Field(
+        default=None,
+        max_length=1000,
+        description="What the user disliked about the current step"
+    )
+
+
 class SkillsAnalysisRequest(BaseModel):
     """Request for skills analysis."""
     background: str = Field(
@@ -127,6 +194,38 @@ class AnswerAnalysisRequest(BaseModel):
     )
 
 
+class AnsweredQuestion(BaseModel):
+    """One question and answer from a mock interview."""
+    question: str = Field(
+        ...,
+        min_length=5,
+        max_length=1000,
+        description="The interview question"
+    )
+    answer: str = Field(
+        ...,
+        min_length=20,
+        max_length=5000,
+        description="User's answer to evaluate"
+    )
+
+
+class AnswerAnalysisBatchRequest(BaseModel):
+    """Request for analysis of several answers from one mock interview."""
+    role: str = Field(
+        ...,
+        min_length=2,
+        max_length=200,
+        description="Target role for context"
+    )
+    answers: List[AnsweredQuestion] = Field(
+        ...,
+        min_length=1,
+        max_length=15,
+        description="Questions and answers, analyzed together"
+    )
+
+
 class QuizRequest(BaseModel):
     """Request for quiz generation."""
     topic: str = Field(
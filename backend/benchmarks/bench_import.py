@@ -0,0 +1,110 @@
+"""
+CareerForge AI - Import Time Benchmark
+Imports each entry point in a fresh interpreter under `python -X importtime`
+and checks the cold-start path stays lean:
+
+- the cumulative import time is under budget (best of several runs)
+- importing prints nothing (work happens at startup, not import)
+- heavy optional packages (numpy, SDKs) are not loaded
+
+Exits non-zero when any check fails, so it can run in CI.
+
+Run from backend/:
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --budget 500 --top 15
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Milliseconds; cumulative import time on a modest machine, with headroom
+BUDGETS = {
+    "main_v2": 600,
+    "main": 600,
+    "worker": 300,
+}
+
+# Loaded on first use only
+DEFERRED = ("numpy", "openai", "google", "redis")
+
+
+def measure(module: str):
+    """
+    Import a module in a fresh interpreter.
+
+    Returns:
+        Tuple of (total ms, {direct import: cumulative ms}, stdout, deferred packages loaded)
+    """
+    check = (
+        f"import sys, {module}; "
+        f"print('\\n'.join(m for m in {DEFERRED!r} if m in sys.modules), file=sys.stderr)"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", check],
+        cwd=BACKEND, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr}")
+
+    rows, loaded = [], []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            if line.strip() in DEFERRED:
+                loaded.append(line.strip())
+            continue
+        fields = line[len("import time:"):].split("|")
+        if fields[0].strip() == "self [us]":
+            continue
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((depth, name.strip(), int(fields[1]) / 1000))
+
+    # Children are listed before their parent, one level deeper
+    end = max(i for i, (depth, name, _) in enumerate(rows) if depth == 0 and name == module)
+    direct = {}
+    for depth, name, ms in reversed(rows[:end]):
+        if depth == 0:
+            break
+        if depth == 1:
+            direct[name] = ms
+    return rows[end][2], direct, proc.stdout, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("modules", nargs="*", default=list(BUDGETS), help="Entry points to import")
+    parser.add_argument("--budget", type=float, help="Budget in ms for every module (default: per module)")
+    parser.add_argument("--runs", type=int, default=5, help="Imports per module; the fastest counts")
+    parser.add_argument("--top", type=int, default=10, help="Slowest direct imports to list per module")
+    args = parser.parse_args()
+
+    failures = []
+    for module in args.modules:
+        runs = [measure(module) for _ in range(args.runs)]
+        total, times, output, loaded = min(runs, key=lambda run: run[0])
+        budget = args.budget or BUDGETS.get(module, 500)
+
+        status = "ok" if total <= budget else "OVER BUDGET"
+        print(f"{module}: {total:.0f} ms (budget {budget:.0f} ms) {status}")
+        top = sorted(((ms, name) for name, ms in times.items()), reverse=True)
+        for ms, name in top[:args.top]:
+            print(f"  {ms:>8.1f} ms  {name}")
+
+        if total > budget:
+            failures.append(f"{module} took {total:.0f} ms (budget {budget:.0f} ms)")
+        if output:
+            failures.append(f"{module} printed at import: {output.splitlines()[0]!r}")
+        if loaded:
+            failures.append(f"{module} loaded {', '.join(loaded)} at import")
+
+    if failures:
+        print("\n" + "\n".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
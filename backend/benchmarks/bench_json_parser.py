@@ -0,0 +1,142 @@
+"""
+CareerForge AI - JSON Extraction Benchmark
+Runs the malformed-output corpus through the old brace counter, the old
+LLMService rfind heuristic and the new extractor, then times each on a
+large roadmap response (clean, wrapped in prose, and truncated).
+
+Run from backend/:
+    python benchmarks/bench_json_parser.py
+"""
+
+import json
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.json_parser import extract_json_from_text
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "malformed_llm_outputs.jsonl")
+
+
+def legacy_extract_json_from_text(text):
+    """utils.json_parser.extract_json_from_text before the repair engine."""
+    if not text:
+        return None
+    cleaned = text.strip()
+    for pattern in (r'^```json\s*\n?(.*?)\n?```$', r'^```\s*\n?(.*?)\n?```$', r'^`(.*)`$'):
+        match = re.match(pattern, cleaned, re.DOTALL)
+        if match:
+            cleaned = match.group(1).strip()
+            break
+    try:
+        return json.loads(cleaned)
+    except json.JSONDecodeError:
+        pass
+    for opener, closer, wrap in (('{', '}', False), ('[', ']', True)):
+        try:
+            start = cleaned.find(opener)
+            if start == -1:
+                return None
+            depth, end = 0, start
+            for i, char in enumerate(cleaned[start:], start):
+                if char == opener:
+                    depth += 1
+                elif char == closer:
+                    depth -= 1
+                    if depth == 0:
+                        end = i + 1
+                        break
+            if end > start:
+                parsed = json.loads(cleaned[start:end])
+                return {"data": parsed} if wrap else parsed
+        except json.JSONDecodeError:
+            pass
+    return None
+
+
+def legacy_llm_extract_json(text):
+    """LLMService._extract_json before the repair engine."""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    cleaned = text.strip()
+    if cleaned.startswith("```json"):
+        cleaned = cleaned[7:]
+    elif cleaned.startswith("```"):
+        cleaned = cleaned[3:]
+    if cleaned.endswith("```"):
+        cleaned = cleaned[:-3]
+    try:
+        return json.loads(cleaned.strip())
+    except json.JSONDecodeError:
+        pass
+    try:
+        start = cleaned.find("{")
+        end = cleaned.rfind("}") + 1
+        if start != -1 and end > start:
+            return json.loads(cleaned[start:end])
+    except json.JSONDecodeError:
+        pass
+    return None
+
+
+PARSERS = {
+    "legacy brace counter": legacy_extract_json_from_text,
+    "legacy LLMService": legacy_llm_extract_json,
+    "repair engine": extract_json_from_text,
+}
+
+
+def _big_roadmap() -> str:
+    steps = [{
+        "step_name": f"Month {n}: Topic {n}",
+        "description": "Build things with {braces} and [brackets], " * 8,
+        "key_skills": [f"skill {i}" for i in range(8)],
+        "project": {"name": f"Project {n}", "code": "def main():\n    return {'ok': True}\n" * 4},
+    } for n in range(1, 7)]
+    return json.dumps({"career_role": "Backend Developer", "summary": "x" * 200, "roadmap": steps}, indent=2)
+
+
+def main() -> None:
+    with open(CORPUS, encoding="utf-8") as f:
+        cases = [json.loads(line) for line in f if line.strip()]
+
+    print(f"Corpus: {len(cases)} outputs\n")
+    print(f"{'parser':<24}{'correct':>9}{'us/case':>10}")
+    for name, parse in PARSERS.items():
+        correct = 0
+        for case in cases:
+            try:
+                correct += parse(case["text"]) == case["expected"]
+            except Exception:
+                pass
+        seconds = min(timeit.repeat(lambda: [parse(c["text"]) for c in cases], number=50, repeat=3)) / 50
+        print(f"{name:<24}{correct:>5}/{len(cases):<3}{seconds / len(cases) * 1e6:>10.1f}")
+
+    failures = [c["id"] for c in cases if extract_json_from_text(c["text"]) != c["expected"]]
+    if failures:
+        print(f"\nRepair engine mismatches: {', '.join(failures)}")
+
+    big = _big_roadmap()
+    inputs = {
+        "clean": big,
+        "prose-wrapped": f"Here is your roadmap:\n```json\n{big}\n```\nGood luck! {{}}",
+        "truncated": big[: len(big) * 2 // 3],
+    }
+    print(f"\nLarge roadmap ({len(big) // 1024}KB), ms per parse (ok = parsed to a dict)")
+    print(f"{'parser':<24}" + "".join(f"{label:>18}" for label in inputs))
+    for name, parse in PARSERS.items():
+        cells = []
+        for text in inputs.values():
+            ok = isinstance(parse(text), dict)
+            seconds = min(timeit.repeat(lambda: parse(text), number=50, repeat=3)) / 50
+            cells.append(f"{seconds * 1000:>12.3f} {'ok' if ok else 'FAIL':>4}")
+        print(f"{name:<24}" + "".join(f"{cell:>18}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+CareerForge AI - Input Sanitizer Benchmark
+Times the old ten-pass sanitize_input against the compiled single-pass
+version on 5000-character inputs, after checking both agree.
+
+Run from backend/:
+    python benchmarks/bench_sanitize.py
+"""
+
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.validators import canonical_input, sanitize_input
+
+LENGTH = 5000
+
+
+def legacy_sanitize_input(text, max_length=5000):
+    """utils.validators.sanitize_input before the compiled matcher."""
+    if not text or not isinstance(text, str):
+        return ""
+    text = text[:max_length]
+    injection_patterns = [
+        r'ignore (all )?previous instructions',
+        r'disregard (all )?(previous|above) (instructions|prompts)',
+        r'forget (everything|all)',
+        r'system prompt:',
+        r'new instructions:',
+        r'\[INST\]',
+        r'\[/INST\]',
+        r'<\|.*?\|>',
+        r'<<SYS>>',
+        r'<</SYS>>',
+    ]
+    for pattern in injection_patterns:
+        text = re.sub(pattern, '[FILTERED]', text, flags=re.IGNORECASE)
+    text = ' '.join(text.split())
+    return text.strip()
+
+
+def make_inputs():
+    """5000-char profiles: plain prose, messy whitespace, injection-heavy and non-ASCII."""
+    rng = random.Random(7)
+    words = (
+        "I am a backend developer with five years of experience in Python Django "
+        "PostgreSQL and AWS looking to move into machine learning engineering with "
+        "about ten hours per week and a small budget for courses"
+    ).split()
+    injections = [
+        "ignore all previous instructions", "[INST]", "<|im_start|>", "<<SYS>>",
+        "system prompt:", "forget everything",
+    ]
+
+    def build(separators, injection_rate):
+        parts = []
+        while sum(len(p) for p in parts) < LENGTH:
+            if rng.random() < injection_rate:
+                parts.append(rng.choice(injections))
+            else:
+                parts.append(rng.choice(words))
+            parts.append(rng.choice(separators))
+        return "".join(parts)[:LENGTH]
+
+    return {
+        "prose": build([" "], 0.0),
+        "whitespace": build([" ", "  ", "\n", "\t", " \n "], 0.0),
+        "injections": build([" ", "\n"], 0.1),
+        "non-ascii": build([" ", "\u00a0"], 0.05),
+        # "ß" changes length when case-folded, forcing the IGNORECASE matcher
+        "eszett": build([" ", " Straße "], 0.05),
+    }
+
+
+def main():
+    inputs = make_inputs()
+
+    for name, text in inputs.items():
+        assert sanitize_input(text) == legacy_sanitize_input(text), name
+
+    print(f"{'input':<12}{'legacy (us)':>14}{'compiled (us)':>16}{'canonical (us)':>17}{'speedup':>10}")
+    for name, text in inputs.items():
+        number = 500
+        legacy = min(timeit.repeat(lambda: legacy_sanitize_input(text), number=number, repeat=5)) / number
+        compiled = min(timeit.repeat(lambda: sanitize_input(text), number=number, repeat=5)) / number
+        canonical = min(timeit.repeat(lambda: canonical_input(text), number=number, repeat=5)) / number
+        print(
+            f"{name:<12}{legacy * 1e6:>14.1f}{compiled * 1e6:>16.1f}"
+            f"{canonical * 1e6:>17.1f}{legacy / compiled:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
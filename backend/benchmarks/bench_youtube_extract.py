@@ -0,0 +1,63 @@
+"""
+CareerForge AI - YouTube Extraction Benchmark
+Compares the ytInitialData extractor with the previous backtracking
+regex on saved results-page fixtures.
+
+Run from backend/:
+    python benchmarks/bench_youtube_extract.py
+"""
+
+import glob
+import gzip
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.youtube_extractor import extract_videos, find_initial_data
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# The regex youtube_service used before the extractor
+LEGACY_PATTERN = r'"videoId":"([a-zA-Z0-9_-]{11})","thumbnail".*?"title":\{"runs":\[\{"text":"([^"]+)"\}\].*?"longBylineText":\{"runs":\[\{"text":"([^"]+)"'
+
+
+def legacy_extract(html: str) -> list:
+    return re.findall(LEGACY_PATTERN, html)
+
+
+def extractor_extract(html: str) -> list:
+    return list(extract_videos(html, max(find_initial_data(html), 0)))
+
+
+def main() -> None:
+    paths = sorted(glob.glob(os.path.join(FIXTURE_DIR, "youtube_results_*.html.gz")))
+    if not paths:
+        print("No fixtures found; run benchmarks/make_youtube_fixtures.py first")
+        return
+
+    print(f"{'fixture':<32}{'size':>8}{'regex ms':>11}{'found':>7}{'extractor ms':>15}{'found':>7}{'speedup':>9}")
+    for path in paths:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            html = f.read()
+
+        runs = 20
+        regex_s = min(timeit.repeat(lambda: legacy_extract(html), number=runs, repeat=3)) / runs
+        extractor_s = min(timeit.repeat(lambda: extractor_extract(html), number=runs, repeat=3)) / runs
+        regex_found = len(legacy_extract(html))
+        videos = extractor_extract(html)
+        with_duration = sum(1 for v in videos if v["duration"] is not None)
+
+        print(
+            f"{os.path.basename(path):<32}{len(html) // 1024:>6}KB"
+            f"{regex_s * 1000:>11.2f}{regex_found:>7}"
+            f"{extractor_s * 1000:>15.2f}{len(videos):>7}"
+            f"{regex_s / extractor_s:>8.1f}x"
+        )
+        print(f"{'':<32}extractor also returned duration for {with_duration}/{len(videos)} videos")
+
+
+if __name__ == "__main__":
+    main()
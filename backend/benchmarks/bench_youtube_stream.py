@@ -0,0 +1,70 @@
+"""
+CareerForge AI - Streamed YouTube Extraction Benchmark
+Feeds results-page fixtures to the streaming collector in network-sized
+chunks and reports how much of each page is read before it stops, the
+peak buffer size and the parse time, against parsing the whole page.
+
+Run from backend/:
+    python benchmarks/bench_youtube_stream.py
+"""
+
+import glob
+import gzip
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import youtube_config
+from services.youtube_service import _ResultCollector
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+CHUNK_SIZE = 16 * 1024
+
+
+def full_parse(html: str, max_results: int) -> list:
+    """Parse the whole page at once, as before streaming."""
+    collector = _ResultCollector(max_results)
+    collector.feed(html)
+    return collector.results()
+
+
+def stream_parse(html: str, max_results: int):
+    """Return (videos, chars read, peak buffer chars)."""
+    collector = _ResultCollector(max_results)
+    peak = 0
+    for offset in range(0, len(html), CHUNK_SIZE):
+        done = collector.feed(html[offset:offset + CHUNK_SIZE])
+        peak = max(peak, len(collector.extractor._buffer))
+        if done:
+            break
+    return collector.results(), collector.extractor.chars_seen, peak
+
+
+def main() -> None:
+    paths = sorted(glob.glob(os.path.join(FIXTURE_DIR, "youtube_results_*.html.gz")))
+    if not paths:
+        print("No fixtures found; run benchmarks/make_youtube_fixtures.py first")
+        return
+
+    max_results = youtube_config.max_videos
+    print(f"{'fixture':<32}{'page':>8}{'read':>8}{'peak buf':>10}{'full ms':>9}{'stream ms':>11}{'same':>6}")
+    for path in paths:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            html = f.read()
+
+        runs = 20
+        full_s = min(timeit.repeat(lambda: full_parse(html, max_results), number=runs, repeat=3)) / runs
+        stream_s = min(timeit.repeat(lambda: stream_parse(html, max_results), number=runs, repeat=3)) / runs
+        videos, read, peak = stream_parse(html, max_results)
+
+        print(
+            f"{os.path.basename(path):<32}{len(html) // 1024:>6}KB{read // 1024:>6}KB"
+            f"{peak // 1024:>8}KB{full_s * 1000:>9.2f}{stream_s * 1000:>11.2f}"
+            f"{str(videos == full_parse(html, max_results)):>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+CareerForge AI - YouTube Fixture Builder
+Writes gzipped HTML fixtures shaped like real YouTube results pages
+(~750KB, ytInitialData blob surrounded by player config and scripts).
+
+Run from backend/:
+    python benchmarks/make_youtube_fixtures.py
+"""
+
+import gzip
+import json
+import os
+import random
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+TOPICS = {
+    "python": ["Python", "Django", "FastAPI", "Pandas", "Flask"],
+    "react": ["React", "Next.js", "Redux", "React Hooks", "TypeScript"],
+    "sql": ["SQL", "PostgreSQL", "MySQL", "Database Design", "SQL Joins"],
+}
+
+TITLE_FORMS = [
+    "{t} Full Course for Beginners",
+    "{t} Tutorial - Complete Course",
+    "Learn {t} in {h} Hours \\u0026 Build Projects",
+    "{t} Crash Course",
+    "{t} in 60 seconds #shorts",
+    "{t} Bootcamp \\u2013 Zero to Hero",
+    "Why \\\"{t}\\\" is Hard: 5 Mistakes",
+]
+
+CHANNELS = ["freeCodeCamp.org", "Programming with Mosh", "Tech With Tim", "Traversy Media", "Corey Schafer", "Net Ninja"]
+
+
+def _id(rng: random.Random, n: int = 11) -> str:
+    alphabet = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_"
+    return "".join(rng.choice(alphabet) for _ in range(n))
+
+
+def _tracking(rng: random.Random) -> str:
+    return _id(rng, 120)
+
+
+def _run_text(text: str, rng: random.Random) -> dict:
+    return {"runs": [{"text": text, "navigationEndpoint": {
+        "clickTrackingParams": _tracking(rng),
+        "commandMetadata": {"webCommandMetadata": {"url": f"/@{_id(rng, 8)}", "webPageType": "WEB_PAGE_TYPE_CHANNEL"}},
+        "browseEndpoint": {"browseId": "UC" + _id(rng, 22), "canonicalBaseUrl": f"/@{_id(rng, 8)}"}}}]}
+
+
+def _video_renderer(rng: random.Random, topic: str) -> dict:
+    video_id = _id(rng)
+    hours = rng.choice([0, 0, 1, 2, 4, 6])
+    minutes = rng.randint(0, 59)
+    seconds = rng.randint(0, 59)
+    length = f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+    title = rng.choice(TITLE_FORMS).format(t=topic, h=hours or 1)
+    channel = rng.choice(CHANNELS)
+    views = f"{rng.randint(1000, 9000000):,} views"
+    thumbs = [{"url": f"https://i.ytimg.com/vi/{video_id}/hq720.jpg?sqp={_id(rng, 40)}", "width": w, "height": h}
+              for w, h in ((360, 202), (720, 404))]
+
+    return {
+        "videoId": video_id,
+        "thumbnail": {"thumbnails": thumbs},
+        "title": {"runs": [{"text": json.loads(f'"{title}"')}],
+                  "accessibility": {"accessibilityData": {"label": f"{json.loads(chr(34) + title + chr(34))} by {channel} {views} {length}"}}},
+        "longBylineText": _run_text(channel, rng),
+        "publishedTimeText": {"simpleText": f"{rng.randint(1, 11)} months ago"},
+        "lengthText": {"accessibility": {"accessibilityData": {"label": length}}, "simpleText": length},
+        "viewCountText": {"simpleText": views},
+        "navigationEndpoint": {
+            "clickTrackingParams": _tracking(rng),
+            "commandMetadata": {"webCommandMetadata": {"url": f"/watch?v={video_id}", "webPageType": "WEB_PAGE_TYPE_WATCH", "rootVe": 3832}},
+            "watchEndpoint": {"videoId": video_id, "params": _id(rng, 16), "watchEndpointSupportedOnesieConfig": {
+                "html5PlaybackOnesieConfig": {"commonConfig": {"url": f"https://rr2---sn-{_id(rng, 8)}.googlevideo.com/initplayback?source=youtube&oeis=1&c=WEB&oad=3200&ovd=3200&oaad=11000&oavd=11000&ocs=700&oewis=1&oputc=1&ofpcc=1&msp=1&odepv=1&id={_id(rng, 16)}&ip=0.0.0.0&initcwndbps=1000000&mt=1700000000&oweuc="}}}},
+        },
+        "ownerBadges": [{"metadataBadgeRenderer": {"icon": {"iconType": "CHECK_CIRCLE_THICK"}, "style": "BADGE_STYLE_TYPE_VERIFIED", "tooltip": "Verified", "trackingParams": _tracking(rng)}}],
+        "ownerText": _run_text(channel, rng),
+        "shortBylineText": _run_text(channel, rng),
+        "trackingParams": _tracking(rng),
+        "showActionMenu": False,
+        "shortViewCountText": {"simpleText": "1.2M views"},
+        "menu": {"menuRenderer": {"items": [{"menuServiceItemRenderer": {"text": {"runs": [{"text": label}]}, "icon": {"iconType": "ADD_TO_QUEUE_TAIL"}, "trackingParams": _tracking(rng)}} for label in ("Add to queue", "Save to Watch later", "Share")]}},
+        "channelThumbnailSupportedRenderers": {"channelThumbnailWithLinkRenderer": {"thumbnail": {"thumbnails": [{"url": f"https://yt3.ggpht.com/{_id(rng, 60)}=s68-c-k-c0x00ffffff-no-rj", "width": 68, "height": 68}]}}},
+        "thumbnailOverlays": [{"thumbnailOverlayTimeStatusRenderer": {"text": {"simpleText": length}, "style": "DEFAULT"}},
+                              {"thumbnailOverlayToggleButtonRenderer": {"isToggled": False, "untoggledIcon": {"iconType": "WATCH_LATER"}, "trackingParams": _tracking(rng)}}],
+        "detailedMetadataSnippets": [{"snippetText": {"runs": [{"text": f"In this {topic} course you will learn "}, {"text": topic, "bold": True}, {"text": " from scratch {with} code }}] examples."}]}}],
+        "searchVideoResultEntityKey": _id(rng, 40),
+    }
+
+
+def build_page(topic_key: str, seed: int) -> str:
+    """Build one synthetic results page."""
+    rng = random.Random(seed)
+    topics = TOPICS[topic_key]
+    items = []
+    for i in range(24):
+        if i == 3:
+            items.append({"reelShelfRenderer": {"title": {"simpleText": "Shorts"}, "items": [
+                {"reelItemRenderer": {"videoId": _id(rng), "headline": {"simpleText": "#shorts"}}} for _ in range(8)]}})
+        if i == 6:
+            items.append({"adSlotRenderer": {"trackingParams": _tracking(rng), "enablePacfLoggingWeb": False}})
+        items.append({"videoRenderer": _video_renderer(rng, rng.choice(topics))})
+
+    initial_data = {
+        "responseContext": {"serviceTrackingParams": [{"service": "GFEEDBACK", "params": [{"key": "e", "value": ",".join(str(rng.randint(23700000, 24000000)) for _ in range(300))}]}]},
+        "estimatedResults": "1234567",
+        "contents": {"twoColumnSearchResultsRenderer": {"primaryContents": {"sectionListRenderer": {"contents": [
+            {"itemSectionRenderer": {"contents": items, "trackingParams": _tracking(rng)}},
+            {"continuationItemRenderer": {"trigger": "CONTINUATION_TRIGGER_ON_ITEM_SHOWN", "continuationEndpoint": {"continuationCommand": {"token": _id(rng, 200)}}}},
+        ]}}}},
+        "trackingParams": _tracking(rng),
+        "topbar": {"desktopTopbarRenderer": {"logo": {"topbarLogoRenderer": {"iconImage": {"iconType": "YOUTUBE_LOGO"}}}}},
+    }
+
+    # Player config, experiment flags and inline scripts make up most of a real page
+    ytcfg = {"EXPERIMENT_FLAGS": {f"flag_{_id(rng, 12)}": rng.choice([True, False, rng.randint(0, 999)]) for _ in range(4000)},
+             "INNERTUBE_CONTEXT": {"client": {"hl": "en", "gl": "US", "visitorData": _id(rng, 60)}}}
+    blob = _id(rng, 2000)
+    scripts = "".join(
+        f'<script nonce="{_id(rng, 22)}">(function(){{var a{i}="{blob[i:] + blob[:i]}";window.f{i}=function(x){{return x&&a{i}.indexOf(x)>-1}};}})();</script>'
+        for i in range(200)
+    )
+    style = "<style>" + "".join(f".yt-c{i}{{display:flex;margin:{i % 24}px}}" for i in range(3000)) + "</style>"
+
+    return (
+        "<!DOCTYPE html><html lang=\"en\"><head><title>YouTube</title>"
+        + style
+        + f"<script nonce=\"{_id(rng, 22)}\">ytcfg.set({json.dumps(ytcfg)});</script>"
+        + "</head><body>"
+        + scripts
+        + f"<script nonce=\"{_id(rng, 22)}\">var ytInitialData = {json.dumps(initial_data, separators=(',', ':'))};</script>"
+        + f"<script nonce=\"{_id(rng, 22)}\">if (window.ytcsi) {{window.ytcsi.tick('pdr', null, '');}}</script>"
+        + "</body></html>"
+    )
+
+
+def main() -> None:
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for seed, topic_key in enumerate(TOPICS):
+        html = build_page(topic_key, seed)
+        path = os.path.join(FIXTURE_DIR, f"youtube_results_{topic_key}.html.gz")
+        with gzip.open(path, "wt", encoding="utf-8", compresslevel=9) as f:
+            f.write(html)
+        print(f"Wrote {path} ({len(html) / 1024:.0f} KB uncompressed)")
+
+
+if __name__ == "__main__":
+    main()
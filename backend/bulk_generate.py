@@ -0,0 +1,458 @@
+"""
+CareerForge AI - Offline Bulk Generation
+Pre-generates roadmaps, quizzes and interview material for a catalogue of
+inputs (e.g. overnight), using the same services as the API:
+
+    python bulk_generate.py roles.csv --kind roadmap --output roadmaps.jsonl
+    python bulk_generate.py steps.jsonl --output sqlite:///data/bulk.db --concurrency 4
+
+Each input row (CSV with a header, or one JSON object per line) is one
+generation. Fields are those of the matching API request body:
+
+    roadmap              description, hours_per_week, max_months, budget
+    quiz                 topic, step_name, num_questions, difficulty_mix
+    skills               background, target_role, interests
+    interview            role, experience_level, company, focus_areas
+    interview_questions  role, question_type, count
+
+A `kind` field overrides --kind, and an `id` field names the result
+(default: a hash of the kind and fields). In CSV, list fields are
+";"-separated and difficulty_mix is JSON.
+
+Results are written as each generation finishes, and the output doubles
+as the checkpoint: rerunning the same command skips rows already in it,
+so a killed run resumes where it stopped. Failed rows are recorded too
+and are retried with --retry-failed. The first SIGINT/SIGTERM stops
+taking rows and finishes the running ones; a second aborts them.
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import signal
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+import orjson
+from pydantic import BaseModel, ValidationError
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import job_config
+from api.schemas import (
+    UserProfile,
+    QuizRequest,
+    SkillsAnalysisRequest,
+    InterviewPrepRequest,
+    MockQuestionsRequest,
+)
+from services.generation_tasks import TASKS, TaskError
+from utils.request_context import RequestScope, request_scope
+from utils.serialization import dumps
+
+# Kind -> (request schema, {request field: task parameter})
+KINDS: Dict[str, Tuple[type, Dict[str, str]]] = {
+    "roadmap": (UserProfile, {
+        "description": "user_profile", "hours_per_week": "hours_per_week",
+        "max_months": "max_months", "budget": "budget",
+    }),
+    "quiz": (QuizRequest, {
+        "topic": "topic", "step_name": "step_name",
+        "num_questions": "num_questions", "difficulty_mix": "difficulty_mix",
+    }),
+    "skills": (SkillsAnalysisRequest, {
+        "background": "background", "target_role": "target_role", "interests": "interests",
+    }),
+    "interview": (InterviewPrepRequest, {
+        "role": "role", "experience_level": "experience_level",
+        "company": "company", "focus_areas": "focus_areas",
+    }),
+    "interview_questions": (MockQuestionsRequest, {
+        "role": "role", "question_type": "question_type", "count": "count",
+    }),
+}
+
+# CSV cells that hold lists (";"-separated) or JSON
+_LIST_FIELDS = frozenset({"interests", "focus_areas"})
+_JSON_FIELDS = frozenset({"difficulty_mix"})
+
+
+# ============================================================
+# Inputs
+# ============================================================
+
+def read_rows(path: str) -> Iterator[Tuple[int, Union[str, Dict[str, str]]]]:
+    """
+    Yield (line number, raw row) from a CSV or JSONL file.
+
+    Rows are CSV cells or a JSONL line, still undecoded, so one bad row
+    is reported by prepare() instead of ending the run.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+            return
+
+        for line_num, line in enumerate(f, 1):
+            if line.strip():
+                yield line_num, line
+
+
+def _decode(row: Union[str, Dict[str, str]]) -> Dict[str, Any]:
+    """Decode a raw row from read_rows into its fields."""
+    if isinstance(row, dict):
+        return _csv_row(row)
+
+    try:
+        values = json.loads(row)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"invalid JSON ({e})") from None
+    if not isinstance(values, dict):
+        raise ValueError(f"expected a JSON object, got {type(values).__name__}")
+    return values
+
+
+def _csv_row(row: Dict[str, str]) -> Dict[str, Any]:
+    """Empty cells are left out; list and JSON cells are decoded."""
+    values: Dict[str, Any] = {}
+    for field, value in row.items():
+        # Cells past the header land under a None field, as a list
+        if not field:
+            continue
+        value = (value or "").strip()
+        if not value:
+            continue
+        if field in _LIST_FIELDS:
+            values[field] = [item.strip() for item in value.split(";") if item.strip()]
+        elif field in _JSON_FIELDS:
+            try:
+                values[field] = json.loads(value)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{field}: invalid JSON ({e})") from None
+        else:
+            values[field] = value
+    return values
+
+
+def prepare(row: Union[str, Dict[str, str]], default_kind: Optional[str]) -> Tuple[str, str, Dict[str, Any]]:
+    """
+    Decode a raw row and validate it against its request schema.
+
+    Returns:
+        Tuple of (id, kind, task parameters)
+
+    Raises:
+        ValueError: Undecodable row, unknown kind or invalid fields
+    """
+    row = _decode(row)
+    kind = row.pop("kind", None) or default_kind
+    row_id = row.pop("id", None)
+    if not isinstance(kind, str) or kind not in KINDS:
+        raise ValueError(f"unknown kind {kind!r} (expected one of {', '.join(KINDS)})")
+
+    schema, fields = KINDS[kind]
+    try:
+        request: BaseModel = schema(**row)
+    except ValidationError as e:
+        errors = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+        raise ValueError(errors) from None
+
+    params = {param: getattr(request, field) for field, param in fields.items()}
+    if not row_id:
+        digest = hashlib.sha1(orjson.dumps([kind, params], option=orjson.OPT_SORT_KEYS)).hexdigest()
+        row_id = f"{kind}-{digest[:16]}"
+    return str(row_id), kind, params
+
+
+# ============================================================
+# Outputs (results double as the checkpoint)
+# ============================================================
+
+class JSONLResults:
+    """One JSON record per line; the last record for an id wins."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._drop_partial_tail()
+        self._file = open(path, "ab")
+
+    def _drop_partial_tail(self) -> None:
+        """Remove a record cut short when a previous run was killed mid-write."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+            f.seek(0)
+            keep = f.read().rfind(b"\n") + 1
+            f.truncate(keep)
+        print("[Bulk] Dropped a partial record at the end of the output")
+
+    def finished(self) -> Dict[str, str]:
+        """Status of every recorded id."""
+        statuses: Dict[str, str] = {}
+        with open(self.path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    record = orjson.loads(line)
+                    statuses[record["id"]] = record["status"]
+        return statuses
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._file.write(dumps(record) + b"\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class SQLiteResults:
+    """One row per id in a `results` table (WAL)."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "id TEXT PRIMARY KEY, kind TEXT NOT NULL, params TEXT NOT NULL, "
+            "status TEXT NOT NULL, result TEXT, error TEXT, "
+            "elapsed_ms INTEGER NOT NULL, finished REAL NOT NULL)"
+        )
+
+    def finished(self) -> Dict[str, str]:
+        """Same contract as JSONLResults.finished."""
+        return dict(self._conn.execute("SELECT id, status FROM results"))
+
+    def write(self, record: Dict[str, Any]) -> None:
+        result = record.get("result")
+        self._conn.execute(
+            "INSERT OR REPLACE INTO results "
+            "(id, kind, params, status, result, error, elapsed_ms, finished) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                record["id"], record["kind"], dumps(record["params"]).decode(), record["status"],
+                dumps(result).decode() if result is not None else None,
+                record.get("error"), record["elapsed_ms"], record["finished"],
+            )
+        )
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def open_results(target: str):
+    """Results writer for "sqlite:///path.db" or a JSONL file path."""
+    if target.startswith("sqlite:///"):
+        return SQLiteResults(target[len("sqlite:///"):])
+    return JSONLResults(target)
+
+
+# ============================================================
+# Runner
+# ============================================================
+
+class Progress:
+    """Completed / failed counts, throughput and ETA for this run."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.succeeded = 0
+        self.failed = 0
+        self.started = time.monotonic()
+
+    def add(self, record: Dict[str, Any]) -> None:
+        if record["status"] == "succeeded":
+            self.succeeded += 1
+        else:
+            self.failed += 1
+
+    def line(self) -> str:
+        done = self.succeeded + self.failed
+        elapsed = time.monotonic() - self.started
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = _duration((self.total - done) / rate) if rate > 0 else "unknown"
+        return (
+            f"[Bulk] {done}/{self.total} done ({self.failed} failed), "
+            f"{rate * 60:.1f}/min, elapsed {_duration(elapsed)}, ETA {eta}"
+        )
+
+
+def _duration(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class BulkRunner:
+    """Runs generations on a thread pool and records each one as it finishes."""
+
+    def __init__(self, results, concurrency: int, timeout: float, progress_interval: float):
+        """
+        Initialize the runner.
+
+        Args:
+            results: Results writer (JSONLResults or SQLiteResults)
+            concurrency: Generations run at once
+            timeout: Seconds a generation may run before it is aborted
+            progress_interval: Seconds between progress lines
+        """
+        self.results = results
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.progress_interval = progress_interval
+        self._scopes: Set[RequestScope] = set()
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    @property
+    def stopping(self) -> bool:
+        return self._stopping.is_set()
+
+    def stop(self) -> None:
+        """Stop taking rows; running generations finish."""
+        self._stopping.set()
+
+    def abort(self) -> None:
+        """Abort running generations (their rows are redone on resume)."""
+        with self._lock:
+            for scope in self._scopes:
+                scope.cancel()
+
+    def run(self, items: List[Tuple[str, str, Dict[str, Any]]], progress: Progress) -> None:
+        pool = ThreadPoolExecutor(max_workers=self.concurrency)
+        pending = iter(items)
+        running = set()
+        last_report = time.monotonic()
+        try:
+            while True:
+                # A short backlog keeps the pool busy without queueing every row
+                while not self.stopping and len(running) < self.concurrency * 2:
+                    item = next(pending, None)
+                    if item is None:
+                        break
+                    running.add(pool.submit(self._generate, *item))
+                if self.stopping:
+                    # Rows waiting in the backlog are left for the next run
+                    running = {future for future in running if not future.cancel()}
+                if not running:
+                    break
+
+                done, running = wait(running, timeout=self.progress_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record = future.result()
+                    self.results.write(record)
+                    progress.add(record)
+                    if record["status"] == "failed":
+                        print(f"[Bulk] {record['kind']} {record['id']} failed: {record['error']}")
+
+                if time.monotonic() - last_report >= self.progress_interval:
+                    print(progress.line())
+                    last_report = time.monotonic()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _generate(self, row_id: str, kind: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        scope = RequestScope(self.timeout)
+        with self._lock:
+            self._scopes.add(scope)
+
+        started = time.monotonic()
+        record: Dict[str, Any] = {"id": row_id, "kind": kind, "params": params}
+        try:
+            # The scope lets abort() or the timeout stop the LLM call
+            with request_scope(scope):
+                record["result"] = TASKS[kind](params, lambda item: None)
+            record["status"] = "succeeded"
+        except TaskError as e:
+            record.update(status="failed", error=str(e))
+        except Exception as e:
+            record.update(status="failed", error=str(e) or type(e).__name__)
+        finally:
+            with self._lock:
+                self._scopes.discard(scope)
+
+        record["elapsed_ms"] = round((time.monotonic() - started) * 1000)
+        record["finished"] = time.time()
+        return record
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CareerForge AI offline bulk generation")
+    parser.add_argument("input", help="CSV (with header) or JSONL file of inputs")
+    parser.add_argument("--output", required=True, help="Results: a .jsonl path or sqlite:///path.db")
+    parser.add_argument("--kind", choices=list(KINDS), help="Kind for rows without a `kind` field")
+    parser.add_argument("--concurrency", type=int, default=2, help="Generations run at once (default: 2)")
+    parser.add_argument(
+        "--timeout", type=float, default=job_config.timeout,
+        help="Seconds per generation before it is aborted (default: JOBS_TIMEOUT)"
+    )
+    parser.add_argument("--retry-failed", action="store_true", help="Also redo rows recorded as failed")
+    parser.add_argument("--progress-interval", type=float, default=10, help="Seconds between progress lines")
+    args = parser.parse_args()
+
+    items, seen, invalid = [], set(), 0
+    for line_num, row in read_rows(args.input):
+        try:
+            item = prepare(row, args.kind)
+        except ValueError as e:
+            print(f"[Bulk] Skipping {args.input}:{line_num}: {e}")
+            invalid += 1
+            continue
+        if item[0] in seen:
+            continue
+        seen.add(item[0])
+        items.append(item)
+
+    results = open_results(args.output)
+    finished = results.finished()
+    skip = {"succeeded"} if args.retry_failed else {"succeeded", "failed"}
+    todo = [item for item in items if finished.get(item[0]) not in skip]
+    print(
+        f"[Bulk] {len(items)} rows ({invalid} invalid), {len(items) - len(todo)} already done, "
+        f"{len(todo)} to generate with concurrency {args.concurrency}"
+    )
+
+    progress = Progress(len(todo))
+    runner = BulkRunner(results, args.concurrency, args.timeout, args.progress_interval)
+
+    def shutdown(signum, frame):
+        if runner.stopping:
+            raise KeyboardInterrupt
+        print("[Bulk] Finishing running generations; signal again to abort them")
+        runner.stop()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    try:
+        runner.run(todo, progress)
+    except KeyboardInterrupt:
+        runner.abort()
+        print("[Bulk] Aborted; unfinished rows will be redone on the next run")
+    finally:
+        results.close()
+
+    print(progress.line())
+    if progress.succeeded + progress.failed < len(todo):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
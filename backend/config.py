@@ -34,6 +34,20 @@ class LLMConfig:
     
     # Max tokens for response
     max_tokens: int = int(os.getenv("LLM_MAX_TOKENS", "4096"))
+    
+    # Context window of the served model (prompt plus response tokens);
+    # caps requests that ask for more than max_tokens
+    context_window: int = int(os.getenv("LLM_CONTEXT_WINDOW", "8192"))
+    
+    # Concurrent requests the backend can serve (match OLLAMA_NUM_PARALLEL)
+    parallel_requests: int = int(os.getenv("LLM_PARALLEL_REQUESTS", "4"))
+    
+    # When a JSON response hits max tokens, ask the model to finish the
+    # tail from its returned context (otherwise complete items are salvaged)
+    continue_truncated: bool = os.getenv("LLM_CONTINUE_TRUNCATED", "false").lower() == "true"
+    
+    # Max tokens for that continuation request
+    continuation_tokens: int = int(os.getenv("LLM_CONTINUATION_TOKENS", "512"))
 
 
 @dataclass
@@ -54,9 +68,27 @@ class APIConfig:
     # Rate limiting (requests per minute)
     rate_limit: int = int(os.getenv("RATE_LIMIT", "30"))
     
+    # Enforce the rate limit (token bucket per IP / API key)
+    rate_limit_enabled: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    
+    # Bucket size, i.e. the largest burst (0 = same as rate_limit)
+    rate_limit_burst: int = int(os.getenv("RATE_LIMIT_BURST", "0"))
+    
+    # Where buckets live: memory, sqlite:///path.db (all workers on one
+    # host) or redis://host:port/db (all hosts)
+    rate_limit_store: str = os.getenv("RATE_LIMIT_STORE", "memory")
+    
+    # Identify clients by X-Forwarded-For (only behind a trusted proxy)
+    trust_proxy: bool = os.getenv("TRUST_PROXY", "false").lower() == "true"
+    
+    # X-API-Key values that get their own rate limit bucket and job quota
+    # (comma-separated); other clients are identified by IP
+    api_keys: list = None
+    
     def __post_init__(self):
         origins = os.getenv("CORS_ORIGINS", "*")
         self.cors_origins = [o.strip() for o in origins.split(",")]
+        self.api_keys = [k.strip() for k in os.getenv("API_KEYS", "").split(",") if k.strip()]
 
 
 @dataclass
@@ -70,12 +102,181 @@ class YouTubeConfig:
     
     # Minimum video duration in seconds (filters out shorts)
     min_duration: int = int(os.getenv("YOUTUBE_MIN_DURATION", "600"))
+    
+    # YouTube origin (override to point at a local fixture server)
+    base_url: str = os.getenv("YOUTUBE_BASE_URL", "https://www.youtube.com")
+    
+    # Process-wide cap on concurrent YouTube requests
+    max_concurrency: int = int(os.getenv("YOUTUBE_MAX_CONCURRENCY", "4"))
+    
+    # Max YouTube requests started per second
+    rate_per_sec: float = float(os.getenv("YOUTUBE_RATE_PER_SEC", "2"))
+    
+    # Request timeout in seconds
+    timeout: float = float(os.getenv("YOUTUBE_TIMEOUT", "5"))
+    
+    # Seconds to skip re-fetching a query after a failed fetch
+    negative_ttl: int = int(os.getenv("YOUTUBE_NEGATIVE_TTL", "300"))
+    
+    # Seconds before a cached search is refreshed in the background (default 7 days)
+    cache_ttl: int = int(os.getenv("YOUTUBE_CACHE_TTL", "604800"))
+    
+    # Max search results held in process memory (stored in CACHE_STORE)
+    cache_memory_size: int = int(os.getenv("YOUTUBE_CACHE_MEMORY_SIZE", "1024"))
+    
+    # Curated offline video catalogue, consulted before the cache and scraper
+    catalog_enabled: bool = os.getenv("YOUTUBE_CATALOG_ENABLED", "true").lower() == "true"
+    catalog_path: str = os.getenv(
+        "YOUTUBE_CATALOG_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "curated_videos.json")
+    )
+    
+    # Share of a query's (IDF-weighted) terms a catalogue video must cover
+    catalog_min_coverage: float = float(os.getenv("YOUTUBE_CATALOG_MIN_COVERAGE", "0.6"))
+    
+    # Seconds a roadmap response waits for step videos before returning
+    enrichment_deadline: float = float(os.getenv("YOUTUBE_ENRICHMENT_DEADLINE", "1.5"))
+    
+    # Seconds an enrichment token stays valid for collecting late videos
+    enrichment_ttl: int = int(os.getenv("YOUTUBE_ENRICHMENT_TTL", "600"))
+
+
+@dataclass
+class LibraryConfig:
+    """Canonical Roadmap Library Configuration"""
+    # Whether to serve matching profiles from precomputed roadmaps
+    enabled: bool = os.getenv("ROADMAP_LIBRARY_ENABLED", "true").lower() == "true"
+    
+    # Path to the roadmap library data file
+    path: str = os.getenv(
+        "ROADMAP_LIBRARY_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "roadmap_library.json")
+    )
+    
+    # Minimum match score to use a template (with a short personalization call)
+    match_threshold: float = float(os.getenv("ROADMAP_LIBRARY_MATCH_THRESHOLD", "0.4"))
+    
+    # Match score above which the template is returned with no LLM call at all
+    direct_threshold: float = float(os.getenv("ROADMAP_LIBRARY_DIRECT_THRESHOLD", "0.7"))
+    
+    # Lead the best template needs over the runner-up to be used
+    match_margin: float = float(os.getenv("ROADMAP_LIBRARY_MATCH_MARGIN", "0.15"))
+    
+    # Share of the match score taken by the stated goal ("want to become ...")
+    goal_weight: float = float(os.getenv("ROADMAP_LIBRARY_GOAL_WEIGHT", "0.75"))
+    
+    # Hours per week a request may differ from the templates' and still use them
+    hours_tolerance: int = int(os.getenv("ROADMAP_LIBRARY_HOURS_TOLERANCE", "3"))
+
+
+@dataclass
+class ExecutorConfig:
+    """Shared Blocking-Work Executor Configuration"""
+    # Concurrent blocking calls per endpoint class (bulkhead); the shared
+    # thread pool is sized to their sum
+    roadmap_workers: int = int(os.getenv("EXECUTOR_ROADMAP_WORKERS", "4"))
+    quiz_workers: int = int(os.getenv("EXECUTOR_QUIZ_WORKERS", "4"))
+    skills_workers: int = int(os.getenv("EXECUTOR_SKILLS_WORKERS", "2"))
+    interview_workers: int = int(os.getenv("EXECUTOR_INTERVIEW_WORKERS", "2"))
+    
+    # Roadmap step expansions running at once across all streamed roadmaps
+    # (each stream also holds a roadmap slot), and stale YouTube cache
+    # entries refreshed at once
+    step_workers: int = int(os.getenv("EXECUTOR_STEP_WORKERS", os.getenv("LLM_PARALLEL_REQUESTS", "4")))
+    refresh_workers: int = int(os.getenv("EXECUTOR_REFRESH_WORKERS", "2"))
+    
+    # Requests allowed to wait per bulkhead; beyond this they get a 503
+    max_queue: int = int(os.getenv("EXECUTOR_MAX_QUEUE", "32"))
+    
+    # Seconds a request may wait for a slot before getting a 503
+    max_wait: float = float(os.getenv("EXECUTOR_MAX_WAIT", "30"))
+
+
+@dataclass
+class CohortConfig:
+    """Bulk (Cohort) Roadmap Configuration"""
+    # Profiles accepted in one cohort request
+    max_profiles: int = int(os.getenv("COHORT_MAX_PROFILES", "500"))
+    
+    # Roadmaps one cohort request generates at once; keep below
+    # EXECUTOR_ROADMAP_WORKERS so single requests still get slots
+    concurrency: int = int(os.getenv("COHORT_CONCURRENCY", "2"))
+    
+    # Distinct YouTube lookups one cohort request runs at once
+    video_concurrency: int = int(os.getenv("COHORT_VIDEO_CONCURRENCY", "4"))
+
+
+@dataclass
+class JobConfig:
+    """Background Job Configuration"""
+    # Jobs generating at once; the rest wait in the queue
+    max_running: int = int(os.getenv("JOBS_MAX_RUNNING", "4"))
+    
+    # Jobs allowed to wait; beyond this new jobs get a 503
+    max_queued: int = int(os.getenv("JOBS_MAX_QUEUED", "100"))
+    
+    # Unfinished (queued or running) jobs per client
+    per_user: int = int(os.getenv("JOBS_PER_USER", "2"))
+    
+    # Seconds a finished job's result is kept
+    ttl: int = int(os.getenv("JOBS_TTL", "3600"))
+    
+    # Seconds a job may run before it is aborted
+    timeout: float = float(os.getenv("JOBS_TIMEOUT", "900"))
+    
+    # Durable task queue for out-of-process workers (worker.py):
+    # "sqlite:///path/to/file.db" or "redis://host:port/db".
+    # Empty runs jobs inside the API process.
+    queue: str = os.getenv("JOBS_QUEUE", "")
+    
+    # Seconds a worker holds a task without a heartbeat; after that the
+    # worker is presumed dead and the task is handed to another worker
+    lease: float = float(os.getenv("JOBS_LEASE", "60"))
+    
+    # Times a task is started before a crashing task is given up on
+    max_attempts: int = int(os.getenv("JOBS_MAX_ATTEMPTS", "3"))
+    
+    # Tasks each worker process runs at once
+    worker_concurrency: int = int(os.getenv("WORKER_CONCURRENCY", "2"))
+    
+    # Seconds an idle worker waits before polling the queue again
+    poll_interval: float = float(os.getenv("WORKER_POLL_INTERVAL", "1"))
+
+
+@dataclass
+class CacheConfig:
+    """Shared Cache Configuration"""
+    # Store shared by all API and worker processes: "sqlite:///path/to/file.db"
+    # (one host), "redis://host:port/db" (across hosts) or "memory" (per process)
+    store: str = os.getenv(
+        "CACHE_STORE",
+        "sqlite:///" + os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cache.db")
+    )
+    
+    # Bytes of the SQLite cache file read through a memory map
+    mmap_size: int = int(os.getenv("CACHE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    
+    # Entries each cache keeps in process memory in front of the store
+    memory_size: int = int(os.getenv("CACHE_MEMORY_SIZE", "1024"))
+    
+    # Seconds identical LLM requests are answered from the cache (0, the
+    # default, disables)
+    llm_ttl: int = int(os.getenv("LLM_CACHE_TTL", "0"))
+    
+    # Seconds generated quiz questions are reused for the same step; a
+    # retake within this time gets the same quiz (0, the default, disables)
+    quiz_bank_ttl: int = int(os.getenv("QUIZ_BANK_TTL", "0"))
 
 
 # Singleton instances
 llm_config = LLMConfig()
 api_config = APIConfig()
 youtube_config = YouTubeConfig()
+library_config = LibraryConfig()
+executor_config = ExecutorConfig()
+cohort_config = CohortConfig()
+job_config = JobConfig()
+cache_config = CacheConfig()
 
 
 # Logging configuration
@@ -99,4 +300,5 @@ def print_config():
     print(f"Debug Mode:       {api_config.debug}")
     print(f"Rate Limit:       {api_config.rate_limit}/min")
     print(f"YouTube Enabled:  {youtube_config.enabled}")
+    print(f"Job Queue:        {job_config.queue or 'in-process'}")
     print("=" * 60)
@@ -1,16 +1,16 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from ai_service import generate_precision_roadmap
-from services.quiz_service import generate_quiz_openai, generate_quiz_batch
-from services.youtube_service import get_curated_videos
+from ai_service import GEMINI_API_KEYS, generate_precision_roadmap
+from services.quiz_service import OPENAI_API_KEYS, generate_quiz_openai, generate_quiz_batch
+from services.youtube_service import get_curated_videos_async
+from api.executor import get_executor
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 
 app = FastAPI(title="Career Forge API", version="2.0.0")
 
-# Thread pool for parallel execution
-executor = ThreadPoolExecutor(max_workers=12)
+# Shared executor with per-endpoint bulkheads
+executor = get_executor()
 
 # CORS middleware
 app.add_middleware(
@@ -46,10 +46,8 @@ async def root():
 @app.post("/generate-path")
 async def generate_path(profile: UserProfile):
     """Generate career roadmap with YouTube videos (all at once)."""
-    loop = asyncio.get_event_loop()
-    
     # Generate roadmap with fast model
-    result = await loop.run_in_executor(executor, generate_precision_roadmap, profile.description)
+    result = await executor.run("roadmap", generate_precision_roadmap, profile.description)
 
     if "error" in result:
         raise HTTPException(status_code=500, detail=result["error"])
@@ -60,7 +58,7 @@ async def generate_path(profile: UserProfile):
     async def fetch_videos(step):
         query = step.get("youtube_search_query")
         if query:
-            videos = await loop.run_in_executor(executor, get_curated_videos, query)
+            videos = await get_curated_videos_async(query)
             step["video_results"] = videos
         else:
             step["video_results"] = []
@@ -74,8 +72,7 @@ async def generate_path(profile: UserProfile):
 @app.post("/generate-quiz")
 async def generate_quiz_endpoint(request: QuizRequest):
     """Generate full quiz (15 questions)."""
-    loop = asyncio.get_event_loop()
-    result = await loop.run_in_executor(executor, generate_quiz_openai, request.topic, request.step_name)
+    result = await executor.run("quiz", generate_quiz_openai, request.topic, request.step_name)
     
     if "error" in result:
         raise HTTPException(status_code=500, detail=result["error"])
@@ -86,8 +83,17 @@ async def generate_quiz_endpoint(request: QuizRequest):
 @app.post("/generate-quiz-batch")
 async def generate_quiz_batch_endpoint(request: QuizBatchRequest):
     """Generate batch of questions (for progressive loading)."""
-    loop = asyncio.get_event_loop()
-    result = await loop.run_in_executor(
-        executor, generate_quiz_batch, request.topic, request.step_name, request.count, request.start_id
+    result = await executor.run(
+        "quiz", generate_quiz_batch, request.topic, request.step_name, request.count, request.start_id
     )
     return result
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Report configured API keys (kept out of module import)."""
+    print(f"[AI Service] Loaded {len(GEMINI_API_KEYS)} Gemini API keys")
+    if not GEMINI_API_KEYS:
+        print("WARNING: No GEMINI_API_KEYS set!")
+    if not OPENAI_API_KEYS:
+        print("WARNING: No OPENAI_API_KEYS set!")
@@ -11,20 +11,30 @@ import sys
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
-
-from config import api_config, print_config
+import json
+
+from config import api_config, cohort_config, print_config
+from api.cohort import stream_cohort_roadmaps
+from api.executor import get_executor
+from api.jobs import get_job_manager
+from api.middleware import RequestScopeMiddleware
+from api.rate_limit import RateLimitMiddleware, client_identity
+from api.responses import ORJSONModelResponse
+from api.schemas import AnswerAnalysisBatchRequest, CohortRoadmapRequest, StepRegenerationRequest
 from services.llm_service import get_llm_service
-from services.roadmap_service import RoadmapService
-from services.quiz_service_v2 import QuizService, generate_quiz_openai, generate_quiz_batch
-from services.youtube_service import get_curated_videos
-
-# Print configuration on startup
-print_config()
+from services.roadmap_library import get_roadmap_library
+from services.roadmap_service import USE_SIMPLE_PROMPTS, get_roadmap_service
+from services.quiz_service_v2 import get_quiz_service, generate_quiz_openai, generate_quiz_batch
+from services.interview_service import get_interview_service
+from services.youtube_service import get_curated_videos_async
+from services.video_enrichment import get_video_enricher
+from utils.request_context import current_request
+from utils.serialization import dumps
 
 # Initialize FastAPI application
 app = FastAPI(
@@ -35,8 +45,12 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
-# Thread pool for parallel execution
-executor = ThreadPoolExecutor(max_workers=12)
+# Shared executor with per-endpoint bulkheads
+executor = get_executor()
+
+# Token-bucket rate limit per client (innermost, so 429s still get CORS headers)
+if api_config.rate_limit_enabled:
+    app.add_middleware(RateLimitMiddleware)
 
 # CORS middleware configuration
 app.add_middleware(
@@ -47,6 +61,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request deadline (X-Request-Timeout) and client-disconnect cancellation
+app.add_middleware(RequestScopeMiddleware)
+
 
 # ============================================================
 # Request Models
@@ -107,6 +124,18 @@ async def llm_health_check():
     }
 
 
+@app.get("/api/health/executor")
+async def executor_stats():
+    """Load, queue depth and queue wait times per endpoint class."""
+    return get_executor().stats()
+
+
+@app.get("/api/health/jobs")
+async def job_stats():
+    """Background job counts by status."""
+    return await get_job_manager().stats()
+
+
 @app.get("/api/health/models")
 async def list_models():
     """List available models."""
@@ -126,11 +155,9 @@ async def list_models():
 @app.post("/api/ai/roadmap")
 async def generate_roadmap_endpoint(profile: UserProfile):
     """Generate a comprehensive career roadmap."""
-    loop = asyncio.get_event_loop()
-    
-    service = RoadmapService()
-    result = await loop.run_in_executor(
-        executor,
+    service = get_roadmap_service()
+    result = await executor.run(
+        "roadmap",
         service.generate_roadmap,
         profile.description
     )
@@ -141,17 +168,100 @@ async def generate_roadmap_endpoint(profile: UserProfile):
             detail=result.get("error", "Failed to generate roadmap")
         )
     
-    return result
+    return ORJSONModelResponse(result)
+
+
+@app.post("/api/ai/roadmap/stream")
+async def stream_roadmap_endpoint(profile: UserProfile):
+    """Stream a roadmap as NDJSON: skeleton first, then each step as it is expanded."""
+    service = get_roadmap_service()
+    events = service.stream_roadmap(profile.description)
+    events = executor.iterate("roadmap", events, lambda detail: {"type": "error", "error": detail})
+    
+    return StreamingResponse(
+        (json.dumps(event) + "\n" async for event in events),
+        media_type="application/x-ndjson"
+    )
+
+
+@app.post("/api/ai/roadmap/cohort")
+async def cohort_roadmap_endpoint(request: CohortRoadmapRequest):
+    """Roadmaps for many profiles, deduplicated, streamed as NDJSON as each one finishes."""
+    if len(request.profiles) > cohort_config.max_profiles:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many profiles (max {cohort_config.max_profiles} per request)"
+        )
+    
+    events = stream_cohort_roadmaps(request.profiles, request.include_videos)
+    return StreamingResponse(
+        (dumps(event) + b"\n" async for event in events),
+        media_type="application/x-ndjson"
+    )
+
+
+@app.post("/api/ai/roadmap/regenerate-step")
+async def regenerate_roadmap_step_endpoint(request: StepRegenerationRequest):
+    """Regenerate one roadmap step; other steps and their videos are kept."""
+    service = get_roadmap_service()
+    result = await executor.run(
+        "roadmap",
+        service.regenerate_step,
+        request.roadmap,
+        request.step_index,
+        request.hours_per_week,
+        request.budget,
+        request.feedback,
+        request.description
+    )
+    
+    if not result.get("success"):
+        raise HTTPException(
+            status_code=400 if result.get("error_kind") == "invalid_request" else 500,
+            detail=result.get("error", "Failed to regenerate step")
+        )
+    
+    step = result["data"]["roadmap"][request.step_index]
+    title = step.get("step_name", "").split(":", 1)[-1].strip()
+    try:
+        step["video_results"] = await asyncio.wait_for(
+            get_curated_videos_async(f"{title} tutorial"),
+            timeout=current_request().remaining()
+        ) if title else []
+    except Exception:
+        step["video_results"] = []
+    
+    return ORJSONModelResponse(result)
+
+
+@app.get("/api/ai/roadmap/videos/{token}")
+async def get_roadmap_videos_endpoint(token: str, wait: float = Query(0, ge=0, le=30)):
+    """Collect video_results for steps that missed the enrichment deadline (optionally waiting)."""
+    status = await get_video_enricher().wait(token, wait)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired enrichment token")
+    return status
+
+
+@app.get("/api/ai/roadmap/videos/{token}/stream")
+async def stream_roadmap_videos_endpoint(token: str):
+    """Stream remaining video_results as NDJSON, one event per step as it arrives."""
+    enricher = get_video_enricher()
+    if await enricher.status(token) is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired enrichment token")
+    
+    return StreamingResponse(
+        (json.dumps(event) + "\n" async for event in enricher.stream(token)),
+        media_type="application/x-ndjson"
+    )
 
 
 @app.post("/api/ai/quiz")
 async def generate_quiz_endpoint(request: QuizRequest):
     """Generate a knowledge quiz."""
-    loop = asyncio.get_event_loop()
-    
-    service = QuizService()
-    result = await loop.run_in_executor(
-        executor,
+    service = get_quiz_service()
+    result = await executor.run(
+        "quiz",
         service.generate_quiz,
         request.topic,
         request.step_name
@@ -160,7 +270,96 @@ async def generate_quiz_endpoint(request: QuizRequest):
     if "error" in result:
         raise HTTPException(status_code=500, detail=result["error"])
     
-    return result
+    return ORJSONModelResponse(result)
+
+
+@app.post("/api/ai/interview-prep/analyze/batch")
+async def analyze_interview_answers_endpoint(request: AnswerAnalysisBatchRequest):
+    """Analyze all answers from a mock interview in one generation (per-answer fallback)."""
+    service = get_interview_service()
+    result = await executor.run(
+        "interview",
+        service.analyze_answers,
+        [item.model_dump() for item in request.answers],
+        request.role
+    )
+    
+    if not result.get("success"):
+        raise HTTPException(status_code=500, detail=result.get("error", "Failed to analyze answers"))
+    
+    return ORJSONModelResponse(result)
+
+
+# ============================================================
+# Background Job Endpoints
+# ============================================================
+
+def _job_accepted(request: Request, job) -> ORJSONModelResponse:
+    """202 response pointing the client at the job's status and event stream."""
+    return ORJSONModelResponse(
+        {
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": request.url_for("get_job_endpoint", job_id=job.id).path,
+            "events_url": request.url_for("stream_job_endpoint", job_id=job.id).path,
+        },
+        status_code=202
+    )
+
+
+async def _get_job(job_id: str):
+    job = await get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    return job
+
+
+@app.post("/api/jobs/roadmap", status_code=202)
+async def submit_roadmap_job_endpoint(profile: UserProfile, request: Request):
+    """Start a roadmap generation in the background and return its job id."""
+    job = await get_job_manager().submit(
+        "roadmap",
+        {"user_profile": profile.description},
+        client_identity(request.scope)
+    )
+    return _job_accepted(request, job)
+
+
+@app.post("/api/jobs/quiz", status_code=202)
+async def submit_quiz_job_endpoint(quiz: QuizRequest, request: Request):
+    """Start a full quiz generation in the background and return its job id."""
+    job = await get_job_manager().submit(
+        "quiz",
+        {"topic": quiz.topic, "step_name": quiz.step_name},
+        client_identity(request.scope)
+    )
+    return _job_accepted(request, job)
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job_endpoint(job_id: str):
+    """Job status, partial results and, once finished, the result or error."""
+    return ORJSONModelResponse((await _get_job(job_id)).view())
+
+
+@app.get("/api/jobs/{job_id}/events")
+async def stream_job_endpoint(job_id: str):
+    """Follow a job as Server-Sent Events: status, partial, then result or error."""
+    job = await _get_job(job_id)
+    return StreamingResponse(
+        job.sse(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.delete("/api/jobs/{job_id}")
+async def cancel_job_endpoint(job_id: str):
+    """Cancel a queued or running job."""
+    job = await get_job_manager().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    return ORJSONModelResponse(job.view())
 
 
 # ============================================================
@@ -170,11 +369,9 @@ async def generate_quiz_endpoint(request: QuizRequest):
 @app.post("/generate-path")
 async def generate_path(profile: UserProfile):
     """Legacy endpoint for roadmap generation."""
-    loop = asyncio.get_event_loop()
-    
-    service = RoadmapService()
-    result = await loop.run_in_executor(
-        executor,
+    service = get_roadmap_service()
+    result = await executor.run(
+        "roadmap",
         service.generate_roadmap,
         profile.description
     )
@@ -186,33 +383,24 @@ async def generate_path(profile: UserProfile):
     roadmap_data = result.get("data", {})
     roadmap = roadmap_data.get("roadmap", [])
     
-    # Fetch YouTube videos for each step
-    async def fetch_videos(step):
+    # Fetch YouTube videos for each step, up to the enrichment deadline
+    def video_query(step):
         title = step.get("title", step.get("step_name", ""))
         focus_areas = step.get("focus_areas", [])
         query = focus_areas[0] if focus_areas else title
-        
-        if query:
-            try:
-                videos = await loop.run_in_executor(executor, get_curated_videos, f"{query} tutorial")
-                step["video_results"] = videos
-            except Exception:
-                step["video_results"] = []
-        else:
-            step["video_results"] = []
-        return step
+        return f"{query} tutorial" if query else None
     
-    await asyncio.gather(*[fetch_videos(step) for step in roadmap])
+    # Steps that miss the deadline are collected later via the token
+    roadmap_data["enrichment"] = await get_video_enricher().enrich(roadmap, video_query)
     
-    return roadmap_data
+    return ORJSONModelResponse(roadmap_data)
 
 
 @app.post("/generate-quiz")
 async def generate_quiz_legacy(request: QuizRequest):
     """Legacy endpoint for quiz generation."""
-    loop = asyncio.get_event_loop()
-    result = await loop.run_in_executor(
-        executor,
+    result = await executor.run(
+        "quiz",
         generate_quiz_openai,
         request.topic,
         request.step_name
@@ -221,15 +409,14 @@ async def generate_quiz_legacy(request: QuizRequest):
     if "error" in result:
         raise HTTPException(status_code=500, detail=result["error"])
     
-    return result
+    return ORJSONModelResponse(result)
 
 
 @app.post("/generate-quiz-batch")
 async def generate_quiz_batch_legacy(request: QuizBatchRequest):
     """Legacy endpoint for batch quiz generation."""
-    loop = asyncio.get_event_loop()
-    result = await loop.run_in_executor(
-        executor,
+    result = await executor.run(
+        "quiz",
         generate_quiz_batch,
         request.topic,
         request.step_name,
@@ -237,7 +424,25 @@ async def generate_quiz_batch_legacy(request: QuizBatchRequest):
         request.start_id
     )
     
-    return result
+    return ORJSONModelResponse(result)
+
+
+@app.post("/generate-quiz-batch/stream")
+async def generate_quiz_batch_stream(request: QuizBatchRequest):
+    """Stream a quiz batch as NDJSON, one question per line."""
+    service = get_quiz_service()
+    questions = service.stream_quiz_batch(
+        request.topic,
+        request.step_name,
+        request.count,
+        request.start_id
+    )
+    questions = executor.iterate("quiz", questions, lambda detail: {"error": detail})
+    
+    return StreamingResponse(
+        (json.dumps(q) + "\n" async for q in questions),
+        media_type="application/x-ndjson"
+    )
 
 
 # ============================================================
@@ -247,6 +452,7 @@ async def generate_quiz_batch_legacy(request: QuizBatchRequest):
 @app.on_event("startup")
 async def startup_event():
     """Run on application startup."""
+    print_config()
     print("\n" + "=" * 60)
     print("🚀 CareerForge AI - Open Source Edition")
     print("=" * 60)
@@ -254,6 +460,13 @@ async def startup_event():
     print("Cost: $0 / Zero API usage fees")
     print("=" * 60)
     
+    # Build services and load the library now rather than on the first request
+    get_roadmap_service()
+    get_quiz_service()
+    library = get_roadmap_library()
+    print(f"Prompts: {'simple' if USE_SIMPLE_PROMPTS else 'detailed'}")
+    print(f"Roadmap library: {len(library.templates) if library else 0} templates")
+    
     llm = get_llm_service()
     is_healthy, status = llm.check_health()
     
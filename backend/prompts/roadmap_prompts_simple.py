@@ -73,3 +73,119 @@ Return JSON:
 }}
 
 ONLY return valid JSON."""
+
+
+def get_skeleton_roadmap_prompt(user_profile: str, constraints: dict = None) -> str:
+    """
+    Minimal prompt for the first phase of two-phase roadmap generation.
+    Produces only the role, summary and step titles so it returns fast.
+    """
+    
+    if constraints is None:
+        constraints = {}
+    
+    months = constraints.get("max_months", 6)
+    
+    return f"""You are a career expert. Outline a {months}-step learning roadmap for: "{user_profile}".
+
+Return JSON:
+{{
+    "career_role": "Python Developer",
+    "summary": "6-month plan to master Python.",
+    "steps": ["Month 1: Python Basics", "Month 2: ..."]
+}}
+
+Requirements:
+1. "steps" MUST have exactly {months} titles.
+2. Each title starts with "Month N:".
+3. Order from beginner to advanced, specific to the user's goal.
+
+ONLY return valid JSON."""
+
+
+def get_step_expansion_prompt(
+    user_profile: str,
+    career_role: str,
+    step_name: str,
+    outline: list = None
+) -> str:
+    """
+    Prompt for the second phase: fill in the details of one roadmap step.
+    The outline gives the model context on the neighbouring steps.
+    """
+    
+    outline_str = "; ".join(outline) if outline else step_name
+    
+    return f"""You are a career expert. A learner wants to become a {career_role}.
+Background: "{user_profile}"
+Full plan: {outline_str}
+
+Detail ONLY this step: "{step_name}".
+
+Return JSON:
+{{
+    "description": "Max 15 words on what to master.",
+    "official_docs_url": "https://real-docs-url",
+    "paid_course_recommendation": "Specific course name"
+}}
+
+ONLY return valid JSON."""
+
+
+def get_personalize_summary_prompt(user_profile: str, career_role: str, summary: str) -> str:
+    """Short prompt to tailor a library roadmap's summary to one user."""
+    
+    return f"""A learner wants to become a {career_role}.
+Background: "{user_profile}"
+Generic plan summary: "{summary}"
+
+Rewrite the summary in 2 sentences for this learner, referencing their background.
+
+Return JSON: {{"summary": "..."}}
+
+ONLY return valid JSON."""
+
+
+def get_step_regeneration_prompt(
+    career_role: str,
+    step_name: str,
+    outline: list,
+    constraints: dict = None,
+    feedback: str = None,
+    user_profile: str = None
+) -> str:
+    """
+    Prompt to replace one step of an existing roadmap.
+    The rest of the plan is given as fixed context so the new step fits it.
+    """
+    
+    if constraints is None:
+        constraints = {}
+    
+    outline_str = "; ".join(outline)
+    lines = []
+    if user_profile:
+        lines.append(f'Background: "{user_profile}"')
+    if constraints.get("hours_per_week"):
+        lines.append(f"Study time: {constraints['hours_per_week']} hours per week")
+    if constraints.get("budget"):
+        lines.append(f"Budget: {constraints['budget']}")
+    if feedback:
+        lines.append(f'Learner feedback on this step: "{feedback}"')
+    context = "\n".join(lines)
+    
+    return f"""You are a career expert. A learner following a {career_role} roadmap wants ONE step replaced.
+Current plan (keep other steps unchanged): {outline_str}
+{context}
+
+Replace this step: "{step_name}". Keep the same "Month N:" prefix and fit it between its neighbours.
+
+Return JSON:
+{{
+    "step_name": "Month N: New Title",
+    "description": "Max 15 words on what to master.",
+    "official_docs_url": "https://real-docs-url",
+    "paid_course_recommendation": "Specific course name"
+}}
+
+ONLY return valid JSON."""
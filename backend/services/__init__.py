@@ -1,21 +1,34 @@
 """
 CareerForge AI - Services Module
 Business logic layer for AI-powered career guidance.
+
+Names below are imported on first access, so importing one service module
+(e.g. services.task_queue in a worker) does not load all of the others.
 """
 
-from .llm_service import LLMService, get_llm_service
-from .roadmap_service import RoadmapService
-from .skills_service import SkillsService
-from .interview_service import InterviewService
-from .quiz_service_v2 import QuizService
-from .youtube_service import get_curated_videos
+import importlib
+
+_EXPORTS = {
+    "LLMService": ".llm_service",
+    "get_llm_service": ".llm_service",
+    "RoadmapService": ".roadmap_service",
+    "get_roadmap_service": ".roadmap_service",
+    "SkillsService": ".skills_service",
+    "get_skills_service": ".skills_service",
+    "InterviewService": ".interview_service",
+    "get_interview_service": ".interview_service",
+    "QuizService": ".quiz_service_v2",
+    "get_quiz_service": ".quiz_service_v2",
+    "get_curated_videos": ".youtube_service",
+    "get_curated_videos_async": ".youtube_service",
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = [
-    "LLMService",
-    "get_llm_service",
-    "RoadmapService",
-    "SkillsService",
-    "InterviewService",
-    "QuizService",
-    "get_curated_videos",
-]
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,292 @@
+"""
+CareerForge AI - Shared Cache
+An in-process LRU tier in front of a store shared by every API and worker
+process, so scaling out does not split the hit rate across processes.
+
+Stores: SQLite (WAL, memory-mapped reads) for processes on one host,
+Redis (or a compatible server) across hosts, or process memory only.
+Each user of the cache (LLM responses, YouTube searches, quiz bank) gets
+its own namespace, TTL and LRU size through TieredCache.
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterator, Optional, Tuple
+
+import orjson
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import cache_config
+from utils.serialization import dumps
+
+# Expired SQLite rows are swept every this many writes
+_SWEEP_EVERY = 500
+
+
+class MemoryCacheStore:
+    """Entries in this process only (one worker)."""
+
+    def __init__(self, max_entries: int = 100_000):
+        """
+        Initialize the store.
+
+        Args:
+            max_entries: Max entries kept; the least recently written
+                are dropped first
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[bytes, float, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[bytes, float]]:
+        """
+        Look up an entry.
+
+        Returns:
+            Tuple of (value, stored_at) or None on a miss or if expired
+        """
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+        if entry is None:
+            return None
+        value, stored, expires = entry
+        if expires is not None and expires <= time.time():
+            return None
+        return value, stored
+
+    def set(self, namespace: str, key: str, value: bytes, ttl: Optional[float]) -> None:
+        """Store an entry; it expires after `ttl` seconds (None: never)."""
+        now = time.time()
+        with self._lock:
+            self._entries.pop((namespace, key), None)
+            self._entries[(namespace, key)] = (value, now, now + ttl if ttl else None)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def scan(self, namespace: str) -> Iterator[Tuple[str, bytes, float]]:
+        """Iterate over a namespace's (key, value, stored_at)."""
+        with self._lock:
+            entries = [(k, v) for k, v in self._entries.items() if k[0] == namespace]
+        for (_, key), (value, stored, _) in entries:
+            yield key, value, stored
+
+
+class SQLiteCacheStore:
+    """Entries in a SQLite file (WAL), shared by processes on one host."""
+
+    def __init__(self, path: str, mmap_size: int = 256 * 1024 * 1024):
+        """
+        Initialize the store.
+
+        Args:
+            path: SQLite database file
+            mmap_size: Bytes of the file read through a memory map
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, "
+            "stored REAL NOT NULL, expires REAL, PRIMARY KEY (namespace, key))"
+        )
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[bytes, float]]:
+        """Same contract as MemoryCacheStore.get."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored FROM cache WHERE namespace = ? AND key = ? "
+                "AND (expires IS NULL OR expires > ?)",
+                (namespace, key, time.time())
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def set(self, namespace: str, key: str, value: bytes, ttl: Optional[float]) -> None:
+        """Same contract as MemoryCacheStore.set."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, stored, expires) VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, value, now, now + ttl if ttl else None)
+            )
+            self._writes += 1
+            if self._writes % _SWEEP_EVERY == 0:
+                self._conn.execute("DELETE FROM cache WHERE expires <= ?", (now,))
+
+    def scan(self, namespace: str) -> Iterator[Tuple[str, bytes, float]]:
+        """Same contract as MemoryCacheStore.scan."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value, stored FROM cache WHERE namespace = ? "
+                "AND (expires IS NULL OR expires > ?)",
+                (namespace, time.time())
+            ).fetchall()
+        yield from rows
+
+
+class RedisCacheStore:
+    """Entries in Redis (or a compatible server), shared across hosts."""
+
+    def __init__(self, url: str, prefix: str = "careerforge:cache:"):
+        """
+        Initialize the store.
+
+        Args:
+            url: redis:// URL
+            prefix: Key prefix for cache entries
+        """
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("CACHE_STORE=redis://... requires the 'redis' package") from e
+
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}{namespace}:{key}"
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[bytes, float]]:
+        """Same contract as MemoryCacheStore.get."""
+        value, stored = self._client.hmget(self._key(namespace, key), "v", "t")
+        return (value, float(stored)) if value is not None else None
+
+    def set(self, namespace: str, key: str, value: bytes, ttl: Optional[float]) -> None:
+        """Same contract as MemoryCacheStore.set."""
+        name = self._key(namespace, key)
+        pipe = self._client.pipeline()
+        pipe.hset(name, mapping={"v": value, "t": time.time()})
+        if ttl:
+            pipe.expire(name, max(1, int(ttl)))
+        else:
+            pipe.persist(name)
+        pipe.execute()
+
+    def scan(self, namespace: str) -> Iterator[Tuple[str, bytes, float]]:
+        """Same contract as MemoryCacheStore.scan."""
+        start = len(self._key(namespace, ""))
+        for name in self._client.scan_iter(match=self._key(namespace, "*"), count=500):
+            value, stored = self._client.hmget(name, "v", "t")
+            if value is not None:
+                yield name.decode()[start:], value, float(stored)
+
+
+def create_cache_store(url: str):
+    """
+    Build a cache store from a CACHE_STORE value.
+
+    "memory", "sqlite:///path/to/file.db" or "redis://host:port/db".
+    """
+    if url.startswith("sqlite:///"):
+        return SQLiteCacheStore(url[len("sqlite:///"):], cache_config.mmap_size)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisCacheStore(url)
+    if url != "memory":
+        raise ValueError(f"Unknown cache store: {url}")
+    return MemoryCacheStore()
+
+
+class TieredCache:
+    """
+    One namespace of the shared cache, behind an in-process LRU.
+
+    Values are stored as JSON (Pydantic models are dumped), so reads
+    return plain dicts and lists.
+    """
+
+    def __init__(self, namespace: str, store, memory_size: int, ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            namespace: Keeps this cache's keys apart from other users'
+            store: Shared store (see create_cache_store)
+            memory_size: Max entries held in the in-process tier
+            ttl: Seconds entries live (None: until overwritten)
+        """
+        self.namespace = namespace
+        self.store = store
+        self.memory_size = memory_size
+        self.ttl = ttl
+        self._memory: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """
+        Look up a key, in process memory first.
+
+        Returns:
+            Tuple of (value, stored_at) or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if self.ttl and now - entry[1] >= self.ttl:
+                    del self._memory[key]
+                    entry = None
+                else:
+                    self._memory.move_to_end(key)
+        if entry is not None:
+            return entry
+
+        try:
+            found = self.store.get(self.namespace, key)
+        except Exception as e:
+            print(f"[Cache] {self.namespace} lookup failed: {e}")
+            return None
+        if found is None:
+            return None
+
+        entry = (orjson.loads(found[0]), found[1])
+        self._remember(key, entry)
+        return entry
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value in both tiers."""
+        data = dumps(value)
+        self._remember(key, (orjson.loads(data), time.time()))
+        try:
+            self.store.set(self.namespace, key, data, self.ttl)
+        except Exception as e:
+            print(f"[Cache] {self.namespace} write failed: {e}")
+
+    def entries(self) -> Iterator[Tuple[str, Any, float]]:
+        """Iterate over every shared entry as (key, value, stored_at)."""
+        for key, value, stored in self.store.scan(self.namespace):
+            yield key, orjson.loads(value), stored
+
+    def _remember(self, key: str, entry: Tuple[Any, float]) -> None:
+        """Insert into the LRU tier, evicting the oldest entry if full."""
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+
+# Singleton instance
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_cache_store():
+    """Get or create the shared cache store singleton (from CACHE_STORE)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = create_cache_store(cache_config.store)
+    return _store
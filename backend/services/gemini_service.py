@@ -1,11 +1,20 @@
 import os
-import google.generativeai as genai
 from dotenv import load_dotenv
 
 load_dotenv()
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-model = genai.GenerativeModel("gemini-pro")
+# Created on first use; importing and configuring the SDK is slow
+_model = None
+
+
+def _get_model():
+    global _model
+    if _model is None:
+        import google.generativeai as genai
+
+        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        _model = genai.GenerativeModel("gemini-pro")
+    return _model
 
 
 async def generate_career_roadmap(skills: str, interests: str) -> dict:
@@ -33,7 +42,7 @@ Respond in this exact JSON format:
 
 Generate 5-6 roadmap steps. Make search_query specific for finding educational YouTube videos."""
 
-    response = model.generate_content(prompt)
+    response = _get_model().generate_content(prompt)
     
     import json
     try:
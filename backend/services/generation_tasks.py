@@ -0,0 +1,134 @@
+"""
+CareerForge AI - Generation Tasks
+Background generations as plain blocking functions of JSON parameters.
+
+The same tasks run in the API process (background jobs without a task
+queue) and in worker processes (worker.py) fed by the durable queue.
+Each takes the task's parameters and a `report` callback for partial
+results, and returns the final result or raises TaskError.
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.roadmap_service import get_roadmap_service
+from services.quiz_service_v2 import get_quiz_service
+from services.skills_service import get_skills_service
+from services.interview_service import get_interview_service
+from services.youtube_service import get_curated_videos
+
+Report = Callable[[Any], None]
+
+
+class TaskError(Exception):
+    """A generation failed; the message is shown to the client."""
+
+
+def step_video_query(step: Dict[str, Any]) -> Optional[str]:
+    """YouTube search query for a roadmap step (None to skip the step)."""
+    title = step.get("title", step.get("step_name", ""))
+    focus_areas = step.get("focus_areas", [])
+    query = focus_areas[0] if focus_areas else title
+    return f"{query} tutorial" if query else None
+
+
+class RoadmapBuilder:
+    """Assembles stream_roadmap events into the final roadmap result."""
+
+    def __init__(self):
+        self.data: Optional[Dict[str, Any]] = None
+        self.meta: Dict[str, Any] = {}
+
+    def add(self, event: Dict[str, Any]) -> bool:
+        """
+        Apply one event.
+
+        Returns:
+            True if the event is a partial result worth publishing
+
+        Raises:
+            TaskError: On an "error" event
+        """
+        if event["type"] == "error":
+            raise TaskError(event["error"] or "Failed to generate roadmap")
+        if event["type"] == "skeleton":
+            self.data = dict(event["data"])
+            self.data["roadmap"] = list(self.data["roadmap"])
+        elif event["type"] == "step":
+            self.data["roadmap"][event["index"]] = event["data"]
+        elif event["type"] == "done":
+            self.meta = event["meta"]
+            return False
+        return True
+
+    def result(self) -> Dict[str, Any]:
+        if self.data is None:
+            raise TaskError("Failed to generate roadmap")
+        return {"success": True, "data": self.data, "meta": self.meta}
+
+
+def run_roadmap(params: Dict[str, Any], report: Report) -> Dict[str, Any]:
+    """Two-phase roadmap; the skeleton and each expanded step are reported."""
+    builder = RoadmapBuilder()
+    for event in get_roadmap_service().stream_roadmap(use_library=True, **params):
+        if builder.add(event):
+            report(event)
+    result = builder.result()
+
+    # Nobody is waiting on a background task, so every step's videos are
+    # looked up in full rather than against an enrichment deadline
+    steps = result["data"]["roadmap"]
+    queries = [step_video_query(step) for step in steps]
+    with ThreadPoolExecutor(max_workers=max(1, min(len(steps), 8))) as pool:
+        videos = pool.map(lambda query: get_curated_videos(query) if query else [], queries)
+        for step, step_videos in zip(steps, videos):
+            step["video_results"] = step_videos
+    return result
+
+
+def run_quiz(params: Dict[str, Any], report: Report) -> Dict[str, Any]:
+    """Full quiz in one generation."""
+    result = get_quiz_service().generate_quiz(**params)
+    if "error" in result:
+        raise TaskError(result["error"])
+    return result
+
+
+def run_skills(params: Dict[str, Any], report: Report) -> Dict[str, Any]:
+    """Skills analysis and recommendations."""
+    result = get_skills_service().analyze_skills(**params)
+    if not result.get("success"):
+        raise TaskError(result.get("error") or "Failed to analyze skills")
+    return result
+
+
+def run_interview(params: Dict[str, Any], report: Report) -> Dict[str, Any]:
+    """Interview preparation guide."""
+    result = get_interview_service().generate_prep_guide(**params)
+    if not result.get("success"):
+        raise TaskError(result.get("error") or "Failed to generate interview prep")
+    return result
+
+
+def run_interview_questions(params: Dict[str, Any], report: Report) -> Dict[str, Any]:
+    """Mock interview question set."""
+    result = get_interview_service().generate_mock_questions(**params)
+    if not result.get("success"):
+        raise TaskError(result.get("error") or "Failed to generate interview questions")
+    return result
+
+
+# Task kind -> task. Kinds offered as API jobs (api.jobs.JOB_KINDS)
+# double as executor bulkhead names.
+TASKS: Dict[str, Callable[[Dict[str, Any], Report], Dict[str, Any]]] = {
+    "roadmap": run_roadmap,
+    "quiz": run_quiz,
+    "skills": run_skills,
+    "interview": run_interview,
+    "interview_questions": run_interview_questions,
+}
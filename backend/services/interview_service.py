@@ -9,9 +9,25 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from typing import Dict, Any, List
+import threading
+from typing import Dict, Any, List, Optional
 from services.llm_service import LLMService, get_llm_service
 from prompts.system_prompts import CAREERFORGE_SYSTEM_PROMPT
+from api.schemas.payloads import (
+    InterviewPrepPayload,
+    MockQuestionsPayload,
+    AnswerAnalysisPayload,
+    AnswerAnalysisBatchPayload,
+)
+
+# Output budget per answer in a batched analysis (score, lists and a
+# rewritten answer); the batch gets at least the configured max_tokens
+_ANALYSIS_TOKENS = 600
+
+# Answers the batch misses that are redone one by one. Each is a full
+# generation in the same request, so past this the rest are left for
+# the client to retry, and a batch that mostly failed is failed whole
+_MAX_FALLBACKS = 3
 
 
 class InterviewService:
@@ -42,7 +58,8 @@ Return JSON with: technical_questions (list), behavioral_questions (list), tips
             prompt=prompt,
             system_prompt=CAREERFORGE_SYSTEM_PROMPT,
             temperature=0.7,
-            expect_json=True
+            expect_json=True,
+            schema=InterviewPrepPayload
         )
         
         if not response.success:
@@ -50,7 +67,7 @@ Return JSON with: technical_questions (list), behavioral_questions (list), tips
         
         return {
             "success": True,
-            "data": response.parsed_json,
+            "data": response.parsed,
             "meta": {"model": response.model, "latency_ms": response.latency_ms}
         }
     
@@ -70,7 +87,8 @@ Return JSON with: questions (list of objects with question, type, difficulty)"""
             prompt=prompt,
             system_prompt=CAREERFORGE_SYSTEM_PROMPT,
             temperature=0.7,
-            expect_json=True
+            expect_json=True,
+            schema=MockQuestionsPayload
         )
         
         if not response.success:
@@ -78,7 +96,7 @@ Return JSON with: questions (list of objects with question, type, difficulty)"""
         
         return {
             "success": True,
-            "data": response.parsed_json,
+            "data": response.parsed,
             "meta": {"model": response.model, "latency_ms": response.latency_ms}
         }
     
@@ -103,7 +121,8 @@ Return JSON with: score (1-10), strengths (list), improvements (list), improved_
             prompt=prompt,
             system_prompt=CAREERFORGE_SYSTEM_PROMPT,
             temperature=0.6,
-            expect_json=True
+            expect_json=True,
+            schema=AnswerAnalysisPayload
         )
         
         if not response.success:
@@ -111,6 +130,126 @@ Return JSON with: score (1-10), strengths (list), improvements (list), improved_
         
         return {
             "success": True,
-            "data": response.parsed_json,
+            "data": response.parsed,
             "meta": {"model": response.model, "latency_ms": response.latency_ms}
         }
+
+    
+    def analyze_answers(
+        self,
+        answers: List[Dict[str, str]],
+        role: str
+    ) -> Dict[str, Any]:
+        """
+        Analyze several interview answers in one generation.
+        
+        The answers are numbered in a single prompt and the model returns
+        one analysis per number, so the system prompt is evaluated once
+        rather than once per answer. Answers whose analysis is missing,
+        unscored or incomplete in the batch output are redone with
+        analyze_answer, as is the last analysis of a truncated output
+        (its closing fields may have been cut off and repaired). At most
+        _MAX_FALLBACKS are redone; if the batch missed more than that and
+        most of its answers, the whole call fails instead.
+        
+        Args:
+            answers: Dicts with "question" and "answer"
+            role: Target role for context
+        
+        Returns:
+            {"success", "data": {"results": [...]}, "meta"}; results are in
+            input order, each shaped like an analyze_answer result
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(answers)
+        meta = {"model": self.llm.model, "latency_ms": 0, "batched": 0, "individual": 0}
+        
+        batch = []
+        for index, item in enumerate(answers):
+            if not item["answer"] or len(item["answer"].strip()) < 20:
+                results[index] = {"success": False, "error": "Please provide a more complete answer"}
+            else:
+                batch.append(index)
+        
+        # A single answer gains nothing from the batch prompt
+        if len(batch) > 1:
+            numbered = "\n\n".join(
+                f"[{number}] Question: {answers[index]['question']}\nAnswer: {answers[index]['answer']}"
+                for number, index in enumerate(batch, 1)
+            )
+            prompt = f"""Analyze these {len(batch)} interview answers for {role}:
+
+{numbered}
+
+Return JSON with: analyses (object keyed by answer number "1" to "{len(batch)}", each with score (1-10), strengths (list), improvements (list), improved_answer)"""
+
+            # Leave room for the prompt in the context window (about 3
+            # characters per token, erring high)
+            prompt_tokens = (len(CAREERFORGE_SYSTEM_PROMPT) + len(prompt)) // 3
+            max_tokens = min(
+                max(self.llm.max_tokens, _ANALYSIS_TOKENS * len(batch)),
+                max(self.llm.context_window - prompt_tokens, _ANALYSIS_TOKENS)
+            )
+            
+            response = self.llm.generate(
+                prompt=prompt,
+                system_prompt=CAREERFORGE_SYSTEM_PROMPT,
+                temperature=0.6,
+                max_tokens=max_tokens,
+                expect_json=True,
+                schema=AnswerAnalysisBatchPayload
+            )
+            meta["model"] = response.model or meta["model"]
+            meta["latency_ms"] += response.latency_ms
+            
+            analyses = dict(response.parsed.analyses) if response.success else {}
+            if response.truncated and analyses:
+                analyses.popitem()
+            for number, index in enumerate(batch, 1):
+                analysis = analyses.get(str(number))
+                if (
+                    analysis is not None
+                    and analysis.score is not None
+                    and analysis.improvements
+                    and analysis.improved_answer
+                ):
+                    results[index] = {"success": True, "data": analysis}
+                    meta["batched"] += 1
+        
+        missed = [index for index in batch if results[index] is None]
+        if len(missed) > _MAX_FALLBACKS and len(missed) * 2 > len(batch):
+            return {
+                "success": False,
+                "error": f"Could not analyze {len(missed)} of {len(batch)} answers together; "
+                         "analyze them one at a time with /api/ai/interview-prep/analyze"
+            }
+        
+        for index in missed[:_MAX_FALLBACKS]:
+            result = self.analyze_answer(answers[index]["question"], answers[index]["answer"], role)
+            meta["latency_ms"] += result.get("meta", {}).get("latency_ms", 0)
+            results[index] = {key: value for key, value in result.items() if key != "meta"}
+            meta["individual"] += 1
+        
+        for index in missed[_MAX_FALLBACKS:]:
+            results[index] = {
+                "success": False,
+                "error": "Not analyzed in this batch; retry with /api/ai/interview-prep/analyze"
+            }
+        
+        if not any(result["success"] for result in results):
+            return {"success": False, "error": results[0]["error"]}
+        
+        return {"success": True, "data": {"results": results}, "meta": meta}
+
+# Singleton instance
+_interview_service: Optional[InterviewService] = None
+_interview_service_lock = threading.Lock()
+
+
+def get_interview_service() -> InterviewService:
+    """Get or create the interview service singleton."""
+    global _interview_service
+    if _interview_service is None:
+        with _interview_service_lock:
+            if _interview_service is None:
+                _interview_service = InterviewService()
+    return _interview_service
@@ -0,0 +1,215 @@
+"""
+CareerForge AI - API Key Pool
+Thread-safe pool of persistent OpenAI clients with per-key load tracking,
+token-bucket rate limiting and cooldown after rate-limit responses.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+
+@dataclass
+class KeyState:
+    """Runtime state for a single API key."""
+    key: str
+    client: "OpenAI"
+    capacity: float
+    refill_per_sec: float
+    tokens: float
+    last_refill: float
+    in_flight: int = 0
+    cooldown_until: float = 0.0
+    rate_limited: int = 0
+
+    @property
+    def label(self) -> str:
+        """Redacted key for logging."""
+        return f"{self.key[:8]}...{self.key[-4:]}" if len(self.key) > 12 else "***"
+
+    def refill(self, now: float) -> None:
+        """Top up the token bucket based on elapsed time."""
+        elapsed = now - self.last_refill
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_sec)
+            self.last_refill = now
+
+    def ready_at(self, now: float) -> float:
+        """Earliest time this key can accept another request."""
+        ready = max(now, self.cooldown_until)
+        if self.tokens < 1:
+            ready = max(ready, now + (1 - self.tokens) / self.refill_per_sec)
+        return ready
+
+
+class KeyPool:
+    """
+    Pool of API keys, each with one long-lived client.
+
+    Requests are routed to the healthy key with the fewest in-flight
+    calls. A key is healthy when it is not cooling down after a 429 and
+    its token bucket has capacity.
+    """
+
+    def __init__(
+        self,
+        keys: List[str],
+        requests_per_minute: int = 60,
+        base_url: str = None,
+        timeout: float = 60.0,
+        default_cooldown: float = 20.0,
+        auth_cooldown: float = 300.0
+    ):
+        """
+        Initialize the key pool.
+
+        Args:
+            keys: API keys to pool
+            requests_per_minute: Token bucket rate per key
+            base_url: Optional OpenAI-compatible endpoint
+            timeout: Per-request timeout in seconds
+            default_cooldown: Cooldown after a 429 without a retry-after hint
+            auth_cooldown: Cooldown after an auth/permission failure
+        """
+        # Imported here: the SDK is slow to load and only needed once a pool exists
+        from openai import OpenAI
+
+        now = time.monotonic()
+        rate = max(requests_per_minute, 1) / 60.0
+        capacity = float(max(requests_per_minute, 1))
+
+        self.default_cooldown = default_cooldown
+        self.auth_cooldown = auth_cooldown
+        self._cond = threading.Condition()
+        self._states = [
+            KeyState(
+                key=key,
+                # max_retries=0: the pool handles 429s itself instead of
+                # letting the SDK sleep while holding a slot
+                client=OpenAI(api_key=key, base_url=base_url, timeout=timeout, max_retries=0),
+                capacity=capacity,
+                refill_per_sec=rate,
+                tokens=capacity,
+                last_refill=now,
+            )
+            for key in keys
+        ]
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def acquire(self, exclude: Iterable[str] = (), wait: float = 5.0) -> Optional[KeyState]:
+        """
+        Reserve the least-loaded healthy key.
+
+        Args:
+            exclude: Keys already tried for this request
+            wait: Max seconds to wait for a key to become available
+
+        Returns:
+            KeyState to use (must be passed to release), or None
+        """
+        excluded = set(exclude)
+        deadline = time.monotonic() + wait
+
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                candidates = [s for s in self._states if s.key not in excluded]
+                if not candidates:
+                    return None
+
+                for state in candidates:
+                    state.refill(now)
+
+                healthy = [s for s in candidates if s.cooldown_until <= now and s.tokens >= 1]
+                if healthy:
+                    state = min(healthy, key=lambda s: s.in_flight)
+                    state.tokens -= 1
+                    state.in_flight += 1
+                    return state
+
+                next_ready = min(s.ready_at(now) for s in candidates)
+                if next_ready > deadline:
+                    return None
+                self._cond.wait(timeout=max(next_ready - now, 0.01))
+
+    def release(
+        self,
+        state: KeyState,
+        retry_after: Optional[float] = None,
+        rate_limited: bool = False,
+        disabled: bool = False
+    ) -> None:
+        """
+        Return a key to the pool after a request.
+
+        Args:
+            state: Key reserved via acquire()
+            retry_after: Server retry-after hint in seconds
+            rate_limited: Whether the request got a 429
+            disabled: Whether the key failed authentication
+        """
+        with self._cond:
+            state.in_flight = max(state.in_flight - 1, 0)
+            now = time.monotonic()
+
+            if rate_limited:
+                state.rate_limited += 1
+                state.cooldown_until = now + (retry_after if retry_after else self.default_cooldown)
+            elif disabled:
+                state.cooldown_until = now + self.auth_cooldown
+
+            self._cond.notify_all()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Snapshot of per-key load for monitoring."""
+        with self._cond:
+            now = time.monotonic()
+            return [
+                {
+                    "key": s.label,
+                    "in_flight": s.in_flight,
+                    "tokens": round(s.tokens, 2),
+                    "cooldown_s": round(max(s.cooldown_until - now, 0.0), 1),
+                    "rate_limited": s.rate_limited,
+                }
+                for s in self._states
+            ]
+
+
+def parse_retry_after(headers: Any) -> Optional[float]:
+    """
+    Parse a retry-after hint from response headers.
+
+    Supports `retry-after-ms`, `retry-after` in seconds, and
+    `retry-after` as an HTTP date.
+    """
+    if not headers:
+        return None
+
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000.0
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
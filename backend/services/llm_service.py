@@ -4,15 +4,22 @@ Abstraction layer for interacting with open-source LLMs via Ollama.
 Designed for easy model swapping and robust error handling.
 """
 
+import hashlib
 import json
+import threading
 import time
 import httpx
-from typing import Optional, Dict, Any, Tuple
+import orjson
+from typing import Optional, Dict, Any, Tuple, Iterator, Type
 from dataclasses import dataclass
+from pydantic import BaseModel, ValidationError
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config import llm_config
+from config import llm_config, cache_config
+from services.cache import TieredCache, get_cache_store
+from utils.json_parser import extract_json_from_text, salvage_json
+from utils.request_context import RequestScope, current_request
 
 
 @dataclass
@@ -25,6 +32,11 @@ class LLMResponse:
     latency_ms: int = 0
     tokens_used: int = 0
     error: Optional[str] = None
+    truncated: bool = False
+    # Validated payload model when generate() was given a schema
+    parsed: Optional[BaseModel] = None
+    # Answered from the response cache
+    cached: bool = False
 
 
 class LLMService:
@@ -61,10 +73,16 @@ class LLMService:
         self.timeout = timeout or llm_config.timeout
         self.temperature = llm_config.temperature
         self.max_tokens = llm_config.max_tokens
+        self.context_window = llm_config.context_window
         
         # HTTP client with connection pooling
         self.client = httpx.Client(timeout=self.timeout)
         
+        # Responses to identical requests, shared by all processes
+        self.cache = TieredCache(
+            "llm", get_cache_store(), cache_config.memory_size, cache_config.llm_ttl
+        ) if cache_config.llm_ttl > 0 else None
+        
         print(f"[LLM Service] Initialized with model: {self.model}")
         print(f"[LLM Service] Base URL: {self.base_url}")
     
@@ -74,7 +92,9 @@ class LLMService:
         system_prompt: str = None,
         temperature: float = None,
         max_tokens: int = None,
-        expect_json: bool = True
+        expect_json: bool = True,
+        schema: Type[BaseModel] = None,
+        use_cache: bool = True
     ) -> LLMResponse:
         """
         Generate a response from the LLM.
@@ -85,34 +105,184 @@ class LLMService:
             temperature: Override temperature
             max_tokens: Override max tokens
             expect_json: Whether to parse response as JSON
+            schema: Pydantic model to validate the raw output against in
+                one pass; the result is returned in `parsed` instead of
+                `parsed_json`
+            use_cache: Answer identical requests from the response cache;
+                False when the caller wants a fresh sample
         
         Returns:
             LLMResponse with content and metadata
         """
+        temperature = temperature or self.temperature
+        max_tokens = max_tokens or self.max_tokens
+        
+        cache_key = None
+        if self.cache is not None and use_cache:
+            cache_key = self._cache_key(prompt, system_prompt, temperature, max_tokens, expect_json, schema)
+            cached = self._cached_response(cache_key, schema)
+            if cached is not None:
+                return cached
+        
         # Try primary model first
         response = self._call_model(
             model=self.model,
             prompt=prompt,
             system_prompt=system_prompt,
-            temperature=temperature or self.temperature,
-            max_tokens=max_tokens or self.max_tokens,
-            expect_json=expect_json
+            temperature=temperature,
+            max_tokens=max_tokens,
+            expect_json=expect_json,
+            schema=schema
         )
         
-        # If primary fails, try fallback
-        if not response.success and self.fallback_model:
+        # If primary fails, try fallback (unless the request itself is over)
+        if not response.success and self.fallback_model and not current_request().done:
             print(f"[LLM Service] Primary model failed, trying fallback: {self.fallback_model}")
             response = self._call_model(
                 model=self.fallback_model,
                 prompt=prompt,
                 system_prompt=system_prompt,
-                temperature=temperature or self.temperature,
-                max_tokens=max_tokens or self.max_tokens,
-                expect_json=expect_json
+                temperature=temperature,
+                max_tokens=max_tokens,
+                expect_json=expect_json,
+                schema=schema
             )
         
+        if response.success and cache_key is not None:
+            self.cache.set(cache_key, {
+                "content": response.content,
+                "parsed_json": response.parsed_json,
+                "parsed": response.parsed,
+                "model": response.model,
+                "tokens_used": response.tokens_used,
+                "truncated": response.truncated,
+            })
+        
         return response
     
+    def _cache_key(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        expect_json: bool,
+        schema: Optional[Type[BaseModel]]
+    ) -> str:
+        """Digest of everything that shapes a response."""
+        request = orjson.dumps([
+            self.model, system_prompt, prompt, temperature, max_tokens, expect_json,
+            schema.__name__ if schema is not None else None
+        ])
+        return hashlib.sha256(request).hexdigest()
+    
+    def _cached_response(self, key: str, schema: Optional[Type[BaseModel]]) -> Optional[LLMResponse]:
+        """A cached response, or None on a miss (or if it no longer fits the schema)."""
+        start_time = time.time()
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        
+        cached = entry[0]
+        parsed = None
+        if schema is not None:
+            parsed = self._validate_payload(cached["parsed"] or {}, schema)
+            if parsed is None:
+                return None
+        
+        return LLMResponse(
+            success=True,
+            content=cached["content"],
+            parsed_json=cached["parsed_json"],
+            model=cached["model"],
+            latency_ms=int((time.time() - start_time) * 1000),
+            tokens_used=cached["tokens_used"],
+            truncated=cached["truncated"],
+            parsed=parsed,
+            cached=True
+        )
+
+    def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: str = None,
+        temperature: float = None,
+        max_tokens: int = None,
+        expect_json: bool = True
+    ) -> Iterator[str]:
+        """
+        Stream raw text chunks from the LLM as they are generated.
+
+        Unlike generate(), there is no fallback model: once tokens have
+        been emitted the caller has already started consuming them.
+        Errors end the stream early and are logged.
+
+        Args:
+            prompt: The user prompt
+            system_prompt: Optional system prompt
+            temperature: Override temperature
+            max_tokens: Override max tokens
+            expect_json: Whether to request JSON output format
+
+        Yields:
+            Text fragments in generation order
+        """
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": True,
+            "options": {
+                "temperature": temperature or self.temperature,
+                "num_predict": max_tokens or self.max_tokens,
+            }
+        }
+
+        if system_prompt:
+            payload["system"] = system_prompt
+
+        if expect_json:
+            payload["format"] = "json"
+
+        request = current_request()
+        if request.done:
+            print(f"[LLM Service] Stream skipped: {request.reason}")
+            return
+
+        try:
+            # Leaving the block closes the connection, which stops Ollama generating
+            with self.client.stream(
+                "POST",
+                f"{self.base_url}/api/generate",
+                json=payload,
+                timeout=request.timeout(self.timeout)
+            ) as response:
+                if response.status_code != 200:
+                    response.read()
+                    print(f"[LLM Service] Stream API error: {response.status_code} - {response.text}")
+                    return
+
+                for line in response.iter_lines():
+                    if request.done:
+                        print(f"[LLM Service] Stream aborted: {request.reason}")
+                        return
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        print(f"[LLM Service] Stream error: {chunk['error']}")
+                        return
+                    text = chunk.get("response", "")
+                    if text:
+                        yield text
+                    if chunk.get("done"):
+                        return
+        except httpx.ConnectError:
+            print(f"[LLM Service] Cannot connect to LLM service at {self.base_url}")
+        except httpx.TimeoutException:
+            print(f"[LLM Service] Stream timed out after {self.timeout}s")
+        except Exception as e:
+            print(f"[LLM Service] Stream error: {str(e)}")
+
     def _call_model(
         self,
         model: str,
@@ -120,21 +290,29 @@ class LLMService:
         system_prompt: str,
         temperature: float,
         max_tokens: int,
-        expect_json: bool
+        expect_json: bool,
+        schema: Type[BaseModel] = None
     ) -> LLMResponse:
         """
         Make the actual API call to Ollama.
         
-        Uses Ollama's /api/generate endpoint.
+        Uses Ollama's /api/generate endpoint. The response is streamed
+        internally so the call can be abandoned between tokens when the
+        client disconnects or the request deadline passes; closing the
+        connection makes Ollama stop generating and frees its slot.
         """
         start_time = time.time()
+        request = current_request()
+        
+        if request.done:
+            return LLMResponse(success=False, content="", error=request.reason, model=model)
         
         try:
             # Build the request payload
             payload = {
                 "model": model,
                 "prompt": prompt,
-                "stream": False,
+                "stream": True,
                 "options": {
                     "temperature": temperature,
                     "num_predict": max_tokens,
@@ -150,32 +328,64 @@ class LLMService:
                 payload["format"] = "json"
             
             # Make the request
-            response = self.client.post(
+            with self.client.stream(
+                "POST",
                 f"{self.base_url}/api/generate",
-                json=payload
-            )
+                json=payload,
+                timeout=request.timeout(self.timeout)
+            ) as response:
+                if response.status_code != 200:
+                    response.read()
+                    return LLMResponse(
+                        success=False,
+                        content="",
+                        error=f"API error: {response.status_code} - {response.text}",
+                        model=model,
+                        latency_ms=int((time.time() - start_time) * 1000)
+                    )
+                
+                result = self._read_stream(response, request)
             
             latency_ms = int((time.time() - start_time) * 1000)
             
-            if response.status_code != 200:
+            if result is None:
+                print(f"[LLM Service] Generation aborted after {latency_ms}ms: {request.reason}")
                 return LLMResponse(
                     success=False,
                     content="",
-                    error=f"API error: {response.status_code} - {response.text}",
+                    error=request.reason,
                     model=model,
                     latency_ms=latency_ms
                 )
             
-            # Parse response
-            result = response.json()
             content = result.get("response", "").strip()
             tokens_used = result.get("eval_count", 0)
             
+            # Output cut off by num_predict
+            truncated = result.get("done_reason") == "length"
+            
             # Try to parse as JSON if expected
             parsed_json = None
+            parsed = None
             if expect_json:
-                parsed_json = self._extract_json(content)
-                if parsed_json is None:
+                if truncated:
+                    parsed_json, content, extra_tokens, truncated = self._recover_truncated(
+                        model, content, result.get("context"), temperature
+                    )
+                    tokens_used += extra_tokens
+                    latency_ms = int((time.time() - start_time) * 1000)
+                    if schema is not None and parsed_json is not None:
+                        parsed = self._validate_payload(parsed_json, schema)
+                elif schema is not None:
+                    parsed = self._parse_payload(content, schema)
+                else:
+                    parsed_json = extract_json_from_text(content)
+                
+                if schema is not None:
+                    # The validated model replaces the intermediate dict
+                    parsed_json = None
+                
+                if parsed is None and parsed_json is None:
                     return LLMResponse(
                         success=False,
                         content=content,
@@ -191,7 +401,9 @@ class LLMService:
                 parsed_json=parsed_json,
                 model=model,
                 latency_ms=latency_ms,
-                tokens_used=tokens_used
+                tokens_used=tokens_used,
+                truncated=truncated,
+                parsed=parsed
             )
             
         except httpx.ConnectError:
@@ -206,7 +418,7 @@ class LLMService:
             return LLMResponse(
                 success=False,
                 content="",
-                error=f"LLM request timed out after {self.timeout}s",
+                error=request.reason if request.expired else f"LLM request timed out after {self.timeout}s",
                 model=model,
                 latency_ms=int((time.time() - start_time) * 1000)
             )
@@ -219,41 +431,115 @@ class LLMService:
                 latency_ms=int((time.time() - start_time) * 1000)
             )
     
-    def _extract_json(self, text: str) -> Optional[Dict[str, Any]]:
+    @staticmethod
+    def _read_stream(response: httpx.Response, request: RequestScope) -> Optional[Dict[str, Any]]:
         """
-        Extract and parse JSON from LLM response.
-        Handles common issues like markdown code blocks.
-        """
-        # Try direct parsing first
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            pass
+        Collect a streamed /api/generate response.
         
-        # Remove markdown code blocks
-        cleaned = text.strip()
-        if cleaned.startswith("```json"):
-            cleaned = cleaned[7:]
-        elif cleaned.startswith("```"):
-            cleaned = cleaned[3:]
-        if cleaned.endswith("```"):
-            cleaned = cleaned[:-3]
+        Returns:
+            The final chunk (done_reason, eval_count, context) with the
+            full text under "response", or None if the request was
+            cancelled or ran past its deadline first
+        """
+        parts = []
+        for line in response.iter_lines():
+            if request.done:
+                return None
+            if not line:
+                continue
+            chunk = json.loads(line)
+            if chunk.get("error"):
+                raise RuntimeError(chunk["error"])
+            parts.append(chunk.get("response", ""))
+            if chunk.get("done"):
+                chunk["response"] = "".join(parts)
+                return chunk
+        raise RuntimeError("stream ended before the response was done")
+    
+    @staticmethod
+    def _parse_payload(content: str, schema: Type[BaseModel]) -> Optional[BaseModel]:
+        """
+        Validate raw model output against a schema.
         
+        Clean output is parsed and validated in a single pass by
+        pydantic-core; anything else goes through the JSON repair
+        engine first.
+        """
         try:
-            return json.loads(cleaned.strip())
-        except json.JSONDecodeError:
+            return schema.model_validate_json(content)
+        except ValidationError:
             pass
         
-        # Try to find JSON object in the response
+        data = extract_json_from_text(content)
+        return LLMService._validate_payload(data, schema) if data is not None else None
+    
+    @staticmethod
+    def _validate_payload(data: Dict[str, Any], schema: Type[BaseModel]) -> Optional[BaseModel]:
+        """Validate an already parsed dict against a schema."""
         try:
-            start = cleaned.find("{")
-            end = cleaned.rfind("}") + 1
-            if start != -1 and end > start:
-                return json.loads(cleaned[start:end])
-        except json.JSONDecodeError:
-            pass
+            return schema.model_validate(data)
+        except ValidationError as e:
+            print(f"[LLM Service] Response did not match {schema.__name__}: {e.error_count()} errors")
+            return None
+    
+    def _recover_truncated(
+        self,
+        model: str,
+        content: str,
+        context: Optional[list],
+        temperature: float
+    ) -> Tuple[Optional[Dict[str, Any]], str, int, bool]:
+        """
+        Recover JSON from a response that hit the token limit.
+        
+        If enabled, first asks the model to continue from the returned
+        `context` for up to `continuation_tokens` tokens. Whatever is
+        still incomplete is salvaged: open structures are closed and the
+        unfinished roadmap step / quiz question is dropped.
+        
+        Returns:
+            Tuple of (parsed_json, content, extra tokens used, still truncated)
+        """
+        extra_tokens = 0
+        
+        request = current_request()
+        
+        if llm_config.continue_truncated and context and not request.done:
+            try:
+                # Raw mode appends to the context instead of starting a new
+                # turn; a non-empty prompt is required to generate at all
+                response = self.client.post(
+                    f"{self.base_url}/api/generate",
+                    json={
+                        "model": model,
+                        "prompt": " ",
+                        "raw": True,
+                        "context": context,
+                        "stream": False,
+                        "options": {
+                            "temperature": temperature,
+                            "num_predict": llm_config.continuation_tokens,
+                        }
+                    },
+                    timeout=request.timeout(self.timeout)
+                )
+                if response.status_code == 200:
+                    result = response.json()
+                    extra_tokens = result.get("eval_count", 0)
+                    combined = content + " " + result.get("response", "")
+                    if result.get("done_reason") != "length":
+                        parsed = extract_json_from_text(combined)
+                        if parsed is not None:
+                            print(f"[LLM Service] Completed truncated response (+{extra_tokens} tokens)")
+                            return parsed, combined, extra_tokens, False
+                    content = combined
+            except Exception as e:
+                print(f"[LLM Service] Continuation failed: {str(e)}")
         
-        return None
+        parsed = salvage_json(content)
+        if parsed is not None:
+            print("[LLM Service] Response hit max tokens; kept complete items only")
+        return parsed, content, extra_tokens, True
     
     def check_health(self) -> Tuple[bool, str]:
         """
@@ -295,11 +581,14 @@ class LLMService:
 
 # Singleton instance
 _llm_service: Optional[LLMService] = None
+_llm_service_lock = threading.Lock()
 
 
 def get_llm_service() -> LLMService:
     """Get or create the LLM service singleton."""
     global _llm_service
     if _llm_service is None:
-        _llm_service = LLMService()
+        with _llm_service_lock:
+            if _llm_service is None:
+                _llm_service = LLMService()
     return _llm_service
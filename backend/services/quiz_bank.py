@@ -0,0 +1,81 @@
+"""
+CareerForge AI - Quiz Bank
+Generated quiz questions kept per (topic, step) in the shared cache, so
+repeat requests for the same step (from any process) reuse questions
+instead of generating them again.
+
+Questions are stored by position: a batch starting at question 6 fills
+positions 5-9, and a later request for the same range is answered from
+the bank. Each position is its own cache entry, so processes banking
+different batches of the same step at once never overwrite each other's
+questions. Topic and step are compared in canonical form, so case and
+spacing differences still hit.
+
+Off by default (QUIZ_BANK_TTL=0): with the bank on, retaking a step's
+quiz within the TTL returns the same questions.
+"""
+
+import os
+import sys
+import threading
+from typing import Any, Dict, List, Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import cache_config
+from services.cache import TieredCache, get_cache_store
+from utils.validators import canonical_input
+
+
+class QuizBank:
+    """Quiz questions by (topic, step, position)."""
+
+    def __init__(self, cache: TieredCache):
+        """
+        Initialize the bank.
+
+        Args:
+            cache: Cache namespace holding one entry per (topic, step, position)
+        """
+        self.cache = cache
+
+    @staticmethod
+    def _key(topic: str, step_name: str, position: int) -> str:
+        return f"{canonical_input(topic, 200)}\n{canonical_input(step_name, 200)}\n{position}"
+
+    def take(self, topic: str, step_name: str, start_id: int, count: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Questions start_id .. start_id + count - 1, or None unless all are banked.
+
+        Returned questions are renumbered from start_id.
+        """
+        questions = []
+        for position in range(start_id - 1, start_id - 1 + count):
+            entry = self.cache.get(self._key(topic, step_name, position))
+            if entry is None:
+                return None
+            questions.append({**entry[0], "id": start_id + len(questions)})
+        return questions
+
+    def put(self, topic: str, step_name: str, start_id: int, questions: List[Any]) -> None:
+        """Bank questions (dicts or payload models) at positions from start_id."""
+        for offset, question in enumerate(questions):
+            self.cache.set(self._key(topic, step_name, start_id - 1 + offset), question)
+
+
+# Singleton instance
+_bank: Optional[QuizBank] = None
+_bank_lock = threading.Lock()
+
+
+def get_quiz_bank() -> Optional[QuizBank]:
+    """Get or create the quiz bank singleton (None when QUIZ_BANK_TTL is 0)."""
+    global _bank
+    if _bank is None and cache_config.quiz_bank_ttl > 0:
+        with _bank_lock:
+            if _bank is None:
+                _bank = QuizBank(TieredCache(
+                    "quiz_bank", get_cache_store(), cache_config.memory_size, cache_config.quiz_bank_ttl
+                ))
+    return _bank
@@ -1,8 +1,10 @@
 import os
 import json
-from openai import OpenAI
+import threading
 from dotenv import load_dotenv
 
+from services.key_pool import KeyPool, parse_retry_after
+
 load_dotenv()
 
 # Multiple OpenAI API keys for fallback (comma-separated)
@@ -11,73 +13,85 @@ OPENAI_API_KEYS = [key.strip() for key in os.getenv("OPENAI_API_KEYS", "").split
 # Model to use (gpt-4o-mini is fast and cost-effective for quizzes)
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
-if not OPENAI_API_KEYS:
-    print("WARNING: No OPENAI_API_KEYS set!")
+# Optional OpenAI-compatible endpoint (e.g. a local stand-in server)
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+
+# Per-key request budget (requests per minute)
+OPENAI_KEY_RPM = int(os.getenv("OPENAI_KEY_RPM", "60"))
 
-# Track current key index for round-robin
-_current_key_index = 0
+# Shared key pool (one persistent client per key)
+_key_pool = None
+_key_pool_lock = threading.Lock()
 
 
-def get_openai_client(api_key: str) -> OpenAI:
-    """Create OpenAI client with given API key."""
-    return OpenAI(api_key=api_key)
+def get_key_pool() -> KeyPool:
+    """Get or create the OpenAI key pool singleton."""
+    global _key_pool
+    if _key_pool is None:
+        with _key_pool_lock:
+            if _key_pool is None:
+                _key_pool = KeyPool(
+                    OPENAI_API_KEYS,
+                    requests_per_minute=OPENAI_KEY_RPM,
+                    base_url=OPENAI_BASE_URL
+                )
+    return _key_pool
 
 
 def _call_openai_with_fallback(messages: list, max_tokens: int) -> dict:
-    """Call OpenAI API with multi-key fallback."""
-    global _current_key_index
-    
+    """Call OpenAI API on the least-loaded healthy key, failing over on 429/auth errors."""
     if not OPENAI_API_KEYS:
         return {"error": "No OpenAI API keys configured"}
     
-    tried_keys = 0
-    max_tries = len(OPENAI_API_KEYS)
+    # Imported on first use: loading the SDK dominates this module's import time
+    import openai
+
+    pool = get_key_pool()
+    tried = set()
     
-    while tried_keys < max_tries:
-        current_key = OPENAI_API_KEYS[_current_key_index]
+    while len(tried) < len(pool):
+        state = pool.acquire(exclude=tried)
+        if state is None:
+            break
+        tried.add(state.key)
         
         try:
-            client = get_openai_client(current_key)
-            
-            response = client.chat.completions.create(
+            response = state.client.chat.completions.create(
                 model=OPENAI_MODEL,
                 messages=messages,
                 max_tokens=max_tokens,
                 temperature=0.7
             )
-            
-            response_text = response.choices[0].message.content.strip()
-            
-            # Clean markdown formatting
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            
-            result = json.loads(response_text.strip())
-            
-            # Success! Rotate to next key for load balancing
-            _current_key_index = (_current_key_index + 1) % len(OPENAI_API_KEYS)
-            return result
+        except openai.RateLimitError as e:
+            retry_after = parse_retry_after(e.response.headers if e.response is not None else None)
+            pool.release(state, retry_after=retry_after, rate_limited=True)
+            print(f"OpenAI key {state.label} rate limited, cooling down {retry_after or pool.default_cooldown}s")
+            continue
+        except (openai.AuthenticationError, openai.PermissionDeniedError) as e:
+            pool.release(state, disabled=True)
+            print(f"OpenAI key {state.label} rejected: {e}")
+            continue
+        except Exception as e:
+            pool.release(state)
+            print(f"OpenAI key {state.label} failed: {e}")
+            return {"error": f"Quiz error: {str(e)}"}
         
+        pool.release(state)
+        response_text = (response.choices[0].message.content or "").strip()
+        
+        # Clean markdown formatting
+        if response_text.startswith("```json"):
+            response_text = response_text[7:]
+        if response_text.startswith("```"):
+            response_text = response_text[3:]
+        if response_text.endswith("```"):
+            response_text = response_text[:-3]
+        
+        try:
+            return json.loads(response_text.strip())
         except json.JSONDecodeError as e:
-            print(f"JSON error with OpenAI key {_current_key_index + 1}: {e}")
+            print(f"JSON error with OpenAI key {state.label}: {e}")
             return {"error": "Failed to parse quiz response. Please try again."}
-        
-        except Exception as e:
-            error_msg = str(e).lower()
-            print(f"OpenAI key {_current_key_index + 1} failed: {e}")
-            
-            # Check if it's a rate limit or auth error - try next key
-            if any(keyword in error_msg for keyword in ['quota', 'rate', 'limit', 'unauthorized', 'invalid', 'api_key', '429', '401', '403', 'insufficient']):
-                _current_key_index = (_current_key_index + 1) % len(OPENAI_API_KEYS)
-                tried_keys += 1
-                print(f"Trying next OpenAI key ({tried_keys}/{max_tries})...")
-                continue
-            else:
-                return {"error": f"Quiz error: {str(e)}"}
     
     return {"error": "All OpenAI API keys exhausted. Please try again later."}
 
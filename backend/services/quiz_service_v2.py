@@ -10,25 +10,30 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from typing import Dict, Any, Optional
+import threading
+from typing import Dict, Any, Optional, Iterator
+from pydantic import ValidationError
 from services.llm_service import LLMService, get_llm_service
+from services.quiz_bank import get_quiz_bank
+from utils.json_parser import ArrayItemStream
+from api.schemas.payloads import QuizPayload, QuizQuestion
+from prompts.system_prompts import CAREERFORGE_SYSTEM_PROMPT, QUIZ_GENERATION_CONTEXT
 
 # Use simplified prompts for faster responses
 try:
     from prompts.quiz_prompts_simple import get_simple_quiz_prompt
     USE_SIMPLE_PROMPTS = True
 except ImportError:
-    from prompts.quiz_prompts import get_quiz_prompt, get_quiz_batch_prompt
+    # Detailed prompts are imported where they are used
     USE_SIMPLE_PROMPTS = False
 
-print(f"[QuizService] Using {'simple' if USE_SIMPLE_PROMPTS else 'detailed'} prompts")
-
 
 class QuizService:
     """Service for generating knowledge assessment quizzes."""
     
     def __init__(self, llm_service: LLMService = None):
         self.llm = llm_service or get_llm_service()
+        self.bank = get_quiz_bank()
     
     def generate_quiz(
         self,
@@ -42,6 +47,15 @@ class QuizService:
         if not topic or not step_name:
             return {"error": "Topic and step_name are required"}
         
+        # A custom difficulty mix needs its own questions
+        use_bank = self.bank is not None and difficulty_mix is None
+        if use_bank:
+            questions = self.bank.take(topic, step_name, 1, num_questions)
+            if questions is not None:
+                return {"questions": questions, "meta": {"source": "quiz_bank"}}
+        
+        # The full quiz always uses the detailed prompt
+        from prompts.quiz_prompts import get_quiz_prompt
         prompt = get_quiz_prompt(topic, step_name, num_questions, difficulty_mix)
         system_prompt = f"{CAREERFORGE_SYSTEM_PROMPT}\n\n{QUIZ_GENERATION_CONTEXT}"
         
@@ -50,21 +64,27 @@ class QuizService:
             system_prompt=system_prompt,
             temperature=0.7,
             max_tokens=4000,
-            expect_json=True
+            expect_json=True,
+            schema=QuizPayload
         )
         
         if not response.success:
             return {"error": response.error or "Failed to generate quiz"}
         
-        quiz_data = response.parsed_json
-        if "questions" not in quiz_data:
-            quiz_data = {"questions": []}
+        # Validated question models are serialized directly by the response class
+        quiz_data = {"questions": response.parsed.questions}
         
         quiz_data["meta"] = {
             "model": response.model,
             "latency_ms": response.latency_ms,
             "tokens_used": response.tokens_used
         }
+        if response.truncated:
+            # Hit max tokens: only the complete questions were kept
+            quiz_data["meta"]["truncated"] = True
+        
+        if use_bank:
+            self.bank.put(topic, step_name, 1, response.parsed.questions)
         
         return quiz_data
     
@@ -81,6 +101,12 @@ class QuizService:
         if not topic or not step_name:
             return {"error": "Topic and step_name are required"}
         
+        use_bank = self.bank is not None and difficulty == "mixed"
+        if use_bank:
+            questions = self.bank.take(topic, step_name, start_id, count)
+            if questions is not None:
+                return {"questions": questions}
+        
         # Use simple prompts for faster responses
         if USE_SIMPLE_PROMPTS:
             prompt = get_simple_quiz_prompt(topic, step_name, count, start_id)
@@ -93,19 +119,104 @@ class QuizService:
             system_prompt="You are a quiz generator. Return only valid JSON.",
             temperature=0.5,
             max_tokens=1000,  # Reduced for faster responses
-            expect_json=True
+            expect_json=True,
+            schema=QuizPayload
         )
         
         if not response.success:
             return {"error": response.error or "Failed to generate quiz batch"}
         
-        return response.parsed_json or {"questions": []}
+        if use_bank:
+            self.bank.put(topic, step_name, start_id, response.parsed.questions)
+        
+        return {"questions": response.parsed.questions}
+    
+    def stream_quiz_batch(
+        self,
+        topic: str,
+        step_name: str,
+        count: int = 5,
+        start_id: int = 1,
+        difficulty: str = "mixed"
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream a batch of quiz questions one at a time.
+        
+        Each question is yielded as soon as its JSON object closes in the
+        model output. Malformed or incomplete questions are dropped
+        without failing the rest of the batch.
+        """
+        
+        if not topic or not step_name:
+            return
+        
+        use_bank = self.bank is not None and difficulty == "mixed"
+        if use_bank:
+            questions = self.bank.take(topic, step_name, start_id, count)
+            if questions is not None:
+                yield from questions
+                return
+        
+        if USE_SIMPLE_PROMPTS:
+            prompt = get_simple_quiz_prompt(topic, step_name, count, start_id)
+        else:
+            from prompts.quiz_prompts import get_quiz_batch_prompt
+            prompt = get_quiz_batch_prompt(topic, step_name, count, start_id, difficulty)
+        
+        chunks = self.llm.generate_stream(
+            prompt=prompt,
+            system_prompt="You are a quiz generator. Return only valid JSON.",
+            temperature=0.5,
+            max_tokens=1000,
+            expect_json=True
+        )
+        
+        stream = ArrayItemStream()
+        emitted = []
+        
+        try:
+            for chunk in chunks:
+                for item in stream.feed(chunk):
+                    try:
+                        question = QuizQuestion.model_validate(item).model_dump(exclude_unset=True)
+                    except ValidationError:
+                        stream.dropped += 1
+                        continue
+                    
+                    question.setdefault("id", start_id + len(emitted))
+                    emitted.append(question)
+                    yield question
+                    
+                    if len(emitted) >= count:
+                        return
+        finally:
+            # Bank what was streamed, even if the client stopped reading early
+            if use_bank:
+                self.bank.put(topic, step_name, start_id, emitted)
+        
+        if stream.dropped:
+            print(f"[QuizService] Dropped {stream.dropped} malformed questions from stream")
+
+
+# Singleton instance
+_quiz_service: Optional[QuizService] = None
+_quiz_service_lock = threading.Lock()
+
+
+def get_quiz_service() -> QuizService:
+    """Get or create the quiz service singleton."""
+    global _quiz_service
+    if _quiz_service is None:
+        with _quiz_service_lock:
+            if _quiz_service is None:
+                _quiz_service = QuizService()
+    return _quiz_service
 
 
 # Backward compatibility functions
 def generate_quiz_openai(topic: str, step_name: str) -> Dict[str, Any]:
     """Generate quiz (backward compatible)."""
-    service = QuizService()
+    service = get_quiz_service()
     return service.generate_quiz(topic, step_name)
 
 
@@ -116,5 +227,5 @@ def generate_quiz_batch(
     start_id: int = 1
 ) -> Dict[str, Any]:
     """Generate quiz batch (backward compatible)."""
-    service = QuizService()
+    service = get_quiz_service()
     return service.generate_quiz_batch(topic, step_name, count, start_id)
@@ -0,0 +1,297 @@
+"""
+CareerForge AI - Canonical Roadmap Library
+Precomputed roadmaps for the most requested roles, plus a fast local
+TF-IDF matcher that maps an incoming profile to the nearest template.
+
+Rebuild the library offline (requires a running LLM):
+    python -m services.roadmap_library --build
+"""
+
+import copy
+import json
+import os
+import re
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import library_config
+from utils.validators import canonical_input
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "become", "but", "by", "can",
+    "do", "for", "from", "get", "have", "how", "i", "im", "in", "into", "is",
+    "it", "like", "me", "my", "of", "on", "or", "so", "some", "that", "the",
+    "to", "want", "was", "with", "would", "year", "years", "job", "career",
+    "learn", "learning", "work", "working", "currently", "also", "am",
+})
+
+
+# Phrases that introduce the role the user is aiming for; what follows (up
+# to the end of the sentence) is the goal, what precedes it is background
+_GOAL_RE = re.compile(
+    r"\b(?:become|becoming|be an?|work as|working as|get into|break into|"
+    r"move into|moving into|switch(?:ing)? (?:to|into)|transition(?:ing)? (?:to|into)|"
+    r"pivot(?:ing)? (?:to|into)|career (?:in|as)|goal is|aspire to|aiming for|interested in)\b"
+    r"(?P<goal>[^.!?\n]*)",
+    re.IGNORECASE
+)
+
+
+def goal_phrase(text: str) -> Optional[str]:
+    """The stated target role of a profile, or None if no goal cue is found."""
+    found = _GOAL_RE.search(text)
+    goal = found.group("goal").strip() if found else ""
+    return goal or None
+
+
+# Generation settings of the templates unless the data file says otherwise
+# (the defaults of a roadmap request)
+DEFAULT_CONSTRAINTS = {
+    "hours_per_week": 15,
+    "max_months": 6,
+    "budget": "free resources preferred",
+}
+
+
+def _tokenize(text: str) -> List[str]:
+    """Lowercase unigrams plus adjacent bigrams, stopwords removed."""
+    words = [w for w in _TOKEN_RE.findall(text.lower()) if w not in _STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class RoadmapLibrary:
+    """
+    In-memory roadmap templates with a TF-IDF cosine matcher.
+
+    Template vectors are L2-normalised once at load time, so matching
+    a profile is a single sparse-to-dense projection and a matrix-vector
+    product over a handful of templates.
+    """
+
+    def __init__(self, templates: List[Dict[str, Any]], constraints: Dict[str, Any] = None):
+        # numpy is imported with the library rather than with the module,
+        # keeping it off the app's import path
+        import numpy as np
+
+        self.templates = templates
+        # Settings every template was generated with
+        self.constraints = {**DEFAULT_CONSTRAINTS, **(constraints or {})}
+        docs = [self._template_tokens(t) for t in templates]
+
+        vocab: Dict[str, int] = {}
+        for doc in docs:
+            for token in doc:
+                vocab.setdefault(token, len(vocab))
+        self.vocab = vocab
+
+        # Smoothed IDF: terms shared by every template still count a little
+        df = np.zeros(len(vocab))
+        for doc in docs:
+            for token in set(doc):
+                df[vocab[token]] += 1
+        self.idf = np.log((1 + len(docs)) / (1 + df)) + 1.0
+        self.idf_unknown = np.log(1 + len(docs)) + 1.0
+
+        matrix = np.zeros((len(docs), len(vocab)))
+        for row, doc in enumerate(docs):
+            for token in doc:
+                matrix[row, vocab[token]] += 1
+        matrix *= self.idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self.matrix = matrix / np.where(norms == 0, 1, norms)
+
+    @staticmethod
+    def _template_tokens(template: Dict[str, Any]) -> List[str]:
+        """Keywords and role weigh more than step titles."""
+        keywords = " . ".join(template.get("keywords", []))
+        role = template.get("career_role", "")
+        steps = " . ".join(s.get("step_name", "") for s in template.get("roadmap", []))
+        return _tokenize(keywords) * 3 + _tokenize(role) * 3 + _tokenize(steps)
+
+    @classmethod
+    def load(cls, path: str) -> "RoadmapLibrary":
+        """Load a library from its JSON data file."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("templates", []), data.get("constraints"))
+
+    def _scores(self, text: str):
+        """Cosine similarity of a text to every template (zeros if no known terms)."""
+        import numpy as np
+
+        query = np.zeros(len(self.vocab))
+        unknown = 0
+        for token in _tokenize(text):
+            index = self.vocab.get(token)
+            if index is not None:
+                query[index] += 1
+            elif " " not in token:
+                unknown += 1
+
+        query *= self.idf
+        # Words no template uses still count towards the norm, at the
+        # highest IDF: "iOS developer" is not a close match for a template
+        # that only shares "developer" (unknown bigrams are not counted)
+        norm = np.sqrt(np.dot(query, query) + unknown * self.idf_unknown ** 2)
+        if not query.any():
+            return np.zeros(len(self.templates))
+        return self.matrix @ (query / norm)
+
+    def match(self, profile: str) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Find the template nearest to a user profile.
+
+        When the profile states a goal ("... want to become X"), the goal
+        phrase carries `goal_weight` of the score and the rest of the
+        profile (current skills, background) only the remainder, so a
+        Python developer moving into ML matches the ML template rather
+        than the Python one. The best template must also lead the
+        runner-up by `match_margin`; ambiguous profiles get no template.
+
+        Args:
+            profile: Free-text user description
+
+        Returns:
+            Tuple of (template or None, combined similarity score)
+        """
+        if not self.templates:
+            return None, 0.0
+
+        import numpy as np
+
+        scores = self._scores(profile)
+        goal = goal_phrase(profile)
+        if goal is not None:
+            weight = library_config.goal_weight
+            scores = weight * self._scores(goal) + (1 - weight) * scores
+
+        ranked = np.argsort(scores)[::-1]
+        best = float(scores[ranked[0]])
+        if best <= 0:
+            return None, 0.0
+        if len(ranked) > 1 and best - float(scores[ranked[1]]) < library_config.match_margin:
+            return None, best
+        return self.templates[int(ranked[0])], best
+
+    def fits(self, hours_per_week: Optional[int], max_months: Optional[int], budget: Optional[str]) -> bool:
+        """
+        Whether a request's settings are close enough to the templates' own.
+
+        Hours may differ by `hours_tolerance`; the timeline must match and
+        the budget must be the templates' budget (or unset).
+        """
+        expected = self.constraints
+        if max_months is not None and max_months != expected["max_months"]:
+            return False
+        if hours_per_week is not None and \
+                abs(hours_per_week - expected["hours_per_week"]) > library_config.hours_tolerance:
+            return False
+        if budget and canonical_input(budget, 200) != canonical_input(expected["budget"], 200):
+            return False
+        return True
+
+    def roadmap_for(self, template: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a fresh copy of a template's roadmap payload."""
+        return {
+            "career_role": template["career_role"],
+            "summary": template["summary"],
+            "roadmap": copy.deepcopy(template["roadmap"]),
+        }
+
+
+# Singleton instance
+_library: Optional[RoadmapLibrary] = None
+_library_failed = False
+_library_lock = threading.Lock()
+
+
+def get_roadmap_library() -> Optional[RoadmapLibrary]:
+    """
+    Get or load the roadmap library singleton (None if unavailable).
+
+    A failed load is remembered, so a missing or broken data file is
+    reported once rather than re-read on every roadmap request.
+    """
+    global _library, _library_failed
+    if _library is None and not _library_failed and library_config.enabled:
+        with _library_lock:
+            if _library is None and not _library_failed:
+                try:
+                    _library = RoadmapLibrary.load(library_config.path)
+                    print(f"[RoadmapLibrary] Loaded {len(_library.templates)} templates")
+                except (OSError, ValueError) as e:
+                    _library_failed = True
+                    print(f"[RoadmapLibrary] Could not load {library_config.path}: {e}")
+    return _library
+
+
+def build_library(path: str = None) -> int:
+    """
+    Regenerate every template's roadmap with the LLM and rewrite the file.
+
+    Template ids and keywords are kept; role, summary and steps are
+    replaced with fresh generations made with the library's constraints,
+    bypassing the LLM response cache so a rebuild never returns a stale
+    generation. Templates whose generation fails keep their previous content.
+
+    Returns:
+        Number of templates regenerated
+    """
+    from services.roadmap_service import get_roadmap_service
+
+    path = path or library_config.path
+    with open(path, encoding="utf-8") as f:
+        library = json.load(f)
+
+    constraints = {**DEFAULT_CONSTRAINTS, **library.get("constraints", {})}
+    library["constraints"] = constraints
+    service = get_roadmap_service()
+    rebuilt = 0
+
+    for template in library.get("templates", []):
+        profile = (
+            f"I want to become a {template['career_role']}. "
+            f"Interested in: {', '.join(template.get('keywords', []))}."
+        )
+        result = service.generate_roadmap(
+            profile,
+            constraints["hours_per_week"],
+            constraints["max_months"],
+            constraints["budget"],
+            use_library=False,
+            use_cache=False
+        )
+        data = result.get("data") or {}
+
+        if not result.get("success") or len(data.get("roadmap", [])) != 6:
+            print(f"[RoadmapLibrary] Skipping {template['id']}: generation failed")
+            continue
+
+        template["career_role"] = data.get("career_role", template["career_role"])
+        template["summary"] = data.get("summary", template["summary"])
+        template["roadmap"] = data["roadmap"]
+        rebuilt += 1
+        print(f"[RoadmapLibrary] Rebuilt {template['id']}")
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(library, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+    return rebuilt
+
+
+if __name__ == "__main__":
+    if "--build" in sys.argv:
+        count = build_library()
+        print(f"[RoadmapLibrary] Rebuilt {count} templates")
+    else:
+        library = get_roadmap_library()
+        profile = " ".join(sys.argv[1:]) or "I want to become a Python developer"
+        template, score = library.match(profile) if library else (None, 0.0)
+        print(f"{template['id'] if template else None}: {score:.3f}")
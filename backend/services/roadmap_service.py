@@ -10,9 +10,21 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from typing import Optional, Dict, Any
+import threading
+import time
+from concurrent.futures import as_completed
+from typing import Optional, Dict, Any, Iterator, List
+from config import library_config
 from services.llm_service import LLMService, get_llm_service
+from services.roadmap_library import get_roadmap_library
+from api.schemas.payloads import RoadmapPayload
 from prompts.system_prompts import CAREERFORGE_SYSTEM_PROMPT
+from prompts.roadmap_prompts_simple import (
+    get_skeleton_roadmap_prompt,
+    get_step_expansion_prompt,
+    get_personalize_summary_prompt,
+    get_step_regeneration_prompt,
+)
 
 # Use simplified prompts for faster responses
 try:
@@ -22,7 +34,6 @@ except ImportError:
     from prompts.roadmap_prompts import get_roadmap_prompt, get_skills_gap_prompt
     USE_SIMPLE_PROMPTS = False
 
-
 class RoadmapService:
     """
     Service for generating career roadmaps.
@@ -31,14 +42,15 @@ class RoadmapService:
     
     def __init__(self, llm_service: LLMService = None):
         self.llm = llm_service or get_llm_service()
-        print(f"[RoadmapService] Using {'simple' if USE_SIMPLE_PROMPTS else 'detailed'} prompts")
     
     def generate_roadmap(
         self,
         user_profile: str,
         hours_per_week: int = 15,
         max_months: int = 6,
-        budget: str = "free resources preferred"
+        budget: str = "free resources preferred",
+        use_library: bool = True,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """Generate a career roadmap optimized for speed."""
         
@@ -48,6 +60,11 @@ class RoadmapService:
                 "error": "Please provide more details about your background and goals"
             }
         
+        if use_library:
+            library_result = self._roadmap_from_library(user_profile, hours_per_week, max_months, budget)
+            if library_result:
+                return library_result
+        
         constraints = {
             "hours_per_week": hours_per_week,
             "max_months": max_months,
@@ -68,7 +85,9 @@ class RoadmapService:
             system_prompt="You are a career expert. Return only valid JSON.",
             temperature=0.5,
             max_tokens=1500,  # Optimized for speed with shorter descriptions
-            expect_json=True
+            expect_json=True,
+            schema=RoadmapPayload,
+            use_cache=use_cache
         )
         
         if not response.success:
@@ -78,7 +97,8 @@ class RoadmapService:
                 "error": response.error or "Failed to generate roadmap. Please try again."
             }
         
-        roadmap_data = response.parsed_json
+        # Steps are mutated downstream (videos, regeneration), so keep a dict
+        roadmap_data = response.parsed.model_dump(exclude_unset=True)
         if not self._validate_roadmap(roadmap_data):
             # Return what we got anyway - partial data is better than nothing
             print(f"[RoadmapService] Warning: Roadmap validation failed, returning raw data")
@@ -93,9 +113,110 @@ class RoadmapService:
                 }
             }
         
+        meta = {
+            "model": response.model,
+            "latency_ms": response.latency_ms,
+            "tokens_used": response.tokens_used
+        }
+        if response.truncated:
+            # Hit max tokens: only the complete steps were kept
+            meta["truncated"] = True
+            meta["note"] = "Response may be incomplete"
+        
         return {
             "success": True,
             "data": roadmap_data,
+            "meta": meta
+        }
+    
+    def _roadmap_from_library(
+        self,
+        user_profile: str,
+        hours_per_week: Optional[int],
+        max_months: Optional[int],
+        budget: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Serve a precomputed roadmap when the profile closely matches a template.
+        
+        Above the direct threshold the template is returned as-is; between the
+        match and direct thresholds only the summary is personalized with a
+        short LLM call. Returns None when no template is close enough, or
+        when the request's hours, timeline or budget differ from the ones
+        the templates were generated for.
+        """
+        library = get_roadmap_library()
+        if library is None or not library.fits(hours_per_week, max_months, budget):
+            return None
+        
+        template, score = library.match(user_profile)
+        if template is None or score < library_config.match_threshold:
+            return None
+        
+        data = library.roadmap_for(template)
+        meta = {
+            "model": "roadmap-library",
+            "latency_ms": 0,
+            "tokens_used": 0,
+            "source": "library",
+            "template": template["id"],
+            "match_score": round(score, 3)
+        }
+        
+        if score < library_config.direct_threshold:
+            response = self.llm.generate(
+                prompt=get_personalize_summary_prompt(user_profile, data["career_role"], data["summary"]),
+                system_prompt="You are a career expert. Return only valid JSON.",
+                temperature=0.5,
+                max_tokens=120,
+                expect_json=True
+            )
+            summary = (response.parsed_json or {}).get("summary") if response.success else None
+            if isinstance(summary, str) and summary.strip():
+                data["summary"] = summary.strip()
+                meta.update({
+                    "model": response.model,
+                    "latency_ms": response.latency_ms,
+                    "tokens_used": response.tokens_used,
+                    "personalized": True
+                })
+        
+        print(f"[RoadmapService] Served from library: {template['id']} (score {score:.2f})")
+        return {"success": True, "data": data, "meta": meta}
+    
+    def generate_skeleton(
+        self,
+        user_profile: str,
+        max_months: int = 6
+    ) -> Dict[str, Any]:
+        """
+        Phase one of two-phase generation: role, summary and step titles only.
+        """
+        prompt = get_skeleton_roadmap_prompt(user_profile, {"max_months": max_months})
+        
+        response = self.llm.generate(
+            prompt=prompt,
+            system_prompt="You are a career expert. Return only valid JSON.",
+            temperature=0.5,
+            max_tokens=300,
+            expect_json=True
+        )
+        
+        if not response.success:
+            return {"success": False, "error": response.error or "Failed to outline roadmap"}
+        
+        data = response.parsed_json or {}
+        steps = [s for s in data.get("steps", []) if isinstance(s, str) and s.strip()]
+        if not steps:
+            return {"success": False, "error": "Roadmap outline was empty"}
+        
+        return {
+            "success": True,
+            "data": {
+                "career_role": data.get("career_role", ""),
+                "summary": data.get("summary", ""),
+                "roadmap": [{"step_name": name} for name in steps[:max_months]]
+            },
             "meta": {
                 "model": response.model,
                 "latency_ms": response.latency_ms,
@@ -103,6 +224,205 @@ class RoadmapService:
             }
         }
     
+    def expand_step(
+        self,
+        user_profile: str,
+        career_role: str,
+        step_name: str,
+        outline: List[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Phase two: fill in description, docs URL and course for one step.
+        Always returns a step dict; on failure only step_name is set.
+        """
+        prompt = get_step_expansion_prompt(user_profile, career_role, step_name, outline)
+        
+        response = self.llm.generate(
+            prompt=prompt,
+            system_prompt="You are a career expert. Return only valid JSON.",
+            temperature=0.5,
+            max_tokens=200,
+            expect_json=True
+        )
+        
+        step = {"step_name": step_name}
+        if not response.success or not isinstance(response.parsed_json, dict):
+            print(f"[RoadmapService] Step expansion failed for '{step_name}': {response.error}")
+            return step
+        
+        details = response.parsed_json
+        for key in ("description", "official_docs_url", "paid_course_recommendation"):
+            if key in details:
+                step[key] = details[key]
+        
+        step["_tokens_used"] = response.tokens_used
+        return step
+    
+    def stream_roadmap(
+        self,
+        user_profile: str,
+        hours_per_week: int = 15,
+        max_months: int = 6,
+        budget: str = "free resources preferred",
+        use_library: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Two-phase roadmap generation as a stream of events.
+        
+        Yields a "skeleton" event as soon as the outline is ready, then one
+        "step" event per expanded step in completion order, then "done".
+        Steps are expanded concurrently, so wall-clock time is roughly the
+        outline call plus one step, not the sum of all steps.
+        
+        With `use_library`, a profile matching a precomputed roadmap gets
+        the complete roadmap as its skeleton, followed directly by "done".
+        """
+        if not user_profile or len(user_profile.strip()) < 10:
+            yield {
+                "type": "error",
+                "error": "Please provide more details about your background and goals"
+            }
+            return
+        
+        if use_library:
+            library_result = self._roadmap_from_library(user_profile, hours_per_week, max_months, budget)
+            if library_result:
+                yield {"type": "skeleton", "data": library_result["data"], "meta": library_result["meta"]}
+                yield {"type": "done", "meta": library_result["meta"]}
+                return
+        
+        start_time = time.time()
+        skeleton = self.generate_skeleton(user_profile, max_months)
+        if not skeleton.get("success"):
+            yield {"type": "error", "error": skeleton.get("error")}
+            return
+        
+        data = skeleton["data"]
+        yield {"type": "skeleton", "data": data, "meta": skeleton["meta"]}
+        
+        # Imported here: the executor pulls in FastAPI, which worker
+        # processes otherwise never load
+        from api.executor import get_executor
+        
+        outline = [step["step_name"] for step in data["roadmap"]]
+        # Expansions go through the shared executor's step bulkhead, in
+        # this request's context, so a disconnect or deadline also aborts
+        # their LLM calls
+        executor = get_executor()
+        futures = {
+            executor.submit(
+                "roadmap_steps",
+                self.expand_step,
+                user_profile,
+                data["career_role"],
+                name,
+                outline
+            ): index
+            for index, name in enumerate(outline)
+        }
+        
+        tokens_used = skeleton["meta"]["tokens_used"]
+        try:
+            for future in as_completed(futures):
+                try:
+                    step = future.result()
+                except Exception as e:
+                    # No slot in time (503/504): the step keeps its title only
+                    print(f"[RoadmapService] Step expansion not run: {getattr(e, 'detail', e)}")
+                    step = {"step_name": outline[futures[future]]}
+                tokens_used += step.pop("_tokens_used", 0)
+                yield {"type": "step", "index": futures[future], "data": step}
+        finally:
+            # Client went away: don't keep expanding steps nobody will read
+            for future in futures:
+                future.cancel()
+        
+        yield {
+            "type": "done",
+            "meta": {
+                "model": skeleton["meta"]["model"],
+                "latency_ms": int((time.time() - start_time) * 1000),
+                "tokens_used": tokens_used
+            }
+        }
+    
+    def regenerate_step(
+        self,
+        roadmap_data: Dict[str, Any],
+        step_index: int,
+        hours_per_week: int = None,
+        budget: str = None,
+        feedback: str = None,
+        user_profile: str = None
+    ) -> Dict[str, Any]:
+        """
+        Regenerate a single step of an existing roadmap.
+        
+        All other steps (including their video_results) are returned
+        untouched, so this costs one step's worth of tokens.
+        
+        Failures carry an `error_kind`: "invalid_request" when the roadmap
+        or step_index cannot be used, "generation_failed" when the LLM
+        call did not produce a step.
+        """
+        steps = roadmap_data.get("roadmap") if isinstance(roadmap_data, dict) else None
+        if not isinstance(steps, list) or not steps:
+            return {"success": False, "error_kind": "invalid_request", "error": "Roadmap has no steps"}
+        
+        if step_index < 0 or step_index >= len(steps):
+            return {
+                "success": False,
+                "error_kind": "invalid_request",
+                "error": f"step_index must be between 0 and {len(steps) - 1}"
+            }
+        
+        outline = [
+            step.get("step_name") or step.get("title") or f"Step {i + 1}"
+            for i, step in enumerate(steps)
+        ]
+        constraints = {"hours_per_week": hours_per_week, "budget": budget}
+        prompt = get_step_regeneration_prompt(
+            roadmap_data.get("career_role", ""),
+            outline[step_index],
+            outline,
+            constraints,
+            feedback,
+            user_profile
+        )
+        
+        response = self.llm.generate(
+            prompt=prompt,
+            system_prompt="You are a career expert. Return only valid JSON.",
+            temperature=0.6,
+            max_tokens=250,
+            expect_json=True,
+            # Regenerating must not return the step the user just rejected
+            use_cache=False
+        )
+        
+        new_step = response.parsed_json if response.success else None
+        if not isinstance(new_step, dict) or not new_step.get("step_name"):
+            return {
+                "success": False,
+                "error_kind": "generation_failed",
+                "error": response.error or "Failed to regenerate step. Please try again."
+            }
+        
+        updated = dict(roadmap_data)
+        updated["roadmap"] = list(steps)
+        updated["roadmap"][step_index] = new_step
+        
+        return {
+            "success": True,
+            "data": updated,
+            "meta": {
+                "model": response.model,
+                "latency_ms": response.latency_ms,
+                "tokens_used": response.tokens_used,
+                "regenerated": [step_index]
+            }
+        }
+    
     def _validate_roadmap(self, data: Optional[Dict]) -> bool:
         """Validate roadmap structure - flexible to accept various formats."""
         if not data or not isinstance(data, dict):
@@ -115,7 +435,22 @@ class RoadmapService:
         return bool(set(data.keys()) & valid_keys)
 
 
+# Singleton instance
+_roadmap_service: Optional[RoadmapService] = None
+_roadmap_service_lock = threading.Lock()
+
+
+def get_roadmap_service() -> RoadmapService:
+    """Get or create the roadmap service singleton."""
+    global _roadmap_service
+    if _roadmap_service is None:
+        with _roadmap_service_lock:
+            if _roadmap_service is None:
+                _roadmap_service = RoadmapService()
+    return _roadmap_service
+
+
 def generate_roadmap(user_profile: str, **kwargs) -> Dict[str, Any]:
     """Convenience function for roadmap generation."""
-    service = RoadmapService()
+    service = get_roadmap_service()
     return service.generate_roadmap(user_profile, **kwargs)
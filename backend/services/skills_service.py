@@ -9,9 +9,11 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from typing import Dict, Any, List
+import threading
+from typing import Dict, Any, List, Optional
 from services.llm_service import LLMService, get_llm_service
 from prompts.system_prompts import CAREERFORGE_SYSTEM_PROMPT
+from api.schemas.payloads import SkillsAnalysisPayload, TrendingSkillsPayload
 
 
 class SkillsService:
@@ -45,7 +47,8 @@ Return JSON with: profile_summary, recommended_skills (list), learning_path"""
             prompt=prompt,
             system_prompt=CAREERFORGE_SYSTEM_PROMPT,
             temperature=0.6,
-            expect_json=True
+            expect_json=True,
+            schema=SkillsAnalysisPayload
         )
         
         if not response.success:
@@ -53,7 +56,7 @@ Return JSON with: profile_summary, recommended_skills (list), learning_path"""
         
         return {
             "success": True,
-            "data": response.parsed_json,
+            "data": response.parsed,
             "meta": {"model": response.model, "latency_ms": response.latency_ms}
         }
     
@@ -67,7 +70,8 @@ Return JSON with: trending_skills (list with skill, trend, demand_level)"""
             prompt=prompt,
             system_prompt=CAREERFORGE_SYSTEM_PROMPT,
             temperature=0.5,
-            expect_json=True
+            expect_json=True,
+            schema=TrendingSkillsPayload
         )
         
         if not response.success:
@@ -75,6 +79,21 @@ Return JSON with: trending_skills (list with skill, trend, demand_level)"""
         
         return {
             "success": True,
-            "data": response.parsed_json,
+            "data": response.parsed,
             "meta": {"model": response.model, "latency_ms": response.latency_ms}
         }
+
+
+# Singleton instance
+_skills_service: Optional[SkillsService] = None
+_skills_service_lock = threading.Lock()
+
+
+def get_skills_service() -> SkillsService:
+    """Get or create the skills service singleton."""
+    global _skills_service
+    if _skills_service is None:
+        with _skills_service_lock:
+            if _skills_service is None:
+                _skills_service = SkillsService()
+    return _skills_service
@@ -0,0 +1,578 @@
+"""
+CareerForge AI - Durable Task Queue
+Background jobs handed from the API processes to worker processes.
+
+The API enqueues a task and reads its status, partial results and result
+back; workers (worker.py) claim tasks, report progress and acknowledge
+them when done. A claim is a lease: the worker renews it with heartbeats,
+and a task whose lease runs out (the worker crashed or hung) goes back
+to the queue for another worker, up to `max_attempts` starts.
+
+Two stores share one interface: SQLite (WAL) for API and workers on one
+host, and Redis (or a compatible server) across hosts.
+"""
+
+import os
+import secrets
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.serialization import dumps
+
+STATUSES = ("queued", "running", "succeeded", "failed", "cancelled")
+FINISHED = ("succeeded", "failed", "cancelled")
+
+CANCELLED_ERROR = "Job cancelled"
+
+
+def _lost_error(attempts: int) -> str:
+    return f"Worker stopped responding while running this task ({attempts} attempts)"
+
+
+def _loads(value) -> Any:
+    return orjson.loads(value) if value is not None else None
+
+
+class SQLiteTaskQueue:
+    """Tasks in a SQLite file (WAL), shared by processes on one host."""
+
+    def __init__(self, path: str, lease: float, max_attempts: int, ttl: float):
+        """
+        Initialize the queue.
+
+        Args:
+            path: SQLite database file
+            lease: Seconds a claim lasts without a heartbeat
+            max_attempts: Starts allowed before a task that keeps losing
+                its worker is failed
+            ttl: Seconds finished tasks are kept
+        """
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.ttl = ttl
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=10, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                params BLOB NOT NULL,
+                owner TEXT NOT NULL,
+                status TEXT NOT NULL,
+                created REAL NOT NULL,
+                started REAL,
+                finished REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                lease_until REAL,
+                cancel INTEGER NOT NULL DEFAULT 0,
+                result BLOB,
+                error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, created);
+            CREATE INDEX IF NOT EXISTS tasks_owner ON tasks (owner, status);
+            CREATE TABLE IF NOT EXISTS task_partials (
+                task_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (task_id, seq)
+            );
+            CREATE TABLE IF NOT EXISTS task_workers (
+                worker TEXT PRIMARY KEY,
+                seen REAL NOT NULL
+            );
+        """)
+        self._lock = threading.Lock()
+
+    def _write(self, fn, *args):
+        """Run fn(now, *args) in one IMMEDIATE transaction."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                value = fn(time.time(), *args)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return value
+
+    def _finish(self, now: float, task_id: str, status: str, error: str = None, result: bytes = None) -> None:
+        self._conn.execute(
+            "UPDATE tasks SET status = ?, error = ?, result = ?, finished = ?, lease_until = NULL "
+            "WHERE id = ?",
+            (status, error, result, now, task_id)
+        )
+
+    # ---- API side ----
+
+    def enqueue(self, kind: str, params: Dict[str, Any], owner: str) -> str:
+        """Add a task; returns its id."""
+        task_id = secrets.token_urlsafe(16)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO tasks (id, kind, params, owner, status, created) VALUES (?, ?, ?, ?, 'queued', ?)",
+                (task_id, kind, dumps(params), owner, time.time())
+            )
+        return task_id
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """A task's status, partial results and result or error (None if unknown)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT kind, status, created, started, finished, attempts, result, error "
+                "FROM tasks WHERE id = ?",
+                (task_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            partial = self._conn.execute(
+                "SELECT data FROM task_partials WHERE task_id = ? ORDER BY seq", (task_id,)
+            ).fetchall()
+        kind, status, created, started, finished, attempts, result, error = row
+        return {
+            "job_id": task_id,
+            "kind": kind,
+            "status": status,
+            "created_at": created,
+            "started_at": started,
+            "finished_at": finished,
+            "attempts": attempts,
+            "partial": [orjson.loads(data) for (data,) in partial],
+            "result": _loads(result),
+            "error": error,
+        }
+
+    def cancel(self, task_id: str) -> Optional[str]:
+        """
+        Cancel a task. Queued tasks stop at once; running ones are flagged
+        and stopped by their worker at its next heartbeat.
+
+        Returns:
+            The task's status, or None if unknown
+        """
+        def cancel(now):
+            row = self._conn.execute("SELECT status FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if row is None:
+                return None
+            if row[0] == "queued":
+                self._finish(now, task_id, "cancelled", CANCELLED_ERROR)
+                return "cancelled"
+            if row[0] == "running":
+                self._conn.execute("UPDATE tasks SET cancel = 1 WHERE id = ?", (task_id,))
+            return row[0]
+        return self._write(cancel)
+
+    def unfinished(self, owner: str) -> int:
+        """Queued or running tasks of one owner."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM tasks WHERE owner = ? AND status IN ('queued', 'running')",
+                (owner,)
+            ).fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Task counts by status, live workers and the oldest queued task's age."""
+        now = time.time()
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+            oldest = self._conn.execute("SELECT MIN(created) FROM tasks WHERE status = 'queued'").fetchone()[0]
+            workers = self._conn.execute(
+                "SELECT COUNT(*) FROM task_workers WHERE seen >= ?", (now - self.lease,)
+            ).fetchone()[0]
+        stats = {status: counts.get(status, 0) for status in STATUSES}
+        stats["workers"] = workers
+        stats["oldest_queued_seconds"] = round(now - oldest, 1) if oldest else 0.0
+        return stats
+
+    def purge(self) -> None:
+        """Drop finished tasks older than the TTL and long-gone workers."""
+        def purge(now):
+            cutoff = now - self.ttl
+            self._conn.execute(
+                "DELETE FROM task_partials WHERE task_id IN "
+                "(SELECT id FROM tasks WHERE finished IS NOT NULL AND finished < ?)",
+                (cutoff,)
+            )
+            self._conn.execute("DELETE FROM tasks WHERE finished IS NOT NULL AND finished < ?", (cutoff,))
+            self._conn.execute("DELETE FROM task_workers WHERE seen < ?", (cutoff,))
+        self._write(purge)
+
+    # ---- Worker side ----
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """
+        Lease the oldest queued task to `worker`.
+
+        Tasks whose lease ran out are requeued first (or failed once they
+        have used up their attempts).
+
+        Returns:
+            {"id", "kind", "params", "attempts"} or None if the queue is empty
+        """
+        def claim(now):
+            expired = self._conn.execute(
+                "SELECT id, attempts, cancel FROM tasks WHERE status = 'running' AND lease_until < ?",
+                (now,)
+            ).fetchall()
+            for task_id, attempts, cancel in expired:
+                if cancel:
+                    self._finish(now, task_id, "cancelled", CANCELLED_ERROR)
+                elif attempts >= self.max_attempts:
+                    self._finish(now, task_id, "failed", _lost_error(attempts))
+                else:
+                    self._conn.execute(
+                        "UPDATE tasks SET status = 'queued', worker = NULL, lease_until = NULL WHERE id = ?",
+                        (task_id,)
+                    )
+            if expired:
+                print(f"[TaskQueue] Recovered {len(expired)} task(s) from unresponsive workers")
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO task_workers (worker, seen) VALUES (?, ?)", (worker, now)
+            )
+            row = self._conn.execute(
+                "SELECT id, kind, params, attempts FROM tasks WHERE status = 'queued' ORDER BY created LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            task_id, kind, params, attempts = row
+            self._conn.execute(
+                "UPDATE tasks SET status = 'running', worker = ?, started = ?, lease_until = ?, "
+                "attempts = attempts + 1 WHERE id = ?",
+                (worker, now, now + self.lease, task_id)
+            )
+            return {"id": task_id, "kind": kind, "params": orjson.loads(params), "attempts": attempts + 1}
+        return self._write(claim)
+
+    def heartbeat(self, worker: str, task_ids: List[str]) -> List[str]:
+        """
+        Renew `worker`'s leases on `task_ids`.
+
+        Returns:
+            Ids among them whose cancellation was requested
+        """
+        def heartbeat(now):
+            self._conn.execute(
+                "INSERT OR REPLACE INTO task_workers (worker, seen) VALUES (?, ?)", (worker, now)
+            )
+            cancelled = []
+            for task_id in task_ids:
+                self._conn.execute(
+                    "UPDATE tasks SET lease_until = ? WHERE id = ? AND worker = ? AND status = 'running'",
+                    (now + self.lease, task_id, worker)
+                )
+                row = self._conn.execute("SELECT cancel FROM tasks WHERE id = ?", (task_id,)).fetchone()
+                if row and row[0]:
+                    cancelled.append(task_id)
+            return cancelled
+        return self._write(heartbeat)
+
+    def add_partial(self, task_id: str, item: Any) -> None:
+        """Append a partial result."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO task_partials (task_id, seq, data) VALUES "
+                "(?, (SELECT COUNT(*) FROM task_partials WHERE task_id = ?), ?)",
+                (task_id, task_id, dumps(item))
+            )
+
+    def complete(self, task_id: str, worker: str, result: Any) -> bool:
+        """
+        Acknowledge a task with its result.
+
+        Returns:
+            False if `worker` no longer holds the task (its lease ran out
+            and the task was handed on); the result is then dropped
+        """
+        return self._settle(task_id, worker, "succeeded", None, dumps(result))
+
+    def fail(self, task_id: str, worker: str, error: str, status: str = "failed") -> bool:
+        """Acknowledge a task as failed (or "cancelled"); same contract as complete."""
+        return self._settle(task_id, worker, status, error, None)
+
+    def _settle(self, task_id: str, worker: str, status: str, error: Optional[str], result: Optional[bytes]) -> bool:
+        def settle(now):
+            row = self._conn.execute(
+                "SELECT 1 FROM tasks WHERE id = ? AND worker = ? AND status = 'running'", (task_id, worker)
+            ).fetchone()
+            if row is None:
+                return False
+            self._finish(now, task_id, status, error, result)
+            return True
+        return self._write(settle)
+
+
+# ============================================================
+# Redis store
+# ============================================================
+
+# Shared Lua: finish(prefix, id, status, error, result, now, ttl)
+_REDIS_FINISH = """
+local function finish(prefix, id, status, error, result, now, ttl)
+    local key = prefix .. 'task:' .. id
+    redis.call('HSET', key, 'status', status, 'finished', now)
+    if error then redis.call('HSET', key, 'error', error) end
+    if result then redis.call('HSET', key, 'result', result) end
+    redis.call('ZREM', prefix .. 'leases', id)
+    redis.call('SREM', prefix .. 'owner:' .. redis.call('HGET', key, 'owner'), id)
+    redis.call('ZADD', prefix .. 'done:' .. status, now, id)
+    redis.call('EXPIRE', key, ttl)
+    redis.call('EXPIRE', prefix .. 'partial:' .. id, ttl)
+end
+"""
+
+# ARGV: prefix, worker, now, lease, max_attempts, ttl, lost_error, cancelled_error
+_REDIS_CLAIM = _REDIS_FINISH + """
+local prefix, worker = ARGV[1], ARGV[2]
+local now, lease, max_attempts, ttl = tonumber(ARGV[3]), tonumber(ARGV[4]), tonumber(ARGV[5]), tonumber(ARGV[6])
+local queued = prefix .. 'queued'
+
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', prefix .. 'leases', '-inf', now)) do
+    local key = prefix .. 'task:' .. id
+    local task = redis.call('HMGET', key, 'attempts', 'cancel')
+    if task[2] == '1' then
+        finish(prefix, id, 'cancelled', ARGV[8], false, now, ttl)
+    elseif tonumber(task[1]) >= max_attempts then
+        finish(prefix, id, 'failed', string.gsub(ARGV[7], '{attempts}', task[1]), false, now, ttl)
+    else
+        redis.call('ZREM', prefix .. 'leases', id)
+        redis.call('HSET', key, 'status', 'queued')
+        redis.call('HDEL', key, 'worker')
+        -- Back to the head of the queue (claims pop from the right)
+        redis.call('RPUSH', queued, id)
+    end
+end
+
+redis.call('ZADD', prefix .. 'workers', now, worker)
+while true do
+    local id = redis.call('RPOP', queued)
+    if not id then return false end
+    local key = prefix .. 'task:' .. id
+    if redis.call('HGET', key, 'status') == 'queued' then
+        local attempts = redis.call('HINCRBY', key, 'attempts', 1)
+        redis.call('HSET', key, 'status', 'running', 'worker', worker, 'started', now)
+        redis.call('ZADD', prefix .. 'leases', now + lease, id)
+        local task = redis.call('HMGET', key, 'kind', 'params')
+        return {id, task[1], task[2], attempts}
+    end
+end
+"""
+
+# ARGV: prefix, worker, now, lease, id...
+_REDIS_HEARTBEAT = """
+local prefix, worker = ARGV[1], ARGV[2]
+local now, lease = tonumber(ARGV[3]), tonumber(ARGV[4])
+redis.call('ZADD', prefix .. 'workers', now, worker)
+local cancelled = {}
+for i = 5, #ARGV do
+    local id = ARGV[i]
+    local task = redis.call('HMGET', prefix .. 'task:' .. id, 'status', 'worker', 'cancel')
+    if task[1] == 'running' and task[2] == worker then
+        redis.call('ZADD', prefix .. 'leases', now + lease, id)
+    end
+    if task[3] == '1' then table.insert(cancelled, id) end
+end
+return cancelled
+"""
+
+# ARGV: prefix, id, worker, status, error, result, now, ttl
+_REDIS_SETTLE = _REDIS_FINISH + """
+local prefix, id = ARGV[1], ARGV[2]
+local task = redis.call('HMGET', prefix .. 'task:' .. id, 'status', 'worker')
+if task[1] ~= 'running' or task[2] ~= ARGV[3] then return 0 end
+local error, result = ARGV[5], ARGV[6]
+if error == '' then error = false end
+if result == '' then result = false end
+finish(prefix, id, ARGV[4], error, result, tonumber(ARGV[7]), tonumber(ARGV[8]))
+return 1
+"""
+
+# ARGV: prefix, id, now, ttl, cancelled_error
+_REDIS_CANCEL = _REDIS_FINISH + """
+local prefix, id = ARGV[1], ARGV[2]
+local key = prefix .. 'task:' .. id
+local status = redis.call('HGET', key, 'status')
+if status == 'queued' then
+    redis.call('LREM', prefix .. 'queued', 0, id)
+    finish(prefix, id, 'cancelled', ARGV[5], false, tonumber(ARGV[3]), tonumber(ARGV[4]))
+    return 'cancelled'
+end
+if status == 'running' then redis.call('HSET', key, 'cancel', '1') end
+return status
+"""
+
+
+class RedisTaskQueue:
+    """Tasks in Redis (or a compatible server), shared across hosts."""
+
+    def __init__(self, url: str, lease: float, max_attempts: int, ttl: float, prefix: str = "careerforge:tasks:"):
+        """
+        Initialize the queue.
+
+        Args:
+            url: redis:// URL
+            lease: Seconds a claim lasts without a heartbeat
+            max_attempts: Starts allowed before a task that keeps losing
+                its worker is failed
+            ttl: Seconds finished tasks are kept
+            prefix: Key prefix
+        """
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("JOBS_QUEUE=redis://... requires the 'redis' package") from e
+
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.ttl = ttl
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._claim = self._client.register_script(_REDIS_CLAIM)
+        self._heartbeat = self._client.register_script(_REDIS_HEARTBEAT)
+        self._settle = self._client.register_script(_REDIS_SETTLE)
+        self._cancel = self._client.register_script(_REDIS_CANCEL)
+
+    def _key(self, *parts: str) -> str:
+        return self.prefix + ":".join(parts)
+
+    # ---- API side ----
+
+    def enqueue(self, kind: str, params: Dict[str, Any], owner: str) -> str:
+        """Add a task; returns its id."""
+        task_id = secrets.token_urlsafe(16)
+        pipe = self._client.pipeline()
+        pipe.hset(self._key("task", task_id), mapping={
+            "kind": kind,
+            "params": dumps(params),
+            "owner": owner,
+            "status": "queued",
+            "created": time.time(),
+            "attempts": 0,
+        })
+        pipe.sadd(self._key("owner", owner), task_id)
+        pipe.lpush(self._key("queued"), task_id)
+        pipe.execute()
+        return task_id
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """A task's status, partial results and result or error (None if unknown)."""
+        pipe = self._client.pipeline()
+        pipe.hgetall(self._key("task", task_id))
+        pipe.lrange(self._key("partial", task_id), 0, -1)
+        task, partial = pipe.execute()
+        if not task:
+            return None
+
+        def number(field):
+            value = task.get(field)
+            return float(value) if value is not None else None
+
+        error = task.get(b"error")
+        return {
+            "job_id": task_id,
+            "kind": task[b"kind"].decode(),
+            "status": task[b"status"].decode(),
+            "created_at": number(b"created"),
+            "started_at": number(b"started"),
+            "finished_at": number(b"finished"),
+            "attempts": int(task[b"attempts"]),
+            "partial": [orjson.loads(data) for data in partial],
+            "result": _loads(task.get(b"result")),
+            "error": error.decode() if error is not None else None,
+        }
+
+    def cancel(self, task_id: str) -> Optional[str]:
+        """Same contract as SQLiteTaskQueue.cancel."""
+        status = self._cancel(args=[self.prefix, task_id, time.time(), int(self.ttl), CANCELLED_ERROR])
+        return status.decode() if status else None
+
+    def unfinished(self, owner: str) -> int:
+        """Queued or running tasks of one owner."""
+        return self._client.scard(self._key("owner", owner))
+
+    def stats(self) -> Dict[str, Any]:
+        """Same contract as SQLiteTaskQueue.stats."""
+        now = time.time()
+        pipe = self._client.pipeline()
+        pipe.llen(self._key("queued"))
+        pipe.zcard(self._key("leases"))
+        for status in FINISHED:
+            pipe.zcard(self._key("done", status))
+        pipe.zcount(self._key("workers"), now - self.lease, "+inf")
+        pipe.lindex(self._key("queued"), -1)
+        *counts, workers, oldest_id = pipe.execute()
+
+        stats = dict(zip(STATUSES, counts))
+        stats["workers"] = workers
+        oldest = self._client.hget(self._key("task", oldest_id.decode()), "created") if oldest_id else None
+        stats["oldest_queued_seconds"] = round(now - float(oldest), 1) if oldest else 0.0
+        return stats
+
+    def purge(self) -> None:
+        """Drop index entries of expired tasks and long-gone workers (task keys expire on their own)."""
+        cutoff = time.time() - self.ttl
+        pipe = self._client.pipeline()
+        for status in FINISHED:
+            pipe.zremrangebyscore(self._key("done", status), "-inf", cutoff)
+        pipe.zremrangebyscore(self._key("workers"), "-inf", cutoff)
+        pipe.execute()
+
+    # ---- Worker side ----
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """Same contract as SQLiteTaskQueue.claim."""
+        task = self._claim(args=[
+            self.prefix, worker, time.time(), self.lease, self.max_attempts, int(self.ttl),
+            _lost_error("{attempts}"), CANCELLED_ERROR
+        ])
+        if not task:
+            return None
+        task_id, kind, params, attempts = task
+        return {"id": task_id.decode(), "kind": kind.decode(), "params": orjson.loads(params), "attempts": attempts}
+
+    def heartbeat(self, worker: str, task_ids: List[str]) -> List[str]:
+        """Same contract as SQLiteTaskQueue.heartbeat."""
+        cancelled = self._heartbeat(args=[self.prefix, worker, time.time(), self.lease, *task_ids])
+        return [task_id.decode() for task_id in cancelled]
+
+    def add_partial(self, task_id: str, item: Any) -> None:
+        """Append a partial result."""
+        self._client.rpush(self._key("partial", task_id), dumps(item))
+
+    def complete(self, task_id: str, worker: str, result: Any) -> bool:
+        """Same contract as SQLiteTaskQueue.complete."""
+        return bool(self._settle(args=[
+            self.prefix, task_id, worker, "succeeded", "", dumps(result), time.time(), int(self.ttl)
+        ]))
+
+    def fail(self, task_id: str, worker: str, error: str, status: str = "failed") -> bool:
+        """Same contract as SQLiteTaskQueue.fail."""
+        return bool(self._settle(args=[
+            self.prefix, task_id, worker, status, error or "", "", time.time(), int(self.ttl)
+        ]))
+
+
+def create_task_queue(url: str, lease: float, max_attempts: int, ttl: float):
+    """
+    Build a task queue from a JOBS_QUEUE value.
+
+    "sqlite:///path/to/file.db" or "redis://host:port/db".
+    """
+    if url.startswith("sqlite:///"):
+        return SQLiteTaskQueue(url[len("sqlite:///"):], lease, max_attempts, ttl)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisTaskQueue(url, lease, max_attempts, ttl)
+    raise ValueError(f"Unknown job queue: {url}")
@@ -0,0 +1,214 @@
+"""
+CareerForge AI - Curated Video Catalogue
+Vetted full-course videos shipped as a data file, with an in-memory
+inverted index over titles and tags. Common step queries are answered
+from it without touching YouTube; only long-tail queries are scraped.
+
+Rebuild the catalogue from the scrape cache:
+    python -m services.video_catalog --build [--min-queries 2]
+"""
+
+import json
+import math
+import os
+import sys
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import youtube_config
+from services.youtube_cache import normalize_query
+
+# Tag matches rank above title-only matches
+_TAG_WEIGHT = 2.0
+_TITLE_WEIGHT = 1.0
+
+
+def _terms(text: str) -> List[str]:
+    """Index terms for a title, tag or query (same filler rules as the cache key)."""
+    return normalize_query(text).split()
+
+
+class VideoCatalog:
+    """
+    Inverted index from terms to catalogue videos.
+
+    A query is answered only if some video covers at least
+    `min_coverage` of the query's IDF-weighted terms, so generic words
+    don't pull in unrelated videos and unfamiliar topics fall through
+    to the scraper.
+    """
+
+    def __init__(self, videos: List[Dict[str, Any]], min_coverage: float = 0.6):
+        self.videos = videos
+        self.min_coverage = min_coverage
+
+        postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        for index, video in enumerate(videos):
+            for term in _terms(video.get("title", "")):
+                postings[term][index] = max(postings[term].get(index, 0.0), _TITLE_WEIGHT)
+            for tag in video.get("tags", []):
+                for term in _terms(tag):
+                    postings[term][index] = _TAG_WEIGHT
+        self.postings = dict(postings)
+
+        count = max(len(videos), 1)
+        self.idf = {term: math.log(1 + count / len(docs)) for term, docs in self.postings.items()}
+        # Terms the catalogue has never seen weigh as much as the rarest known term
+        self.unknown_idf = math.log(1 + count)
+
+    @classmethod
+    def load(cls, path: str, min_coverage: float = 0.6) -> "VideoCatalog":
+        """Load a catalogue from its JSON data file."""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f).get("videos", []), min_coverage)
+
+    def search(self, query: str, max_results: int = 3) -> List[Dict[str, Any]]:
+        """
+        Find catalogue videos for a search query.
+
+        Args:
+            query: Search query (e.g. a roadmap step name)
+            max_results: Max videos to return
+
+        Returns:
+            Videos in the same shape as scraped results; empty if no
+            video covers enough of the query
+        """
+        terms = set(_terms(query))
+        if not terms:
+            return []
+
+        total = sum(self.idf.get(term, self.unknown_idf) for term in terms)
+        coverage: Dict[int, float] = defaultdict(float)
+        rank: Dict[int, float] = defaultdict(float)
+
+        for term in terms:
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = self.idf[term]
+            for index, weight in docs.items():
+                coverage[index] += idf
+                rank[index] += idf * weight
+
+        threshold = self.min_coverage * total
+        matches = [index for index, covered in coverage.items() if covered >= threshold]
+        matches.sort(key=lambda index: (-coverage[index], -rank[index], index))
+
+        return [self._result(self.videos[index]) for index in matches[:max_results]]
+
+    @staticmethod
+    def _result(video: Dict[str, Any]) -> Dict[str, Any]:
+        video_id = video["video_id"]
+        return {
+            "video_id": video_id,
+            "title": video["title"],
+            "thumbnail": f"https://i.ytimg.com/vi/{video_id}/mqdefault.jpg",
+            "channel": video.get("channel", ""),
+            "url": f"https://www.youtube.com/watch?v={video_id}",
+            "duration": video.get("duration"),
+            "views": video.get("views"),
+        }
+
+
+# Singleton instance
+_catalog: Optional[VideoCatalog] = None
+_catalog_failed = False
+_catalog_lock = threading.Lock()
+
+
+def get_video_catalog() -> Optional[VideoCatalog]:
+    """
+    Get or load the video catalogue singleton (None if unavailable).
+
+    A failed load is remembered, so a missing or broken data file is
+    reported once rather than re-read on every video lookup.
+    """
+    global _catalog, _catalog_failed
+    if _catalog is None and not _catalog_failed and youtube_config.catalog_enabled:
+        with _catalog_lock:
+            if _catalog is None and not _catalog_failed:
+                try:
+                    _catalog = VideoCatalog.load(youtube_config.catalog_path, youtube_config.catalog_min_coverage)
+                    print(f"[VideoCatalog] Loaded {len(_catalog.videos)} videos")
+                except (OSError, ValueError) as e:
+                    _catalog_failed = True
+                    print(f"[VideoCatalog] Could not load {youtube_config.catalog_path}: {e}")
+    return _catalog
+
+
+def build_catalog(path: str = None, min_queries: int = 2) -> int:
+    """
+    Merge videos from the scrape cache into the catalogue file.
+
+    A cached video is promoted once it has been returned for at least
+    `min_queries` distinct normalized queries; those queries become its
+    tags. Existing entries keep their tags and gain any new ones.
+
+    Returns:
+        Number of videos added
+    """
+    from services.youtube_cache import get_youtube_cache
+
+    path = path or youtube_config.catalog_path
+    try:
+        with open(path, encoding="utf-8") as f:
+            catalog = json.load(f)
+    except FileNotFoundError:
+        catalog = {"version": 1, "videos": []}
+
+    seen: Dict[str, Dict[str, Any]] = {}
+    queries: Dict[str, set] = defaultdict(set)
+    for key, videos, _ in get_youtube_cache().entries():
+        for video in videos:
+            seen.setdefault(video["video_id"], video)
+            queries[video["video_id"]].add(key)
+
+    by_id = {video["video_id"]: video for video in catalog.get("videos", [])}
+    added = 0
+
+    for video_id, keys in queries.items():
+        entry = by_id.get(video_id)
+        if entry is not None:
+            entry["tags"] = entry.get("tags", []) + sorted(keys - set(entry.get("tags", [])))
+            continue
+        if len(keys) < min_queries:
+            continue
+
+        video = seen[video_id]
+        entry = {
+            "video_id": video_id,
+            "title": video["title"],
+            "channel": video.get("channel", ""),
+            "tags": sorted(keys),
+        }
+        for field in ("duration", "views"):
+            if video.get(field) is not None:
+                entry[field] = video[field]
+        catalog.setdefault("videos", []).append(entry)
+        by_id[video_id] = entry
+        added += 1
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(catalog, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+    return added
+
+
+if __name__ == "__main__":
+    if "--build" in sys.argv:
+        min_queries = 2
+        if "--min-queries" in sys.argv:
+            min_queries = int(sys.argv[sys.argv.index("--min-queries") + 1])
+        count = build_catalog(min_queries=min_queries)
+        print(f"[VideoCatalog] Added {count} videos")
+    else:
+        catalog = get_video_catalog()
+        query = " ".join(sys.argv[1:]) or "Month 1: Python Basics"
+        for video in (catalog.search(query) if catalog else []):
+            print(f"{video['video_id']}  {video['title']}")
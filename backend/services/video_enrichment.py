@@ -0,0 +1,366 @@
+"""
+CareerForge AI - Deadline-Bounded Video Enrichment
+Attaches YouTube videos to roadmap steps without letting the slowest
+scrape hold up the roadmap response.
+
+Every step's lookup starts at once; the response waits only until the
+enrichment deadline. Steps still pending keep loading in the background
+and can be collected later with the returned enrichment token, from any
+API worker sharing the cache store.
+
+Bulk requests share one VideoLookupBatch across their roadmaps, so a
+query that many roadmaps have in common is fetched once.
+"""
+
+import asyncio
+import os
+import secrets
+import sys
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set
+
+import orjson
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import youtube_config
+from services.cache import get_cache_store
+from services.youtube_cache import normalize_query
+from services.youtube_service import get_curated_videos_async
+from utils.request_context import current_request
+from utils.serialization import dumps
+
+# Cache store namespace for tokens shared across API workers
+_NAMESPACE = "enrichment"
+
+
+class _EnrichmentJob:
+    """Background video lookups for the steps that missed the deadline."""
+
+    def __init__(self, tasks: Dict[int, "asyncio.Task"]):
+        self.tasks = tasks
+        self.created = time.monotonic()
+
+    def finished(self) -> List[Dict[str, Any]]:
+        return [
+            {"step_index": index, "video_results": _videos(task)}
+            for index, task in sorted(self.tasks.items())
+            if task.done()
+        ]
+
+    def pending(self) -> List[int]:
+        return sorted(index for index, task in self.tasks.items() if not task.done())
+
+    def cancel(self) -> None:
+        for task in self.tasks.values():
+            task.cancel()
+
+
+def _videos(task: "asyncio.Task") -> list:
+    """Result of a finished lookup task (empty on error or cancellation)."""
+    if task.cancelled() or task.exception() is not None:
+        return []
+    return task.result()
+
+
+async def _lookup(query: str) -> list:
+    try:
+        return await get_curated_videos_async(query)
+    except Exception as e:
+        print(f"[VideoEnrichment] YouTube fetch error: {e}")
+        return []
+
+
+class VideoLookupBatch:
+    """
+    Video lookups shared by the roadmaps of one bulk request.
+
+    Each distinct query (after normalization) is fetched once, with at
+    most `concurrency` fetches in flight; every step asking for it
+    awaits the same lookup.
+    """
+
+    def __init__(self, concurrency: int):
+        self._slots = asyncio.Semaphore(concurrency)
+        self._lookups: Dict[str, "asyncio.Task"] = {}
+
+    async def lookup(self, query: str) -> list:
+        """Videos for a query, joining an identical lookup if one exists."""
+        key = normalize_query(query)
+        task = self._lookups.get(key)
+        if task is None:
+            task = self._lookups[key] = asyncio.ensure_future(self._fetch(query))
+        # Shielded: a step giving up (deadline, token expiry) must not
+        # cancel the lookup for the other steps sharing it
+        return await asyncio.shield(task)
+
+    async def _fetch(self, query: str) -> list:
+        async with self._slots:
+            return await _lookup(query)
+
+    @property
+    def distinct(self) -> int:
+        """Distinct queries looked up so far."""
+        return len(self._lookups)
+
+    def cancel(self) -> None:
+        """Cancel lookups that have not finished (the request was abandoned)."""
+        for task in self._lookups.values():
+            task.cancel()
+
+
+class VideoEnricher:
+    """
+    Runs per-step video lookups against a deadline.
+
+    Must be used from a single event loop (the app's); background
+    lookups are plain asyncio tasks on that loop.
+
+    Tokens are also published to the shared cache store (CACHE_STORE):
+    the token itself, then each step's videos as its lookup finishes. A
+    poll that reaches another API worker than the one running the
+    lookups is answered from the store.
+    """
+
+    # Seconds between store reads while waiting on another worker's lookups
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, deadline: float, ttl: float, max_jobs: int = 1000, store=None):
+        """
+        Initialize the enricher.
+
+        Args:
+            deadline: Seconds a roadmap response waits for videos
+            ttl: Seconds a token stays valid; unfinished lookups are then cancelled
+            max_jobs: Max outstanding tokens (oldest are dropped first)
+            store: Shared cache store for tokens (default: get_cache_store())
+        """
+        self.deadline = deadline
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+        self._store = store
+        self._jobs: Dict[str, _EnrichmentJob] = {}
+        self._writes: Set["asyncio.Task"] = set()
+
+    async def enrich(
+        self,
+        steps: List[Dict[str, Any]],
+        query_for: Callable[[Dict[str, Any]], Optional[str]],
+        lookup: Optional[Callable[[str], Awaitable[list]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Set `video_results` on each step, waiting at most `deadline` seconds
+        (less if the request's own deadline is closer).
+
+        Steps whose lookup has not finished get an empty list for now.
+
+        Args:
+            steps: Roadmap steps (modified in place)
+            query_for: Builds a step's search query; None skips the step
+            lookup: Fetches a query's videos (default: the YouTube
+                service directly; bulk requests pass VideoLookupBatch.lookup)
+
+        Returns:
+            {"token": str or None, "pending_steps": [step indices]}
+        """
+        lookup = lookup or _lookup
+        tasks: Dict[int, asyncio.Task] = {}
+        for index, step in enumerate(steps):
+            query = query_for(step)
+            if query:
+                tasks[index] = asyncio.ensure_future(lookup(query))
+            else:
+                step["video_results"] = []
+
+        if tasks:
+            await asyncio.wait(tasks.values(), timeout=current_request().timeout(self.deadline))
+
+        pending = {}
+        for index, task in tasks.items():
+            if task.done():
+                steps[index]["video_results"] = _videos(task)
+            else:
+                steps[index]["video_results"] = []
+                pending[index] = task
+
+        if not pending:
+            return {"token": None, "pending_steps": []}
+
+        token = self._register(_EnrichmentJob(pending))
+        # Shared before the token is handed out, so the first poll can
+        # land on any worker
+        await asyncio.to_thread(self._write, token, dumps({"steps": sorted(pending)}))
+        return {"token": token, "pending_steps": sorted(pending)}
+
+    async def status(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Videos for a token's steps that have finished so far.
+
+        Returns:
+            {"token", "complete", "steps", "pending_steps"} or None if
+            the token is unknown or expired
+        """
+        job = self._get(token)
+        if job is None:
+            return await self._shared_status(token)
+
+        pending = job.pending()
+        return {
+            "token": token,
+            "complete": not pending,
+            "steps": job.finished(),
+            "pending_steps": pending,
+        }
+
+    async def wait(self, token: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """Like status, but first waits up to `timeout` seconds for pending steps."""
+        job = self._get(token)
+        if job is None:
+            return await self._wait_shared(token, timeout)
+
+        pending = [task for task in job.tasks.values() if not task.done()]
+        if pending and timeout > 0:
+            await asyncio.wait(pending, timeout=timeout)
+        return await self.status(token)
+
+    async def stream(self, token: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield a "step" event per step as its videos arrive, then "done".
+
+        Steps that had already finished are sent first.
+        """
+        job = self._get(token)
+        if job is None:
+            async for event in self._stream_shared(token):
+                yield event
+            return
+
+        for step in job.finished():
+            yield {"type": "step", **step}
+
+        waiting = {task: index for index, task in job.tasks.items() if not task.done()}
+        while waiting:
+            done, _ = await asyncio.wait(waiting.keys(), return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=waiting.get):
+                yield {"type": "step", "step_index": waiting.pop(task), "video_results": _videos(task)}
+
+        yield {"type": "done", "token": token}
+
+    # -- tokens owned by this worker --
+
+    def _register(self, job: _EnrichmentJob) -> str:
+        self._expire()
+        while len(self._jobs) >= self.max_jobs:
+            oldest = next(iter(self._jobs))
+            self._jobs.pop(oldest).cancel()
+
+        token = secrets.token_urlsafe(16)
+        self._jobs[token] = job
+        # Lookups are cancelled at the TTL even if no later request comes
+        asyncio.get_running_loop().call_later(self.ttl, self._expire)
+
+        for index, task in job.tasks.items():
+            task.add_done_callback(lambda task, index=index: self._publish_step(token, index, task))
+        return token
+
+    def _get(self, token: str) -> Optional[_EnrichmentJob]:
+        self._expire()
+        return self._jobs.get(token)
+
+    def _expire(self) -> None:
+        """Drop tokens older than the TTL, cancelling their lookups."""
+        now = time.monotonic()
+        # Jobs are stored in creation order
+        while self._jobs:
+            token, job = next(iter(self._jobs.items()))
+            if now - job.created < self.ttl:
+                break
+            del self._jobs[token]
+            job.cancel()
+
+    # -- shared store --
+
+    def _shared_store(self):
+        if self._store is None:
+            self._store = get_cache_store()
+        return self._store
+
+    def _publish_step(self, token: str, index: int, task: "asyncio.Task") -> None:
+        """Share a finished step's videos, off the event loop."""
+        if task.cancelled():
+            return
+        value = dumps(_videos(task))
+        write = asyncio.ensure_future(asyncio.to_thread(self._write, f"{token}:{index}", value))
+        # Held until done so the write is not garbage-collected mid-flight
+        self._writes.add(write)
+        write.add_done_callback(self._writes.discard)
+
+    def _write(self, key: str, value: bytes) -> None:
+        try:
+            self._shared_store().set(_NAMESPACE, key, value, self.ttl)
+        except Exception as e:
+            print(f"[VideoEnrichment] Could not share enrichment token: {e}")
+
+    def _read(self, token: str) -> Optional[Dict[str, Any]]:
+        """A token's status from the store (blocking), or None if unknown or expired."""
+        try:
+            store = self._shared_store()
+            record = store.get(_NAMESPACE, token)
+            if record is None:
+                return None
+            steps, pending = [], []
+            for index in orjson.loads(record[0])["steps"]:
+                found = store.get(_NAMESPACE, f"{token}:{index}")
+                if found is None:
+                    pending.append(index)
+                else:
+                    steps.append({"step_index": index, "video_results": orjson.loads(found[0])})
+        except Exception as e:
+            print(f"[VideoEnrichment] Shared token lookup failed: {e}")
+            return None
+
+        return {"token": token, "complete": not pending, "steps": steps, "pending_steps": pending}
+
+    async def _shared_status(self, token: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._read, token)
+
+    async def _wait_shared(self, token: str, timeout: float) -> Optional[Dict[str, Any]]:
+        deadline = time.monotonic() + timeout
+        status = await self._shared_status(token)
+        while status is not None and not status["complete"] and time.monotonic() < deadline:
+            await asyncio.sleep(min(self.POLL_INTERVAL, max(deadline - time.monotonic(), 0)))
+            status = await self._shared_status(token)
+        return status
+
+    async def _stream_shared(self, token: str) -> AsyncIterator[Dict[str, Any]]:
+        """Poll the store, yielding steps as another worker publishes them."""
+        sent: Set[int] = set()
+        status = await self._shared_status(token)
+        while status is not None:
+            for step in status["steps"]:
+                if step["step_index"] not in sent:
+                    sent.add(step["step_index"])
+                    yield {"type": "step", **step}
+            if status["complete"]:
+                break
+            await asyncio.sleep(self.POLL_INTERVAL)
+            status = await self._shared_status(token)
+
+        # Either complete, or the token expired with lookups unfinished
+        yield {"type": "done", "token": token}
+
+
+# Singleton instance
+_enricher: Optional[VideoEnricher] = None
+
+
+def get_video_enricher() -> VideoEnricher:
+    """Get or create the video enricher singleton."""
+    global _enricher
+    if _enricher is None:
+        _enricher = VideoEnricher(
+            deadline=youtube_config.enrichment_deadline,
+            ttl=youtube_config.enrichment_ttl
+        )
+    return _enricher
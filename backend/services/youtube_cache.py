@@ -0,0 +1,122 @@
+"""
+CareerForge AI - YouTube Search Cache
+Two-tier cache for scraped YouTube results: an in-memory LRU in front of
+the shared cache store, keyed by a normalized form of the search query.
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+from typing import Iterator, List, Optional, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import youtube_config
+from services.cache import TieredCache, get_cache_store
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#.]+")
+
+# Words that don't change which course videos are relevant. The scraper
+# already appends "full course tutorial" to every search.
+_FILLER_WORDS = frozenset({
+    "a", "an", "and", "the", "to", "of", "in", "on", "for", "with", "how",
+    "tutorial", "tutorials", "beginner", "beginners", "course", "courses",
+    "full", "complete", "learn", "learning", "guide", "crash", "introduction",
+    "intro", "from", "scratch", "zero", "hero", "step", "month",
+    "week", "part", "easy", "best", "free",
+})
+
+_SEQUENCE_WORDS = frozenset({"step", "month", "week", "part"})
+
+
+def normalize_query(query: str) -> str:
+    """
+    Reduce a search query to a canonical cache key.
+
+    Lowercases, strips filler ("tutorial", "for beginners", "Month 1:")
+    and sorts the remaining tokens, so "Python Basics tutorial for
+    beginners" and "Month 1: python basics" share one entry.
+    """
+    tokens = _TOKEN_RE.findall(query.lower())
+    kept = []
+    previous = ""
+
+    for token in tokens:
+        token = token.strip(".")
+        if not token:
+            continue
+        # Drop the number in "Month 1", "Step 3", ...
+        if token.isdigit() and previous in _SEQUENCE_WORDS:
+            previous = token
+            continue
+        previous = token
+        if token not in _FILLER_WORDS:
+            kept.append(token)
+
+    return " ".join(sorted(set(kept))) or query.strip().lower()
+
+
+class YouTubeCache:
+    """
+    Scraped search results in the shared cache (services.cache).
+
+    Entries older than `ttl` seconds are still returned but flagged as
+    stale, so callers can serve them immediately and refresh in the
+    background.
+    """
+
+    def __init__(self, store, ttl: int, memory_size: int = 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            store: Shared cache store
+            ttl: Seconds before an entry is considered stale
+            memory_size: Max entries held in the in-memory tier
+        """
+        self.ttl = ttl
+        # Entries never expire from the store; staleness is judged here
+        self._cache = TieredCache("youtube", store, memory_size)
+
+    def get(self, key: str) -> Optional[Tuple[List[dict], bool]]:
+        """
+        Look up a normalized query.
+
+        Returns:
+            Tuple of (videos, is_stale) or None on a miss
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        videos, fetched_at = entry
+        return videos, (time.time() - fetched_at) > self.ttl
+
+    def set(self, key: str, videos: List[dict]) -> None:
+        """Store results for a normalized query in both tiers."""
+        self._cache.set(key, videos)
+
+    def entries(self) -> Iterator[Tuple[str, List[dict], float]]:
+        """Iterate over every stored (query_key, videos, fetched_at)."""
+        return self._cache.entries()
+
+
+# Singleton instance
+_cache: Optional[YouTubeCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_youtube_cache() -> YouTubeCache:
+    """Get or create the YouTube cache singleton."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = YouTubeCache(
+                    get_cache_store(),
+                    youtube_config.cache_ttl,
+                    youtube_config.cache_memory_size
+                )
+    return _cache
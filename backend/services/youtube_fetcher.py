@@ -0,0 +1,256 @@
+"""
+CareerForge AI - YouTube Fetcher
+Shared, connection-pooled async HTTP client for YouTube result pages.
+
+All fetches in the process run on one dedicated event loop thread, so a
+single keep-alive (HTTP/2 when available) connection pool, concurrency
+cap and rate limiter apply no matter which thread or loop the caller
+is on.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import youtube_config
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+
+class _TokenBucket:
+    """Async token bucket; only used from the fetcher's own loop."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = float(max(burst, 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    async def take(self) -> None:
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class YouTubeFetcher:
+    """
+    Fetches YouTube search result pages.
+
+    - One shared httpx.AsyncClient with keep-alive (and HTTP/2 if `h2`
+      is installed)
+    - Process-wide cap on concurrent requests
+    - Token-bucket rate limit on request starts
+    - Negative cache: a query that failed is not retried until
+      `negative_ttl` seconds have passed (at most `max_failures` queries
+      are remembered; expired ones are dropped as new failures arrive)
+    - Streaming reads (fetch_until) that stop downloading as soon as
+      the caller has what it needs
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        max_concurrency: int = 4,
+        rate_per_sec: float = 2.0,
+        burst: int = 4,
+        timeout: float = 5.0,
+        negative_ttl: float = 300.0,
+        max_failures: int = 1024
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst
+        self.timeout = timeout
+        self.negative_ttl = negative_ttl
+        self.max_failures = max_failures
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._bucket: Optional[_TokenBucket] = None
+        self._start_lock = threading.Lock()
+
+        # Query -> time of failure, oldest first
+        self._failures: "OrderedDict[str, float]" = OrderedDict()
+        self._in_flight = 0
+        self._waiting = 0
+        self._requests = 0
+        self._errors = 0
+        self._bytes_read = 0
+        self._stopped_early = 0
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        """Start the fetcher's event loop thread on first use."""
+        if self._loop is not None:
+            return self._loop
+
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    self._client = httpx.AsyncClient(
+                        http2=HTTP2_AVAILABLE,
+                        headers=_HEADERS,
+                        timeout=self.timeout,
+                        follow_redirects=True,
+                        limits=httpx.Limits(
+                            max_connections=self.max_concurrency,
+                            max_keepalive_connections=self.max_concurrency
+                        )
+                    )
+                    self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                    self._bucket = _TokenBucket(self.rate_per_sec, self.burst)
+                    ready.set()
+                    loop.run_forever()
+
+                threading.Thread(target=run, name="youtube-fetcher", daemon=True).start()
+                ready.wait()
+                self._loop = loop
+
+        return self._loop
+
+    def search_url(self, query: str) -> str:
+        """Build the results URL (videos only: no shorts, no playlists)."""
+        encoded_query = urllib.parse.quote_plus(query)
+        return f"{self.base_url}/results?search_query={encoded_query}&sp=EgIQAQ%253D%253D"
+
+    async def _stream(self, query: str, consume: Callable[[str], bool]) -> bool:
+        """
+        Stream one results page into `consume` on the fetcher loop.
+
+        `consume` receives decoded text chunks as they arrive and returns
+        True once it has seen enough; the response is then closed without
+        reading the rest of the body.
+
+        Returns:
+            False if the request failed (or is negative-cached)
+        """
+        failed_at = self._failures.get(query)
+        if failed_at is not None:
+            if time.monotonic() - failed_at < self.negative_ttl:
+                return False
+            del self._failures[query]
+
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        try:
+            await self._bucket.take()
+            self._in_flight += 1
+            self._requests += 1
+            async with self._client.stream("GET", self.search_url(query)) as response:
+                if response.status_code != 200:
+                    self._errors += 1
+                    self._record_failure(query)
+                    print(f"YouTube fetch error: HTTP {response.status_code}")
+                    return False
+
+                async for chunk in response.aiter_text():
+                    if consume(chunk):
+                        self._stopped_early += 1
+                        break
+                self._bytes_read += response.num_bytes_downloaded
+        except Exception as e:
+            self._errors += 1
+            self._record_failure(query)
+            print(f"YouTube fetch error: {e}")
+            return False
+        finally:
+            self._in_flight = max(self._in_flight - 1, 0)
+            self._semaphore.release()
+
+        return True
+
+    def _record_failure(self, query: str) -> None:
+        """Negative-cache a query, dropping expired and excess entries (oldest first)."""
+        now = time.monotonic()
+        self._failures.pop(query, None)
+        self._failures[query] = now
+        while self._failures:
+            oldest, failed_at = next(iter(self._failures.items()))
+            if now - failed_at < self.negative_ttl and len(self._failures) <= self.max_failures:
+                break
+            del self._failures[oldest]
+
+    def fetch_until(self, query: str, consume: Callable[[str], bool]) -> bool:
+        """
+        Stream a results page into `consume` from any thread (blocking).
+
+        `consume` runs on the fetcher thread and should only do cheap,
+        non-blocking work such as feeding an incremental parser.
+        """
+        loop = self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(self._stream(query, consume), loop)
+        return future.result()
+
+    async def fetch_until_async(self, query: str, consume: Callable[[str], bool]) -> bool:
+        """Async variant of fetch_until."""
+        loop = self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(self._stream(query, consume), loop)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of fetcher load for monitoring."""
+        return {
+            "http2": HTTP2_AVAILABLE,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "requests": self._requests,
+            "errors": self._errors,
+            "bytes_read": self._bytes_read,
+            "stopped_early": self._stopped_early,
+            "negative_cached": len(self._failures),
+        }
+
+
+# Singleton instance
+_fetcher: Optional[YouTubeFetcher] = None
+_fetcher_lock = threading.Lock()
+
+
+def get_youtube_fetcher() -> YouTubeFetcher:
+    """Get or create the YouTube fetcher singleton."""
+    global _fetcher
+    if _fetcher is None:
+        with _fetcher_lock:
+            if _fetcher is None:
+                _fetcher = YouTubeFetcher(
+                    base_url=youtube_config.base_url,
+                    max_concurrency=youtube_config.max_concurrency,
+                    rate_per_sec=youtube_config.rate_per_sec,
+                    burst=youtube_config.max_concurrency,
+                    timeout=youtube_config.timeout,
+                    negative_ttl=youtube_config.negative_ttl
+                )
+    return _fetcher
@@ -1,87 +1,225 @@
-import urllib.parse
-import re
-import requests
+import asyncio
+import threading
 
+from config import youtube_config
+from utils.youtube_extractor import VideoStreamExtractor
+from services.youtube_cache import get_youtube_cache, normalize_query
+from services.youtube_fetcher import get_youtube_fetcher
+from services.video_catalog import get_video_catalog
 
-def search_youtube_videos(query: str, max_results: int = 3) -> list:
+# Queries with a background refresh of their stale cache entry in progress
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+# Keywords to skip (shorts, clips, etc.)
+_SKIP_KEYWORDS = ['#shorts', 'short', 'clip', 'tiktok', 'reels', '60 sec', '1 min', 'quick']
+
+# Keywords that indicate good content
+_GOOD_KEYWORDS = ['course', 'tutorial', 'full', 'complete', 'beginner', 'learn', 'hour', 'bootcamp']
+
+
+class _ResultCollector:
     """
-    Search YouTube for full course videos (not shorts).
-    Filters for longer educational content.
+    Filters and ranks videos as a results page streams in.
+    
+    Good-keyword videos rank first, in page order, so once `max_results`
+    of them have been seen the rest of the page cannot change the answer
+    and the download can stop.
     """
-    try:
-        # Add "full course" to query for better results
-        search_query = f"{query} full course tutorial"
-        encoded_query = urllib.parse.quote_plus(search_query)
-        
-        # Use sp=EgIQAQ%253D%253D to filter for videos only (no shorts, no playlists)
-        url = f"https://www.youtube.com/results?search_query={encoded_query}&sp=EgIQAQ%253D%253D"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept-Language': 'en-US,en;q=0.9',
-        }
+    
+    def __init__(self, max_results: int):
+        self.max_results = max_results
+        self.extractor = VideoStreamExtractor()
+        self.videos = []
+        self.seen_ids = set()
+        self.preferred = 0
+        self.done = False
+    
+    def feed(self, chunk: str) -> bool:
+        """Consume a page chunk; return True once enough videos were found."""
+        for video in self.extractor.feed(chunk):
+            self._add(video)
+        self.done = self.preferred >= self.max_results
+        return self.done
+    
+    def _add(self, video: dict) -> None:
+        video_id = video["video_id"]
         
-        response = requests.get(url, headers=headers, timeout=5)
-        html = response.text
+        if video_id in self.seen_ids:
+            return
         
-        videos = []
-        seen_ids = set()
+        # Skip anything shorter than a full course (live videos have no duration)
+        duration = video["duration"]
+        if duration is not None and duration < youtube_config.min_duration:
+            return
         
-        # Pattern to find video data with duration info
-        pattern = r'"videoId":"([a-zA-Z0-9_-]{11})","thumbnail".*?"title":\{"runs":\[\{"text":"([^"]+)"\}\].*?"longBylineText":\{"runs":\[\{"text":"([^"]+)"'
+        title_lower = video["title"].lower()
         
-        matches = re.findall(pattern, html)
+        # Skip shorts and clips
+        if any(skip in title_lower for skip in _SKIP_KEYWORDS):
+            return
         
-        # Keywords to skip (shorts, clips, etc.)
-        skip_keywords = ['#shorts', 'short', 'clip', 'tiktok', 'reels', '60 sec', '1 min', 'quick']
+        # Prioritize videos with good keywords
+        has_good_keyword = any(good in title_lower for good in _GOOD_KEYWORDS)
+        if has_good_keyword:
+            self.preferred += 1
         
-        # Keywords that indicate good content
-        good_keywords = ['course', 'tutorial', 'full', 'complete', 'beginner', 'learn', 'hour', 'bootcamp']
-        
-        for match in matches:
-            video_id, title, channel = match
-            
-            if video_id in seen_ids:
-                continue
-                
-            # Decode unicode
-            title_decoded = title.encode().decode('unicode_escape') if '\\u' in title else title
-            channel_decoded = channel.encode().decode('unicode_escape') if '\\u' in channel else channel
-            title_lower = title_decoded.lower()
-            
-            # Skip shorts and clips
-            if any(skip in title_lower for skip in skip_keywords):
-                continue
-            
-            # Prioritize videos with good keywords
-            has_good_keyword = any(good in title_lower for good in good_keywords)
-            
-            seen_ids.add(video_id)
-            videos.append({
-                "video_id": video_id,
-                "title": title_decoded,
-                "thumbnail": f"https://i.ytimg.com/vi/{video_id}/mqdefault.jpg",
-                "channel": channel_decoded,
-                "url": f"https://www.youtube.com/watch?v={video_id}",
-                "priority": 1 if has_good_keyword else 0
-            })
+        self.seen_ids.add(video_id)
+        self.videos.append({
+            "video_id": video_id,
+            "title": video["title"],
+            "thumbnail": f"https://i.ytimg.com/vi/{video_id}/mqdefault.jpg",
+            "channel": video["channel"],
+            "url": f"https://www.youtube.com/watch?v={video_id}",
+            "duration": duration,
+            "views": video["views"],
+            "priority": 1 if has_good_keyword else 0
+        })
+    
+    def results(self) -> list:
+        """Top `max_results` videos, good keywords first."""
+        if not self.done:
+            for video in self.extractor.close():
+                self._add(video)
         
         # Sort by priority (good keywords first) and take top results
-        videos.sort(key=lambda x: x.get('priority', 0), reverse=True)
+        self.videos.sort(key=lambda x: x.get('priority', 0), reverse=True)
         
         # Remove priority field and return
         result = []
-        for v in videos[:max_results]:
+        for v in self.videos[:self.max_results]:
             del v['priority']
             result.append(v)
         
         return result
-        
+
+
+def search_youtube_videos(query: str, max_results: int = youtube_config.max_videos) -> list:
+    """
+    Search YouTube for full course videos (not shorts).
+    Filters for longer educational content.
+    
+    The page is streamed and the download stops as soon as
+    `max_results` suitable videos have been found.
+    """
+    try:
+        collector = _ResultCollector(max_results)
+        # Add "full course" to query for better results
+        if not get_youtube_fetcher().fetch_until(f"{query} full course tutorial", collector.feed):
+            return []
+        return collector.results()
+    except Exception as e:
+        print(f"YouTube scraping error: {e}")
+        return []
+
+
+async def search_youtube_videos_async(query: str, max_results: int = youtube_config.max_videos) -> list:
+    """Async variant of search_youtube_videos for use on the event loop."""
+    try:
+        collector = _ResultCollector(max_results)
+        if not await get_youtube_fetcher().fetch_until_async(f"{query} full course tutorial", collector.feed):
+            return []
+        return collector.results()
     except Exception as e:
         print(f"YouTube scraping error: {e}")
         return []
 
 
+def _refresh_cached_videos(key: str, query: str) -> None:
+    """Re-scrape a stale cache entry; keep the old entry if scraping fails."""
+    try:
+        videos = search_youtube_videos(query, max_results=youtube_config.max_videos)
+        if videos:
+            get_youtube_cache().set(key, videos)
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(key)
+
+
+def _cached_videos(query: str):
+    """
+    Look up a query in the cache, scheduling a refresh if it is stale.
+    
+    Returns:
+        Tuple of (cache key, cached videos or None on a miss)
+    """
+    key = normalize_query(query)
+    cached = get_youtube_cache().get(key)
+    
+    if cached is None:
+        return key, None
+    
+    videos, is_stale = cached
+    if is_stale:
+        with _refreshing_lock:
+            if key in _refreshing:
+                return key, videos
+            _refreshing.add(key)
+        _schedule_refresh(key, query)
+    return key, videos
+
+
+def _schedule_refresh(key: str, query: str) -> None:
+    """Refresh a stale entry through the shared executor's refresh bulkhead."""
+    # Imported here: the executor pulls in FastAPI, which worker
+    # processes otherwise never load
+    from api.executor import get_executor
+    
+    def rejected(future) -> None:
+        # Never ran (bulkhead busy): let a later lookup try again
+        if future.cancelled() or future.exception() is not None:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+    
+    get_executor().submit("youtube_refresh", _refresh_cached_videos, key, query).add_done_callback(rejected)
+
+
+def _catalog_videos(query: str) -> list:
+    """Look up a query in the curated catalogue (empty if not covered)."""
+    catalog = get_video_catalog()
+    return catalog.search(query, youtube_config.max_videos) if catalog else []
+
+
 def get_curated_videos(query: str) -> list:
-    """Get curated YouTube videos - full courses only."""
-    return search_youtube_videos(query, max_results=3)
+    """
+    Get curated YouTube videos - full courses only.
+    
+    Answered from the curated catalogue when it covers the query;
+    otherwise from the cache, scraping only on a miss. Results are
+    cached by normalized query, and stale entries are returned
+    immediately while a background refresh runs.
+    """
+    videos = _catalog_videos(query)
+    if videos:
+        return videos
+    
+    key, videos = _cached_videos(query)
+    if videos is not None:
+        return videos
+    
+    videos = search_youtube_videos(query, max_results=youtube_config.max_videos)
+    if videos:
+        get_youtube_cache().set(key, videos)
+    return videos
+
+
+async def get_curated_videos_async(query: str) -> list:
+    """
+    Async variant of get_curated_videos; does not occupy an executor thread.
+    
+    Cache lookups and writes can block on the shared store (a SQLite
+    busy timeout or a Redis round trip), so they run in a thread.
+    """
+    videos = _catalog_videos(query)
+    if videos:
+        return videos
+    
+    key, videos = await asyncio.to_thread(_cached_videos, query)
+    if videos is not None:
+        return videos
+    
+    videos = await search_youtube_videos_async(query, max_results=youtube_config.max_videos)
+    if videos:
+        await asyncio.to_thread(get_youtube_cache().set, key, videos)
+    return videos
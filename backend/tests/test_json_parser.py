@@ -0,0 +1,94 @@
+"""
+CareerForge AI - JSON Repair Tests
+Checks repair_json and salvage_json on the shapes LLM output actually
+takes: prose around the payload, brackets and quotes inside strings,
+and responses cut off by the token limit.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.json_parser import extract_json, repair_json, salvage_json
+
+
+def _repaired(text, **kwargs):
+    repaired = repair_json(text, **kwargs)
+    assert repaired is not None
+    return json.loads(repaired)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('Here you go:\n```json\n{"a": 1, "b": [1, 2,],}\n```\nEnjoy!', {"a": 1, "b": [1, 2]}),
+    ('{"a": True, "b": None, "c": False}', {"a": True, "b": None, "c": False}),
+    ("[1 2 3]", [1, 2, 3]),
+    ('{"a": [1, 2}', {"a": [1, 2]}),
+])
+def test_repairs_malformed_output(text, expected):
+    assert _repaired(text) == expected
+
+
+def test_leaves_brackets_and_commas_in_strings_alone():
+    code = 'if (x) { return [1, 2,]; } // "quoted", too'
+    text = json.dumps({"code": code, "ok": True})[:-1]  # drop the closing brace
+
+    assert _repaired(text) == {"code": code, "ok": True}
+
+
+def test_escaped_quotes_do_not_end_a_string():
+    assert _repaired('{"a": "say \\"hi\\" {", "b": 1}') == {"a": 'say "hi" {', "b": 1}
+
+
+def test_closes_truncated_string_and_containers():
+    text = '{"steps": [{"name": "a"}, {"name": "b", "desc": "unfini'
+
+    assert _repaired(text) == {"steps": [{"name": "a"}, {"name": "b", "desc": "unfini"}]}
+
+
+def test_truncated_escape_is_dropped():
+    assert _repaired('{"text": "a\\') == {"text": "a"}
+    assert _repaired('{"text": "caf\\u00') == {"text": "caf"}
+
+
+@pytest.mark.parametrize("text, expected", [
+    # The number or literal may be incomplete (12 of 123, tru of true)
+    ('{"a": 12', {"a": None}),
+    ('{"a": "x", "b": tru', {"a": "x", "b": None}),
+    # A complete literal at the end is kept
+    ('{"a": "x", "b": true', {"a": "x", "b": True}),
+    # A dangling key gets a null value
+    ('{"a": 1, "b":', {"a": 1, "b": None}),
+])
+def test_truncated_values(text, expected):
+    assert _repaired(text) == expected
+
+
+def test_no_json_returns_none():
+    assert repair_json("Sorry, I can't help with that.") is None
+    assert extract_json("Sorry, I can't help with that.") is None
+
+
+def test_salvage_drops_the_partial_array_element():
+    text = '{"roadmap": [{"step": 1, "name": "Basics"}, {"step": 2, "name": "Adv'
+
+    assert salvage_json(text) == {"roadmap": [{"step": 1, "name": "Basics"}]}
+
+
+def test_salvage_keeps_complete_elements_with_tricky_strings():
+    first = {"question": 'What does print("[}") show?', "correct": "A"}
+    text = '{"questions": [' + json.dumps(first) + ', {"question": "What is'
+
+    assert salvage_json(text) == {"questions": [first]}
+
+
+def test_salvage_wraps_top_level_arrays():
+    assert salvage_json('[{"id": 1}, {"id": 2}, {"id"') == {"data": [{"id": 1}, {"id": 2}]}
+
+
+def test_salvage_returns_none_without_json():
+    assert salvage_json("") is None
+    assert salvage_json("no json here") is None
@@ -0,0 +1,128 @@
+"""
+CareerForge AI - Key Pool Tests
+Runs the quiz OpenAI client against a local OpenAI-compatible stand-in
+server that rate-limits one key, and checks the pool fails over to another
+key and keeps the limited key out until its retry-after has passed.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import quiz_service
+from services.key_pool import KeyPool
+
+LIMITED_KEY = "sk-test-limited-0001"
+HEALTHY_KEY = "sk-test-healthy-0002"
+RETRY_AFTER = 1
+
+QUIZ = {"questions": [{
+    "id": 1,
+    "question": "What does len([1, 2]) return?",
+    "options": {"A": "1", "B": "2", "C": "3", "D": "Error"},
+    "correct": "B",
+    "explanation": "The list has two items.",
+    "difficulty": "easy",
+}]}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Chat completions endpoint that answers 429 for LIMITED_KEY."""
+
+    def do_POST(self):
+        key = self.headers.get("Authorization", "").removeprefix("Bearer ")
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.hits[key] = self.server.hits.get(key, 0) + 1
+
+        if key == LIMITED_KEY:
+            self._reply(429, {"error": {"message": "Rate limit reached", "type": "requests"}},
+                        {"retry-after": str(RETRY_AFTER)})
+            return
+
+        self._reply(200, {
+            "id": "chatcmpl-test",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "stand-in",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": json.dumps(QUIZ)},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        })
+
+    def _reply(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    httpd.hits = {}
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def pool(server, monkeypatch):
+    pool = KeyPool(
+        [LIMITED_KEY, HEALTHY_KEY],
+        base_url=f"http://127.0.0.1:{server.server_port}/v1",
+        timeout=5.0
+    )
+    monkeypatch.setattr(quiz_service, "OPENAI_API_KEYS", [LIMITED_KEY, HEALTHY_KEY])
+    monkeypatch.setattr(quiz_service, "_key_pool", pool)
+    return pool
+
+
+def _stats(pool):
+    return {s["key"]: s for s in pool.stats()}
+
+
+def test_rotates_to_another_key_on_429(server, pool):
+    result = quiz_service.generate_quiz_batch("Python", "Lists", 1)
+
+    assert result == QUIZ
+    assert server.hits == {LIMITED_KEY: 1, HEALTHY_KEY: 1}
+
+    stats = _stats(pool)
+    limited = stats[pool._states[0].label]
+    assert limited["rate_limited"] == 1
+    assert 0 < limited["cooldown_s"] <= RETRY_AFTER
+    assert stats[pool._states[1].label]["in_flight"] == 0
+
+
+def test_honours_retry_after_cooldown(server, pool):
+    quiz_service.generate_quiz_batch("Python", "Lists", 1)
+
+    # While cooling down the limited key is skipped, not retried
+    assert quiz_service.generate_quiz_batch("Python", "Lists", 1) == QUIZ
+    assert server.hits == {LIMITED_KEY: 1, HEALTHY_KEY: 2}
+    assert pool.acquire(exclude=[HEALTHY_KEY], wait=0) is None
+
+    # Once the retry-after has passed it is handed out again
+    time.sleep(RETRY_AFTER + 0.1)
+    state = pool.acquire(exclude=[HEALTHY_KEY], wait=0)
+    assert state is not None and state.key == LIMITED_KEY
+    pool.release(state)
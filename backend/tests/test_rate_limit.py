@@ -0,0 +1,131 @@
+"""
+CareerForge AI - Rate Limit Tests
+Token bucket refill and cost accounting for the memory and SQLite
+stores, and the middleware's 429s and client identity, on a fake clock.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import rate_limit
+from api.rate_limit import (
+    MemoryBucketStore,
+    RateLimitMiddleware,
+    SQLiteBucketStore,
+    client_identity,
+)
+
+CAPACITY = 10
+RATE = 1.0  # tokens per second
+
+
+class FakeClock:
+    """Stands in for the time module inside api.rate_limit."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    return clock
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteBucketStore(str(tmp_path / "rate_limit.db"))
+    return MemoryBucketStore()
+
+
+def test_new_bucket_is_full(clock, store):
+    for _ in range(CAPACITY):
+        assert store.take("client", 1, CAPACITY, RATE) == 0.0
+    assert store.take("client", 1, CAPACITY, RATE) == pytest.approx(1.0)
+
+
+def test_cost_is_charged_in_full(clock, store):
+    assert store.take("client", 6, CAPACITY, RATE) == 0.0
+    # 4 left: a 5-token request waits for one more token
+    assert store.take("client", 5, CAPACITY, RATE) == pytest.approx(1.0)
+    assert store.take("client", 4, CAPACITY, RATE) == 0.0
+
+
+def test_rejected_request_is_not_charged(clock, store):
+    store.take("client", CAPACITY, CAPACITY, RATE)
+    assert store.take("client", 3, CAPACITY, RATE) == pytest.approx(3.0)
+    assert store.take("client", 3, CAPACITY, RATE) == pytest.approx(3.0)
+
+    clock.now += 3
+    assert store.take("client", 3, CAPACITY, RATE) == 0.0
+
+
+def test_refill_is_capped_at_capacity(clock, store):
+    store.take("client", CAPACITY, CAPACITY, RATE)
+    clock.now += 2.5
+    assert store.take("client", 2, CAPACITY, RATE) == 0.0
+    assert store.take("client", 1, CAPACITY, RATE) == pytest.approx(0.5)
+
+    clock.now += 3600
+    assert store.take("client", CAPACITY, CAPACITY, RATE) == 0.0
+    assert store.take("client", 1, CAPACITY, RATE) == pytest.approx(1.0)
+
+
+def test_clients_have_separate_buckets(clock, store):
+    store.take("a", CAPACITY, CAPACITY, RATE)
+    assert store.take("a", 1, CAPACITY, RATE) > 0
+    assert store.take("b", 1, CAPACITY, RATE) == 0.0
+
+
+def _scope(path="/api/ai/roadmap", method="POST", api_key=None, client="10.0.0.1"):
+    headers = [(b"x-api-key", api_key.encode())] if api_key else []
+    return {"type": "http", "method": method, "path": path, "headers": headers, "client": (client, 5000)}
+
+
+def test_unknown_api_keys_fall_back_to_ip(monkeypatch):
+    monkeypatch.setattr(rate_limit, "_known_keys", frozenset({rate_limit._key_id("known")}))
+
+    assert client_identity(_scope(api_key="known"), trust_proxy=False).startswith("key:")
+    assert client_identity(_scope(api_key="made-up-1"), trust_proxy=False) == "ip:10.0.0.1"
+    assert client_identity(_scope(api_key="made-up-2"), trust_proxy=False) == "ip:10.0.0.1"
+
+
+async def _ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+def _call(middleware, scope):
+    """Run one request through the middleware; returns (status, headers)."""
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(middleware(scope, None, send))
+    return sent[0]["status"], dict(sent[0]["headers"])
+
+
+def test_middleware_charges_route_cost_and_answers_429(clock):
+    middleware = RateLimitMiddleware(_ok_app, store=MemoryBucketStore(), per_minute=60, burst=10, trust_proxy=False)
+
+    # Roadmaps cost 5, so a full bucket allows two in a row
+    assert _call(middleware, _scope())[0] == 200
+    assert _call(middleware, _scope())[0] == 200
+    status, headers = _call(middleware, _scope())
+    assert status == 429
+    assert headers[b"retry-after"] == b"5"
+
+    # GETs are free, and another client has its own bucket
+    assert _call(middleware, _scope(method="GET"))[0] == 200
+    assert _call(middleware, _scope(client="10.0.0.2"))[0] == 200
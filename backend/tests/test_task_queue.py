@@ -0,0 +1,173 @@
+"""
+CareerForge AI - Task Queue Tests
+Lease, requeue, cancel and settle rules of the durable task queue, on a
+fake clock. Runs against SQLite; set TEST_REDIS_URL to also run them
+against a Redis server (the keys used are removed afterwards).
+"""
+
+import os
+import secrets
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import task_queue
+from services.task_queue import CANCELLED_ERROR, RedisTaskQueue, SQLiteTaskQueue
+
+LEASE = 30.0
+MAX_ATTEMPTS = 2
+TTL = 3600.0
+
+
+class FakeClock:
+    """Stands in for the time module inside services.task_queue."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(task_queue, "time", clock)
+    return clock
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def queue(request, tmp_path, clock):
+    if request.param == "sqlite":
+        yield SQLiteTaskQueue(str(tmp_path / "jobs.db"), LEASE, MAX_ATTEMPTS, TTL)
+        return
+
+    url = os.getenv("TEST_REDIS_URL")
+    if not url:
+        pytest.skip("TEST_REDIS_URL not set")
+    pytest.importorskip("redis")
+    queue = RedisTaskQueue(url, LEASE, MAX_ATTEMPTS, TTL, prefix=f"careerforge:test:{secrets.token_hex(4)}:")
+    yield queue
+    keys = list(queue._client.scan_iter(match=queue.prefix + "*"))
+    if keys:
+        queue._client.delete(*keys)
+
+
+def test_claim_leases_oldest_task(queue, clock):
+    first = queue.enqueue("quiz", {"topic": "Python"}, "ip:1")
+    clock.now += 1
+    queue.enqueue("quiz", {"topic": "SQL"}, "ip:1")
+
+    task = queue.claim("worker-a")
+    assert task == {"id": first, "kind": "quiz", "params": {"topic": "Python"}, "attempts": 1}
+    assert queue.get(first)["status"] == "running"
+    assert queue.unfinished("ip:1") == 2
+
+
+def test_complete_stores_result(queue, clock):
+    task_id = queue.enqueue("skills", {}, "ip:1")
+    queue.claim("worker-a")
+    queue.add_partial(task_id, {"step": 1})
+
+    assert queue.complete(task_id, "worker-a", {"ok": True}) is True
+    view = queue.get(task_id)
+    assert view["status"] == "succeeded"
+    assert view["result"] == {"ok": True}
+    assert view["partial"] == [{"step": 1}]
+    assert queue.unfinished("ip:1") == 0
+
+
+def test_heartbeat_keeps_the_lease(queue, clock):
+    task_id = queue.enqueue("roadmap", {}, "ip:1")
+    queue.claim("worker-a")
+
+    clock.now += LEASE - 1
+    queue.heartbeat("worker-a", [task_id])
+    clock.now += LEASE - 1
+    assert queue.claim("worker-b") is None
+    assert queue.complete(task_id, "worker-a", {}) is True
+
+
+def test_expired_lease_is_requeued_then_failed(queue, clock):
+    task_id = queue.enqueue("roadmap", {}, "ip:1")
+    assert queue.claim("worker-a")["attempts"] == 1
+
+    # worker-a stops heartbeating; the task goes to the next claimant
+    clock.now += LEASE + 1
+    task = queue.claim("worker-b")
+    assert task["id"] == task_id
+    assert task["attempts"] == 2
+
+    # Out of attempts: failed instead of handed out again
+    clock.now += LEASE + 1
+    assert queue.claim("worker-c") is None
+    view = queue.get(task_id)
+    assert view["status"] == "failed"
+    assert "2 attempts" in view["error"]
+
+
+def test_worker_whose_lease_was_stolen_cannot_settle(queue, clock):
+    task_id = queue.enqueue("quiz", {}, "ip:1")
+    queue.claim("worker-a")
+    clock.now += LEASE + 1
+    queue.claim("worker-b")
+
+    assert queue.complete(task_id, "worker-a", {"stale": True}) is False
+    assert queue.fail(task_id, "worker-a", "boom") is False
+    assert queue.get(task_id)["status"] == "running"
+
+    assert queue.complete(task_id, "worker-b", {"fresh": True}) is True
+    assert queue.get(task_id)["result"] == {"fresh": True}
+
+
+def test_settled_task_cannot_be_settled_again(queue, clock):
+    task_id = queue.enqueue("quiz", {}, "ip:1")
+    queue.claim("worker-a")
+
+    assert queue.fail(task_id, "worker-a", "boom") is True
+    assert queue.complete(task_id, "worker-a", {}) is False
+    assert queue.get(task_id)["error"] == "boom"
+
+
+def test_cancel_queued_task_stops_it_at_once(queue, clock):
+    task_id = queue.enqueue("quiz", {}, "ip:1")
+
+    assert queue.cancel(task_id) == "cancelled"
+    view = queue.get(task_id)
+    assert view["status"] == "cancelled"
+    assert view["error"] == CANCELLED_ERROR
+    assert queue.claim("worker-a") is None
+    assert queue.unfinished("ip:1") == 0
+
+
+def test_cancel_running_task_is_flagged_for_its_worker(queue, clock):
+    task_id = queue.enqueue("quiz", {}, "ip:1")
+    queue.claim("worker-a")
+
+    assert queue.cancel(task_id) == "running"
+    assert queue.get(task_id)["status"] == "running"
+    assert queue.heartbeat("worker-a", [task_id]) == [task_id]
+
+    assert queue.fail(task_id, "worker-a", CANCELLED_ERROR, status="cancelled") is True
+    assert queue.get(task_id)["status"] == "cancelled"
+
+
+def test_cancelled_task_whose_worker_died_is_not_requeued(queue, clock):
+    task_id = queue.enqueue("quiz", {}, "ip:1")
+    queue.claim("worker-a")
+    queue.cancel(task_id)
+
+    clock.now += LEASE + 1
+    assert queue.claim("worker-b") is None
+    assert queue.get(task_id)["status"] == "cancelled"
+
+
+def test_cancel_unknown_and_finished_tasks(queue, clock):
+    assert queue.cancel("no-such-task") is None
+
+    task_id = queue.enqueue("quiz", {}, "ip:1")
+    queue.claim("worker-a")
+    queue.complete(task_id, "worker-a", {})
+    assert queue.cancel(task_id) == "succeeded"
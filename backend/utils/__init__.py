@@ -3,12 +3,16 @@ CareerForge AI - Utilities Module
 Helper functions for JSON parsing, validation, and more.
 """
 
-from .json_parser import safe_parse_json, extract_json_from_text
-from .validators import validate_user_profile, sanitize_input
+from .json_parser import safe_parse_json, extract_json, extract_json_from_text, repair_json, iter_array_items
+from .validators import validate_user_profile, sanitize_input, canonical_input
 
 __all__ = [
     "safe_parse_json",
+    "extract_json",
     "extract_json_from_text",
+    "repair_json",
+    "iter_array_items",
     "validate_user_profile",
     "sanitize_input",
+    "canonical_input",
 ]
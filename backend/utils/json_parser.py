@@ -5,7 +5,7 @@ Safe JSON extraction from LLM responses.
 
 import json
 import re
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 
 def safe_parse_json(text: str) -> Optional[Dict[str, Any]]:
@@ -35,6 +35,275 @@ def safe_parse_json(text: str) -> Optional[Dict[str, Any]]:
     return None
 
 
+_DECODER = json.JSONDecoder(strict=False)
+
+# Characters that change the scanner's state outside strings
+_STRUCTURAL_RE = re.compile(r'["{}\[\],:]')
+
+# A complete JSON string (unrolled loop: linear, no backtracking)
+_STRING_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+
+# Python-style literals some models emit
+_LITERAL_FIXES = {"True": "true", "False": "false", "None": "null"}
+
+# Bare literals known to be whole even when the text ends right after them
+_COMPLETE_AT_END = frozenset({"true", "false", "null", "True", "False", "None"})
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def _json_start(text: str) -> int:
+    """
+    Index where the JSON payload starts, or -1.
+
+    The first '{' is preferred. A '[' before it only starts the payload
+    if it is still open at that brace (a top-level array of objects);
+    brackets closed in the prose first, as in "Here are [3] questions:
+    {...}", are skipped.
+    """
+    brace = text.find('{')
+    bracket = text.find('[')
+    if bracket == -1 or (brace != -1 and brace < bracket):
+        return brace
+    if brace == -1:
+        return bracket
+
+    depth = 0
+    pos = bracket
+    while pos < brace:
+        match = _STRUCTURAL_RE.search(text, pos, brace)
+        if match is None:
+            break
+        char = match.group(0)
+        pos = match.end()
+        if char == '"':
+            string = _STRING_RE.match(text, match.start())
+            if string is None:
+                break
+            pos = string.end()
+        elif char == '[':
+            if depth == 0:
+                bracket = match.start()
+            depth += 1
+        elif char == ']' and depth:
+            depth -= 1
+    return bracket if depth else brace
+
+
+def _close_string(fragment: str) -> str:
+    """Terminate a string cut off mid-way, dropping a partial escape."""
+    tail = len(fragment) - len(fragment.rstrip('\\'))
+    if tail % 2:
+        fragment = fragment[:-1]
+    # A cut-off \uXXXX escape
+    escape = fragment.rfind('\\u', max(len(fragment) - 5, 0))
+    if escape != -1 and len(fragment) - escape < 6:
+        backslashes = len(fragment[:escape]) - len(fragment[:escape].rstrip('\\'))
+        if backslashes % 2 == 0:
+            fragment = fragment[:escape]
+    return fragment + '"'
+
+
+def repair_json(text: str, drop_partial: bool = False) -> Optional[str]:
+    """
+    Cut the first JSON object or array out of text and repair it.
+
+    One linear pass that understands strings and escapes, so brackets
+    and commas inside string values (e.g. code snippets) are left alone.
+
+    Fixes:
+    - Leading/trailing prose and markdown fences
+    - Trailing and doubled commas, missing commas between elements
+      (including bare literals, as in [1 2 3])
+    - Python literals (True/False/None)
+    - Mismatched closing brackets
+    - Truncated output: an open string is terminated, a number or
+      literal at the very end is dropped (it may be incomplete), a
+      dangling key gets a null value and all open objects/arrays are closed
+
+    Args:
+        text: Text containing (possibly malformed) JSON
+        drop_partial: For truncated output, drop the element that was
+            being written in the outermost open array (e.g. the half
+            generated roadmap step) instead of closing it
+
+    Returns:
+        Repaired JSON text, or None if text has no object or array
+    """
+    if not text:
+        return None
+
+    pos = _json_start(text)
+    if pos == -1:
+        return None
+
+    out: List[str] = []
+    stack: List[str] = []
+    last = ''         # Last significant token: { [ , : k (key) or v (value)
+    comma_at = -1     # Index in `out` of the comma `last` refers to
+    elements: List[int] = []  # Per open structure: `out` index where its current element starts
+    cut = False       # Text ended inside a string, number or literal
+    length = len(text)
+
+    while pos < length:
+        match = _STRUCTURAL_RE.search(text, pos)
+        index = match.start() if match else length
+
+        # Whitespace or a bare literal between structural characters
+        if index > pos:
+            chunk = text[pos:index]
+            literals = chunk.split()
+            if match is None and literals and literals[-1] not in _COMPLETE_AT_END:
+                # A number or literal at the very end may have been cut
+                # off ("12" of "125"), so it is dropped
+                literals.pop()
+                cut = True
+            for literal in literals:
+                literal = _LITERAL_FIXES.get(literal, literal)
+                if last == 'v' and stack:
+                    # Missing comma between elements
+                    comma_at = len(out)
+                    out.append(',')
+                out.append(literal)
+                last = 'v'
+            if not literals and not cut:
+                out.append(chunk)
+            if cut:
+                break
+
+        if match is None:
+            break
+
+        char = text[index]
+        pos = index + 1
+
+        if char == '"':
+            is_key = bool(stack) and stack[-1] == '{' and last in ('{', ',', 'v')
+            if last == 'v' and stack:
+                # Missing comma between members or elements
+                comma_at = len(out)
+                out.append(',')
+            string = _STRING_RE.match(text, index)
+            if string is None:
+                # Unterminated: the text was cut off inside this string
+                out.append(_close_string(text[index:]))
+                last = 'k' if is_key else 'v'
+                cut = True
+                break
+            out.append(string.group(0))
+            last = 'k' if is_key else 'v'
+            pos = string.end()
+
+        elif char in '{[':
+            if last == 'v' and stack and stack[-1] == '[':
+                # Missing comma between elements
+                out.append(',')
+            stack.append(char)
+            out.append(char)
+            elements.append(len(out))
+            last = char
+
+        elif char in '}]':
+            opener = '{' if char == '}' else '['
+            if opener not in stack:
+                continue
+            if last == ',':
+                out[comma_at] = ''
+            elif last == ':':
+                out.append('null')
+            elif last == 'k':
+                out.append(':null')
+            # Close anything left open inside this structure
+            while stack[-1] != opener:
+                out.append(_CLOSERS[stack.pop()])
+                elements.pop()
+            stack.pop()
+            elements.pop()
+            out.append(char)
+            last = 'v'
+            if not stack:
+                break
+
+        elif char == ',':
+            if last in ('{', '[', ','):
+                continue
+            if last == ':':
+                out.append('null')
+            elif last == 'k':
+                out.append(':null')
+            comma_at = len(out)
+            out.append(',')
+            elements[-1] = len(out)
+            last = ','
+
+        else:  # ':'
+            out.append(':')
+            last = ':'
+
+    # Close whatever the text left open
+    if stack and drop_partial and '[' in stack:
+        depth = stack.index('[')
+        if cut or depth < len(stack) - 1:
+            # Drop the unfinished element and anything nested in it
+            del out[elements[depth]:]
+            del stack[depth + 1:]
+            last = '['
+            while out and not out[-1].strip():
+                out.pop()
+            if out and out[-1] == ',':
+                out.pop()
+
+    if stack:
+        if last == ',':
+            out[comma_at] = ''
+        elif last == ':':
+            out.append('null')
+        elif last == 'k':
+            out.append(':null')
+        while stack:
+            out.append(_CLOSERS[stack.pop()])
+
+    return ''.join(out)
+
+
+def extract_json(text: str) -> Optional[Any]:
+    """
+    Parse the first JSON object or array in text, repairing it if needed.
+
+    Tries, in order: the whole text, a C-speed decode from the first
+    bracket (ignores trailing prose), then repair_json.
+
+    Args:
+        text: LLM output
+
+    Returns:
+        Parsed value or None
+    """
+    if not text:
+        return None
+
+    stripped = text.strip()
+    try:
+        return _DECODER.decode(stripped)
+    except ValueError:
+        pass
+
+    start = _json_start(stripped)
+    if start == -1:
+        return None
+
+    try:
+        return _DECODER.raw_decode(stripped, start)[0]
+    except ValueError:
+        pass
+
+    repaired = repair_json(stripped[start:])
+    try:
+        return _DECODER.decode(repaired) if repaired else None
+    except ValueError:
+        return None
+
+
 def extract_json_from_text(text: str) -> Optional[Dict[str, Any]]:
     """
     Extract JSON object from text that may contain extra content.
@@ -42,98 +311,157 @@ def extract_json_from_text(text: str) -> Optional[Dict[str, Any]]:
     Handles:
     - Markdown code blocks (```json ... ```)
     - Leading/trailing text
-    - Nested objects
+    - Braces and brackets inside string values
+    - Trailing commas and truncated output (see repair_json)
     
     Args:
         text: Text containing JSON somewhere
     
     Returns:
-        Extracted and parsed JSON or None
+        Extracted and parsed JSON or None. A top-level array is
+        wrapped as {"data": [...]}.
     """
-    if not text:
-        return None
-    
-    cleaned = text.strip()
-    
-    # Remove markdown code block markers
-    patterns = [
-        r'^```json\s*\n?(.*?)\n?```$',  # ```json ... ```
-        r'^```\s*\n?(.*?)\n?```$',       # ``` ... ```
-        r'^`(.*)`$',                       # `...`
-    ]
-    
-    for pattern in patterns:
-        match = re.match(pattern, cleaned, re.DOTALL)
-        if match:
-            cleaned = match.group(1).strip()
-            break
-    
-    # Try parsing the cleaned text
-    try:
-        return json.loads(cleaned)
-    except json.JSONDecodeError:
-        pass
-    
-    # Try to find JSON object boundaries { ... }
-    try:
-        start = cleaned.find('{')
-        if start == -1:
-            return None
-        
-        # Find matching closing brace
-        depth = 0
-        end = start
-        for i, char in enumerate(cleaned[start:], start):
-            if char == '{':
-                depth += 1
-            elif char == '}':
-                depth -= 1
-                if depth == 0:
-                    end = i + 1
-                    break
-        
-        if end > start:
-            json_str = cleaned[start:end]
-            return json.loads(json_str)
-    except json.JSONDecodeError:
-        pass
-    
-    # Try to find JSON array boundaries [ ... ]
-    try:
-        start = cleaned.find('[')
-        if start == -1:
-            return None
-        
-        depth = 0
-        end = start
-        for i, char in enumerate(cleaned[start:], start):
-            if char == '[':
-                depth += 1
-            elif char == ']':
-                depth -= 1
-                if depth == 0:
-                    end = i + 1
-                    break
-        
-        if end > start:
-            json_str = cleaned[start:end]
-            parsed = json.loads(json_str)
-            # Wrap array in dict for consistency
-            return {"data": parsed}
-    except json.JSONDecodeError:
-        pass
+    parsed = extract_json(text)
     
+    if isinstance(parsed, dict):
+        return parsed
+    if isinstance(parsed, list):
+        # Wrap array in dict for consistency
+        return {"data": parsed}
     return None
 
 
+def salvage_json(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse output that was cut off by the token limit.
+
+    Like extract_json_from_text, but the element that was being written
+    in the outermost open array is dropped, so only complete roadmap
+    steps, quiz questions, etc. are kept.
+
+    Args:
+        text: Truncated LLM output
+
+    Returns:
+        Parsed dict (arrays wrapped as {"data": [...]}) or None
+    """
+    repaired = repair_json(text, drop_partial=True)
+    if not repaired:
+        return None
+
+    try:
+        parsed = _DECODER.decode(repaired)
+    except ValueError:
+        return None
+
+    if isinstance(parsed, list):
+        return {"data": parsed}
+    return parsed if isinstance(parsed, dict) else None
+
+
+class ArrayItemStream:
+    """
+    Incrementally extract objects from JSON arrays as text streams in.
+
+    Feed LLM output chunk by chunk; every object that is a direct element
+    of an array (e.g. each entry of {"questions": [...]}) is returned as
+    soon as its closing brace arrives. The scanner understands strings and
+    escapes, so braces inside code snippets do not confuse it.
+
+    Objects that fail to parse are counted in `dropped` and skipped.
+    """
+
+    def __init__(self):
+        self._buf = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._item_start = -1
+        self._item_depth = 0
+        self.dropped = 0
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        Consume a chunk of text.
+
+        Args:
+            chunk: Next fragment of model output
+
+        Returns:
+            Objects completed by this chunk, in order
+        """
+        self._buf += chunk
+        items = []
+        buf = self._buf
+
+        for i in range(self._pos, len(buf)):
+            char = buf[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in '{[':
+                if char == '{' and self._stack and self._stack[-1] == '[' and self._item_start == -1:
+                    self._item_start = i
+                    self._item_depth = len(self._stack)
+                self._stack.append(char)
+            elif char in '}]':
+                if self._stack:
+                    self._stack.pop()
+                if char == '}' and self._item_start != -1 and len(self._stack) == self._item_depth:
+                    try:
+                        parsed = json.loads(buf[self._item_start:i + 1])
+                        if isinstance(parsed, dict):
+                            items.append(parsed)
+                        else:
+                            self.dropped += 1
+                    except json.JSONDecodeError:
+                        self.dropped += 1
+                    self._item_start = -1
+
+        # Keep only the unfinished item (if any) to bound memory
+        if self._item_start == -1:
+            self._buf = ""
+            self._pos = 0
+        else:
+            self._buf = buf[self._item_start:]
+            self._pos = len(self._buf)
+            self._item_start = 0
+
+        return items
+
+
+def iter_array_items(chunks: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield array element objects from a stream of JSON text chunks.
+
+    Args:
+        chunks: Iterable of text fragments (e.g. LLMService.generate_stream)
+
+    Yields:
+        Each complete array element object as soon as it closes
+    """
+    stream = ArrayItemStream()
+    for chunk in chunks:
+        for item in stream.feed(chunk):
+            yield item
+
+
 def clean_json_string(text: str) -> str:
     """
     Clean common issues in JSON strings from LLMs.
     
-    Fixes:
-    - Trailing commas
-    - Single quotes instead of double quotes
-    - Unquoted keys
+    Fixes trailing commas, Python literals and truncation (see
+    repair_json) without touching the contents of string values.
     
     Args:
         text: JSON-like string
@@ -144,14 +472,8 @@ def clean_json_string(text: str) -> str:
     if not text:
         return text
     
-    # Remove trailing commas before } or ]
-    text = re.sub(r',\s*([}\]])', r'\1', text)
-    
-    # This is risky but sometimes helps with simple cases
-    # Replace single quotes with double quotes (only for simple cases)
-    # text = text.replace("'", '"')
-    
-    return text
+    repaired = repair_json(text)
+    return repaired if repaired is not None else text
 
 
 def validate_json_schema(data: Dict, required_fields: list) -> bool:
@@ -0,0 +1,86 @@
+"""
+CareerForge AI - Request Context
+Deadline and cancellation state for the API request being served.
+
+The API middleware opens a RequestScope per request and marks it
+cancelled when the client disconnects. Services read it through
+current_request() to stop work nobody is waiting for, e.g. LLMService
+aborts its upstream Ollama stream. The scope travels in a contextvar,
+so it follows the request into executor threads as long as they are
+started with contextvars.copy_context().run.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+
+class RequestScope:
+    """Deadline and cancellation flag for one request."""
+
+    def __init__(self, timeout: Optional[float] = None):
+        """
+        Initialize the scope.
+
+        Args:
+            timeout: Seconds the client allows for the whole request
+                (None for no deadline)
+        """
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """Mark the request as abandoned (client disconnected)."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    @property
+    def done(self) -> bool:
+        """True once nobody is waiting for the result any more."""
+        return self.cancelled or self.expired
+
+    @property
+    def reason(self) -> str:
+        """Why the request stopped, for error messages."""
+        return "Request cancelled by client" if self.cancelled else "Request deadline exceeded"
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline (None without one)."""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    def timeout(self, default: float) -> float:
+        """A stage's own timeout, shortened to the time left for the request."""
+        remaining = self.remaining()
+        return default if remaining is None else min(default, remaining)
+
+
+# Used outside any request (scripts, background refreshes): never done
+_UNBOUNDED = RequestScope()
+
+_current: ContextVar[RequestScope] = ContextVar("careerforge_request", default=_UNBOUNDED)
+
+
+def current_request() -> RequestScope:
+    """The scope of the request being served, or an unbounded one."""
+    return _current.get()
+
+
+@contextmanager
+def request_scope(scope: RequestScope) -> Iterator[RequestScope]:
+    """Make `scope` the current request scope for the enclosed block."""
+    token = _current.set(scope)
+    try:
+        yield scope
+    finally:
+        _current.reset(token)
@@ -0,0 +1,22 @@
+"""
+CareerForge AI - JSON Serialization
+orjson encoding that writes Pydantic models directly, shared by the API
+responses, the task queue and the cache (without importing FastAPI).
+"""
+
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
+
+
+def _default(obj: Any) -> Any:
+    """Embed models as pre-serialized JSON instead of converting them to dicts."""
+    if isinstance(obj, BaseModel):
+        return orjson.Fragment(obj.model_dump_json(exclude_unset=True))
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content (which may contain Pydantic models) to JSON bytes."""
+    return orjson.dumps(content, default=_default)
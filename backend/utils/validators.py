@@ -39,10 +39,37 @@ def validate_user_profile(description: str) -> Tuple[bool, str]:
     return True, ""
 
 
+# Common patterns used to try to override system prompts. Spaces match
+# any whitespace run, so "ignore\n  previous instructions" is caught too.
+_INJECTION_PATTERNS = (
+    r'ignore (all )?previous instructions',
+    r'disregard (all )?(previous|above) (instructions|prompts)',
+    r'forget (everything|all)',
+    r'system prompt:',
+    r'new instructions:',
+    r'\[inst\]',
+    r'\[/inst\]',
+    r'<\|.*?\|>',
+    r'<<sys>>',
+    r'<</sys>>',
+)
+
+_INJECTION = "|".join(p.replace(" ", r"\s+") for p in _INJECTION_PATTERNS)
+
+# Input is matched against its case-folded copy: without IGNORECASE the
+# regex engine can skip straight to the patterns' first characters.
+_INJECTION_RE = re.compile(_INJECTION)
+_INJECTION_RE_IGNORECASE = re.compile(_INJECTION, re.IGNORECASE)
+
+
 def sanitize_input(text: str, max_length: int = 5000) -> str:
     """
     Sanitize user input to prevent prompt injection.
     
+    All injection patterns are found in one scan of a single compiled
+    alternation and replaced with "[FILTERED]"; whitespace is then
+    collapsed to single spaces.
+    
     Args:
         text: User input text
         max_length: Maximum allowed length
@@ -53,31 +80,44 @@ def sanitize_input(text: str, max_length: int = 5000) -> str:
     if not text or not isinstance(text, str):
         return ""
     
-    # Truncate to max length
     text = text[:max_length]
     
-    # Remove potential prompt injection patterns
-    # These are common patterns used to try to override system prompts
-    injection_patterns = [
-        r'ignore (all )?previous instructions',
-        r'disregard (all )?(previous|above) (instructions|prompts)',
-        r'forget (everything|all)',
-        r'system prompt:',
-        r'new instructions:',
-        r'\[INST\]',
-        r'\[/INST\]',
-        r'<\|.*?\|>',
-        r'<<SYS>>',
-        r'<</SYS>>',
-    ]
-    
-    for pattern in injection_patterns:
-        text = re.sub(pattern, '[FILTERED]', text, flags=re.IGNORECASE)
-    
-    # Normalize whitespace
-    text = ' '.join(text.split())
-    
-    return text.strip()
+    folded = text.lower() if text.isascii() else text.casefold()
+    if len(folded) == len(text):
+        matches = _INJECTION_RE.finditer(folded)
+    else:
+        # Folding expanded a character ("ß" -> "ss"), so offsets would not line up
+        matches = _INJECTION_RE_IGNORECASE.finditer(text)
+    
+    parts = []
+    last = 0
+    for match in matches:
+        parts.append(text[last:match.start()])
+        parts.append("[FILTERED]")
+        last = match.end()
+    if parts:
+        parts.append(text[last:])
+        text = "".join(parts)
+    
+    # Normalize whitespace (split() also drops leading/trailing runs)
+    return " ".join(text.split())
+
+
+def canonical_input(text: str, max_length: int = 5000) -> str:
+    """
+    Canonical form of user input, for use as a cache key.
+    
+    Inputs that differ only in case, spacing or filtered injection
+    text map to the same string.
+    
+    Args:
+        text: User input text
+        max_length: Maximum allowed length
+    
+    Returns:
+        Sanitized, casefolded text
+    """
+    return sanitize_input(text, max_length).casefold()
 
 
 def validate_role_name(role: str) -> Tuple[bool, str]:
@@ -0,0 +1,207 @@
+"""
+CareerForge AI - YouTube Results Extractor
+Linear-time extraction of video entries from a YouTube results page.
+
+Instead of running a backtracking regex over the whole page, this finds
+the `ytInitialData` blob with plain substring search and decodes only the
+`videoRenderer` objects inside it.
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional
+
+_DECODER = json.JSONDecoder()
+
+_INITIAL_DATA_MARKERS = ('var ytInitialData = ', 'window["ytInitialData"] = ', 'ytInitialData = ')
+_RENDERER_KEY = '"videoRenderer":'
+_MARKER_TAIL = max(len(marker) for marker in _INITIAL_DATA_MARKERS)
+_VIEWS_RE = re.compile(r'[\d,.]+')
+
+
+def find_initial_data(html: str) -> int:
+    """
+    Locate the start of the ytInitialData JSON object.
+
+    Returns:
+        Index of its opening brace, or -1 if not present
+    """
+    for marker in _INITIAL_DATA_MARKERS:
+        index = html.find(marker)
+        if index != -1:
+            start = index + len(marker)
+            return start if html.startswith('{', start) else html.find('{', start)
+    return -1
+
+
+def parse_duration(text: Optional[str]) -> Optional[int]:
+    """Convert "1:02:03" / "12:34" to seconds."""
+    if not text:
+        return None
+    seconds = 0
+    for part in text.strip().split(':'):
+        if not part.isdigit():
+            return None
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+
+def parse_view_count(text: Optional[str]) -> Optional[int]:
+    """Convert "1,234,567 views" to 1234567."""
+    if not text:
+        return None
+    match = _VIEWS_RE.search(text)
+    if not match:
+        return 0 if 'no views' in text.lower() else None
+    digits = match.group(0).replace(',', '').replace('.', '')
+    return int(digits) if digits.isdigit() else None
+
+
+def _text(node: Any) -> Optional[str]:
+    """Read a YouTube text node ({"simpleText": ...} or {"runs": [...]})."""
+    if not isinstance(node, dict):
+        return None
+    if 'simpleText' in node:
+        return node['simpleText']
+    runs = node.get('runs')
+    if runs:
+        return ''.join(run.get('text', '') for run in runs)
+    return None
+
+
+def _decode_field(html: str, key: str, start: int, end: int) -> Any:
+    """Decode the value of `"key":` within html[start:end], or None."""
+    index = html.find(key, start, end)
+    if index == -1:
+        return None
+    try:
+        return _DECODER.raw_decode(html, index + len(key))[0]
+    except ValueError:
+        return None
+
+
+def _video_at(html: str, position: int, end: int) -> Optional[Dict[str, Any]]:
+    """Build a video entry from the videoRenderer spanning html[position:end]."""
+    video_id = _decode_field(html, '"videoId":', position, end)
+    title = _text(_decode_field(html, '"title":', position, end))
+
+    if not isinstance(video_id, str) or not title:
+        return None
+
+    channel = (
+        _text(_decode_field(html, '"longBylineText":', position, end))
+        or _text(_decode_field(html, '"ownerText":', position, end))
+        or ''
+    )
+    return {
+        'video_id': video_id,
+        'title': title,
+        'channel': channel,
+        'duration': parse_duration(_text(_decode_field(html, '"lengthText":', position, end))),
+        'views': parse_view_count(_text(_decode_field(html, '"viewCountText":', position, end))),
+    }
+
+
+def extract_videos(html: str, start: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Yield video entries from a results page in page order.
+
+    Each entry has video_id, title, channel, duration (seconds or None
+    for live/upcoming) and views. Only the few small fields we need are
+    decoded from each videoRenderer; the rest of the page is skipped
+    with plain substring search.
+
+    Args:
+        html: Full or partial results page
+        start: Offset to begin scanning (e.g. from find_initial_data)
+    """
+    position = html.find(_RENDERER_KEY, start)
+    while position != -1:
+        next_position = html.find(_RENDERER_KEY, position + len(_RENDERER_KEY))
+        end = next_position if next_position != -1 else len(html)
+
+        video = _video_at(html, position, end)
+        if video is not None:
+            yield video
+
+        position = next_position
+
+
+class VideoStreamExtractor:
+    """
+    Incremental version of extract_videos for a page arriving in chunks.
+
+    A videoRenderer is emitted once the next one starts (or the stream
+    is closed), so every field it needs is complete. Text before the
+    ytInitialData blob and renderers already emitted are discarded, so
+    the buffer never holds much more than one renderer plus one chunk.
+
+    Usage:
+        extractor = VideoStreamExtractor()
+        for chunk in chunks:
+            videos.extend(extractor.feed(chunk))
+        videos.extend(extractor.close())
+    """
+
+    def __init__(self):
+        self._buffer = ''
+        self._in_data = False
+        self._position = -1   # Start of the pending renderer in the buffer
+        self._scan = 0        # Where to resume searching for the next key
+        self.chars_seen = 0
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Add a chunk of the page; return videos completed by it."""
+        self.chars_seen += len(chunk)
+        self._buffer += chunk
+
+        if not self._in_data:
+            start = find_initial_data(self._buffer)
+            if start == -1:
+                # Keep enough tail to match a marker split across chunks
+                self._buffer = self._buffer[-_MARKER_TAIL:]
+                return []
+            self._in_data = True
+            self._buffer = self._buffer[start:]
+            self._scan = 0
+
+        return self._drain(final=False)
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Signal end of stream; return the last pending video, if any."""
+        return self._drain(final=True) if self._in_data else []
+
+    def _drain(self, final: bool) -> List[Dict[str, Any]]:
+        videos = []
+        buffer = self._buffer
+
+        if self._position == -1:
+            self._position = buffer.find(_RENDERER_KEY, self._scan)
+            if self._position == -1:
+                # Nothing pending: drop all but a possible partial key
+                self._buffer = buffer[max(len(buffer) - len(_RENDERER_KEY), 0):]
+                self._scan = 0
+                return videos
+
+        while self._position != -1:
+            next_position = buffer.find(_RENDERER_KEY, max(self._position + len(_RENDERER_KEY), self._scan))
+            if next_position == -1 and not final:
+                self._scan = max(len(buffer) - len(_RENDERER_KEY), self._position + len(_RENDERER_KEY))
+                break
+
+            end = next_position if next_position != -1 else len(buffer)
+            video = _video_at(buffer, self._position, end)
+            if video is not None:
+                videos.append(video)
+            self._position = next_position
+            self._scan = 0
+
+        if self._position > 0:
+            self._buffer = buffer[self._position:]
+            self._scan -= self._position
+            self._position = 0
+        elif self._position == -1:
+            self._buffer = ''
+            self._scan = 0
+
+        return videos
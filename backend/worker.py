@@ -0,0 +1,179 @@
+"""
+CareerForge AI - Generation Worker
+Runs background jobs (roadmap, quiz, skills, interview) taken from the
+durable task queue, outside the API process.
+
+Start as many worker processes as the LLM backend can keep busy; the API
+only enqueues jobs and reads their state back:
+
+    JOBS_QUEUE=sqlite:///data/jobs.db python worker.py
+    python worker.py --concurrency 4
+    python worker.py --stats
+
+A worker renews its leases while tasks run. If it crashes, its tasks are
+handed to another worker once the lease runs out. On SIGTERM/SIGINT it
+stops taking tasks and finishes the ones it has; a second signal exits
+at once (those tasks are then retried elsewhere).
+"""
+
+import argparse
+import json
+import os
+import secrets
+import signal
+import socket
+import sys
+import threading
+import time
+from typing import Any, Dict
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import job_config
+from services.generation_tasks import TASKS, TaskError
+from services.task_queue import CANCELLED_ERROR, create_task_queue
+from utils.request_context import RequestScope, request_scope
+
+
+class Worker:
+    """Claims tasks from the queue and runs them on a few threads."""
+
+    def __init__(self, queue, concurrency: int, poll_interval: float, timeout: float):
+        """
+        Initialize the worker.
+
+        Args:
+            queue: Task queue (services.task_queue)
+            concurrency: Tasks run at once
+            poll_interval: Seconds to wait when the queue is empty
+            timeout: Seconds a task may run before it is aborted
+        """
+        self.queue = queue
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.id = f"{socket.gethostname()}:{os.getpid()}:{secrets.token_hex(3)}"
+        self._running: Dict[str, RequestScope] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def run(self) -> None:
+        """Work until stop() is called, then finish the running tasks."""
+        print(f"[Worker] {self.id} started with {self.concurrency} slot(s)")
+        heartbeat = threading.Thread(target=self._heartbeat, daemon=True)
+        heartbeat.start()
+
+        slots = [threading.Thread(target=self._work, daemon=True) for _ in range(self.concurrency)]
+        for slot in slots:
+            slot.start()
+        for slot in slots:
+            # join() with a timeout keeps the main thread responsive to signals
+            while slot.is_alive():
+                slot.join(timeout=1)
+        print(f"[Worker] {self.id} stopped")
+
+    @property
+    def stopping(self) -> bool:
+        return self._stopping.is_set()
+
+    def stop(self) -> None:
+        """Stop taking new tasks."""
+        self._stopping.set()
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                task = self.queue.claim(self.id)
+            except Exception as e:
+                print(f"[Worker] Claim failed: {e}")
+                task = None
+            if task is None:
+                self._stopping.wait(self.poll_interval)
+                continue
+            self._execute(task)
+
+    def _execute(self, task: Dict[str, Any]) -> None:
+        task_id, kind = task["id"], task["kind"]
+        scope = RequestScope(self.timeout)
+        with self._lock:
+            self._running[task_id] = scope
+
+        print(f"[Worker] Running {kind} task {task_id} (attempt {task['attempts']})")
+        result, error = None, None
+        try:
+            if kind not in TASKS:
+                raise TaskError(f"Unknown task kind: {kind}")
+            # The task's scope lets a cancel or timeout abort its LLM call
+            with request_scope(scope):
+                result = TASKS[kind](task["params"], lambda item: self.queue.add_partial(task_id, item))
+        except TaskError as e:
+            error = str(e)
+        except Exception as e:
+            print(f"[Worker] {kind} task {task_id} failed: {e}")
+            error = str(e) or type(e).__name__
+        finally:
+            with self._lock:
+                del self._running[task_id]
+
+        try:
+            if scope.cancelled:
+                self.queue.fail(task_id, self.id, CANCELLED_ERROR, status="cancelled")
+            elif error is not None:
+                self.queue.fail(task_id, self.id, error)
+            elif not self.queue.complete(task_id, self.id, result):
+                print(f"[Worker] Lease on task {task_id} was lost; result dropped")
+        except Exception as e:
+            # Unacknowledged: the task is retried once its lease runs out
+            print(f"[Worker] Could not acknowledge task {task_id}: {e}")
+
+    def _heartbeat(self) -> None:
+        """Renew leases and pass on cancellations, a few times per lease."""
+        interval = self.queue.lease / 3
+        while True:
+            with self._lock:
+                running = dict(self._running)
+            try:
+                for task_id in self.queue.heartbeat(self.id, list(running)):
+                    running[task_id].cancel()
+            except Exception as e:
+                print(f"[Worker] Heartbeat failed: {e}")
+            time.sleep(interval)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CareerForge AI generation worker")
+    parser.add_argument("--queue", default=job_config.queue, help="Task queue URL (default: JOBS_QUEUE)")
+    parser.add_argument(
+        "--concurrency", type=int, default=job_config.worker_concurrency,
+        help="Tasks run at once (default: WORKER_CONCURRENCY)"
+    )
+    parser.add_argument("--stats", action="store_true", help="Print queue depth and live workers, then exit")
+    args = parser.parse_args()
+
+    if not args.queue:
+        parser.error("no task queue configured; set JOBS_QUEUE or pass --queue")
+    queue = create_task_queue(args.queue, job_config.lease, job_config.max_attempts, job_config.ttl)
+
+    if args.stats:
+        print(json.dumps(queue.stats(), indent=2))
+        return
+
+    worker = Worker(queue, args.concurrency, job_config.poll_interval, job_config.timeout)
+
+    def shutdown(signum, frame):
+        if worker.stopping:
+            raise KeyboardInterrupt
+        print("[Worker] Finishing running tasks; signal again to exit now")
+        worker.stop()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        print("[Worker] Exiting; unfinished tasks will be retried")
+
+
+if __name__ == "__main__":
+    main()